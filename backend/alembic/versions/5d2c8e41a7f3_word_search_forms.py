@@ -0,0 +1,124 @@
+"""word search forms
+
+Revision ID: 5d2c8e41a7f3
+Revises: 0068a98df801
+Create Date: 2026-10-19 09:12:40.118204
+
+"""
+import re
+import unicodedata
+from typing import Sequence, Tuple, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '5d2c8e41a7f3'
+down_revision: Union[str, Sequence[str], None] = '0068a98df801'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+BACKFILL_BATCH_SIZE = 5000
+
+# Copy of services.vietnamese_normalization.word_search_forms as of this revision, so that
+# later changes to the application code do not change what the backfill writes
+TONE_MAPPING = {
+    'á': ('a', '1'), 'à': ('a', '2'), 'ả': ('a', '3'), 'ã': ('a', '4'), 'ạ': ('a', '5'),
+    'ắ': ('aw', '1'), 'ằ': ('aw', '2'), 'ẳ': ('aw', '3'), 'ẵ': ('aw', '4'), 'ặ': ('aw', '5'),
+    'ấ': ('aa', '1'), 'ầ': ('aa', '2'), 'ẩ': ('aa', '3'), 'ẫ': ('aa', '4'), 'ậ': ('aa', '5'),
+    'é': ('e', '1'), 'è': ('e', '2'), 'ẻ': ('e', '3'), 'ẽ': ('e', '4'), 'ẹ': ('e', '5'),
+    'ế': ('ee', '1'), 'ề': ('ee', '2'), 'ể': ('ee', '3'), 'ễ': ('ee', '4'), 'ệ': ('ee', '5'),
+    'í': ('i', '1'), 'ì': ('i', '2'), 'ỉ': ('i', '3'), 'ĩ': ('i', '4'), 'ị': ('i', '5'),
+    'ó': ('o', '1'), 'ò': ('o', '2'), 'ỏ': ('o', '3'), 'õ': ('o', '4'), 'ọ': ('o', '5'),
+    'ố': ('oo', '1'), 'ồ': ('oo', '2'), 'ổ': ('oo', '3'), 'ỗ': ('oo', '4'), 'ộ': ('oo', '5'),
+    'ớ': ('ow', '1'), 'ờ': ('ow', '2'), 'ở': ('ow', '3'), 'ỡ': ('ow', '4'), 'ợ': ('ow', '5'),
+    'ú': ('u', '1'), 'ù': ('u', '2'), 'ủ': ('u', '3'), 'ũ': ('u', '4'), 'ụ': ('u', '5'),
+    'ứ': ('uw', '1'), 'ừ': ('uw', '2'), 'ử': ('uw', '3'), 'ữ': ('uw', '4'), 'ự': ('uw', '5'),
+    'ý': ('y', '1'), 'ỳ': ('y', '2'), 'ỷ': ('y', '3'), 'ỹ': ('y', '4'), 'ỵ': ('y', '5'),
+    'đ': ('dd', '')
+}
+
+VOWEL_MAPPING = {
+    'ă': 'aw', 'â': 'aa', 'ư': 'uw', 'ơ': 'ow', 'ê': 'ee', 'ô': 'oo'
+}
+
+SPECIAL_CASES = {
+    'gì': 'gi2', 'quà': 'qua2', 'quá': 'qua1', 'quả': 'qua3',
+    'quã': 'qua4', 'quạ': 'qua5', 'qua': 'qua',
+    'già': 'gia2', 'giá': 'gia1', 'giả': 'gia3', 'giã': 'gia4', 'giạ': 'gia5',
+}
+
+_TRANSLATION_TABLE = str.maketrans({
+    **{char: base for char, (base, _) in TONE_MAPPING.items()},
+    **VOWEL_MAPPING,
+})
+_TONE_DIGITS = {char: tone for char, (_, tone) in TONE_MAPPING.items() if tone}
+_HAS_LETTER = re.compile(r'[a-zA-ZÀ-ỹ]')
+
+
+def _normalize_syllable(word: str) -> str:
+    if not _HAS_LETTER.search(word):
+        return "-"
+    lowered = word.lower()
+    if lowered in SPECIAL_CASES:
+        return SPECIAL_CASES[lowered]
+    normalized = unicodedata.normalize('NFC', lowered)
+    tone_number = ''
+    for char in reversed(normalized):
+        if char in _TONE_DIGITS:
+            tone_number = _TONE_DIGITS[char]
+            break
+    return normalized.translate(_TRANSLATION_TABLE) + tone_number
+
+
+def _normalize_word(word: str) -> str:
+    return '_'.join(_normalize_syllable(part) for part in word.split('_'))
+
+
+def word_search_forms(word: str) -> Tuple[str, str]:
+    """(word_norm, word_toneless) of a corpus word"""
+    word = (word or "").strip()
+    if not word:
+        return "", ""
+    key = word.replace(" ", "_")
+    word_norm = ' '.join(map(_normalize_word, key.split()))
+    decomposed = unicodedata.normalize('NFD', key.lower().replace('đ', 'd'))
+    return word_norm, ''.join(char for char in decomposed if not unicodedata.combining(char))
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column('master_row_words', sa.Column('word_norm', sa.String(), nullable=True))
+    op.add_column('master_row_words', sa.Column('word_toneless', sa.String(), nullable=True))
+
+    # Backfill in id order, one batch per statement, before the indexes exist
+    conn = op.get_bind()
+    update = sa.text(
+        "UPDATE master_row_words SET word_norm = :word_norm, word_toneless = :word_toneless WHERE id = :id"
+    )
+    last_id = 0
+    while True:
+        rows = conn.execute(
+            sa.text("SELECT id, word FROM master_row_words WHERE id > :last_id ORDER BY id LIMIT :limit"),
+            {"last_id": last_id, "limit": BACKFILL_BATCH_SIZE},
+        ).fetchall()
+        if not rows:
+            break
+        params = []
+        for row_id, word in rows:
+            word_norm, word_toneless = word_search_forms(word)
+            params.append({"id": row_id, "word_norm": word_norm, "word_toneless": word_toneless})
+        conn.execute(update, params)
+        last_id = rows[-1][0]
+
+    op.create_index(op.f('ix_master_row_words_word_norm'), 'master_row_words', ['word_norm'], unique=False)
+    op.create_index(op.f('ix_master_row_words_word_toneless'), 'master_row_words', ['word_toneless'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index(op.f('ix_master_row_words_word_toneless'), table_name='master_row_words')
+    op.drop_index(op.f('ix_master_row_words_word_norm'), table_name='master_row_words')
+    op.drop_column('master_row_words', 'word_toneless')
+    op.drop_column('master_row_words', 'word_norm')
@@ -0,0 +1,77 @@
+"""drop master_row_words tag text
+
+Revision ID: 9b6e2d4f7a15
+Revises: e1c7a4b92f3d
+Create Date: 2026-10-19 23:41:08.215374
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '9b6e2d4f7a15'
+down_revision: Union[str, Sequence[str], None] = 'e1c7a4b92f3d'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+BACKFILL_BATCH_SIZE = 50000
+
+# Tag type -> id column of master_row_words (services.tag_dictionary.TAG_ID_COLUMNS)
+TAG_ID_COLUMNS = {'pos': 'pos_id', 'ner': 'ner_id', 'semantic': 'semantic_id'}
+TEXT_COLUMNS = (*TAG_ID_COLUMNS, 'lang_pair')
+
+# Audit copy of revision f4a8c3e61b07; its downgrade inserts it back with SELECT *, so
+# it keeps the same columns as master_row_words
+DUPLICATES_TABLE = 'master_row_words_duplicates_f4a8c3e61b07'
+
+
+def _tables() -> list:
+    conn = op.get_bind()
+    exists = conn.execute(sa.text("SELECT to_regclass(:name)"), {"name": DUPLICATES_TABLE}).scalar() is not None
+    return ['master_row_words'] + ([DUPLICATES_TABLE] if exists else [])
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    conn = op.get_bind()
+    tables = _tables()
+    # Revision a3f19c7e52d4 gave blank values no tag; they get one now so that no value is lost
+    for table in tables:
+        for tag_type, column in TAG_ID_COLUMNS.items():
+            conn.execute(sa.text(
+                f"INSERT INTO tags (tag_type, value) SELECT DISTINCT '{tag_type}', {tag_type} FROM {table} "
+                f"WHERE {column} IS NULL AND {tag_type} IS NOT NULL "
+                f"ON CONFLICT ON CONSTRAINT uq_tags_tag_type_value DO NOTHING"
+            ))
+            conn.execute(sa.text(
+                f"UPDATE {table} m SET {column} = t.id FROM tags t "
+                f"WHERE t.tag_type = '{tag_type}' AND t.value = m.{tag_type} AND m.{column} IS NULL"
+            ))
+    for table in tables:
+        for column in TEXT_COLUMNS:
+            op.drop_column(table, column)
+
+    # DROP COLUMN only hides the values; rewrite the partitions so that the space is given back
+    with op.get_context().autocommit_block():
+        op.execute("VACUUM (FULL, ANALYZE) master_row_words")
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    conn = op.get_bind()
+    for table in _tables():
+        for column in TEXT_COLUMNS:
+            op.add_column(table, sa.Column(column, sa.String(), nullable=True))
+        max_id = conn.execute(sa.text(f"SELECT coalesce(max(id), 0) FROM {table}")).scalar()
+        for start in range(0, max_id, BACKFILL_BATCH_SIZE):
+            conn.execute(sa.text(
+                f"UPDATE {table} m SET "
+                "pos = (SELECT value FROM tags WHERE id = m.pos_id), "
+                "ner = (SELECT value FROM tags WHERE id = m.ner_id), "
+                "semantic = (SELECT value FROM tags WHERE id = m.semantic_id), "
+                "lang_pair = (SELECT nullif(code, '') FROM lang_pairs WHERE id = m.lang_pair_id) "
+                "WHERE m.id > :start AND m.id <= :end"
+            ), {'start': start, 'end': start + BACKFILL_BATCH_SIZE})
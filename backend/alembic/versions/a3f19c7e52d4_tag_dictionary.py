@@ -0,0 +1,89 @@
+"""tag dictionary
+
+Revision ID: a3f19c7e52d4
+Revises: 5d2c8e41a7f3
+Create Date: 2026-10-19 11:02:17.530961
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'a3f19c7e52d4'
+down_revision: Union[str, Sequence[str], None] = '5d2c8e41a7f3'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+BACKFILL_BATCH_SIZE = 50000
+
+# Tag type -> id column of master_row_words (services.tag_dictionary.TAG_ID_COLUMNS)
+TAG_ID_COLUMNS = {'pos': 'pos_id', 'ner': 'ner_id', 'semantic': 'semantic_id'}
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table(
+        'tags',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('tag_type', sa.String(), nullable=False),
+        sa.Column('value', sa.String(), nullable=False),
+        sa.PrimaryKeyConstraint('id'),
+        sa.UniqueConstraint('tag_type', 'value', name='uq_tags_tag_type_value'),
+    )
+    op.create_index(op.f('ix_tags_id'), 'tags', ['id'], unique=False)
+    op.create_table(
+        'lang_pairs',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('code', sa.String(), nullable=False),
+        sa.PrimaryKeyConstraint('id'),
+        sa.UniqueConstraint('code'),
+    )
+    op.create_index(op.f('ix_lang_pairs_id'), 'lang_pairs', ['id'], unique=False)
+
+    for column in (*TAG_ID_COLUMNS.values(), 'lang_pair_id'):
+        op.add_column('master_row_words', sa.Column(column, sa.Integer(), nullable=True))
+
+    # Dictionary of every value in use, then the ids in id ranges, before the indexes exist
+    for tag_type in TAG_ID_COLUMNS:
+        op.execute(
+            f"INSERT INTO tags (tag_type, value) SELECT DISTINCT '{tag_type}', {tag_type} FROM master_row_words "
+            f"WHERE btrim(coalesce({tag_type}, '')) <> '' ORDER BY 2"
+        )
+    op.execute(
+        "INSERT INTO lang_pairs (code) SELECT DISTINCT lang_pair FROM master_row_words "
+        "WHERE btrim(coalesce(lang_pair, '')) <> '' ORDER BY 1"
+    )
+
+    conn = op.get_bind()
+    max_id = conn.execute(sa.text("SELECT coalesce(max(id), 0) FROM master_row_words")).scalar()
+    for start in range(0, max_id, BACKFILL_BATCH_SIZE):
+        params = {'start': start, 'end': start + BACKFILL_BATCH_SIZE}
+        conn.execute(sa.text(
+            "UPDATE master_row_words m SET "
+            "pos_id = (SELECT id FROM tags WHERE tag_type = 'pos' AND value = m.pos), "
+            "ner_id = (SELECT id FROM tags WHERE tag_type = 'ner' AND value = m.ner), "
+            "semantic_id = (SELECT id FROM tags WHERE tag_type = 'semantic' AND value = m.semantic), "
+            "lang_pair_id = (SELECT id FROM lang_pairs WHERE code = m.lang_pair) "
+            "WHERE m.id > :start AND m.id <= :end"
+        ), params)
+
+    for column in TAG_ID_COLUMNS.values():
+        op.create_foreign_key(None, 'master_row_words', 'tags', [column], ['id'])
+        op.create_index(op.f(f'ix_master_row_words_{column}'), 'master_row_words', [column], unique=False)
+    op.create_foreign_key(None, 'master_row_words', 'lang_pairs', ['lang_pair_id'], ['id'])
+    op.create_index(op.f('ix_master_row_words_lang_pair_id'), 'master_row_words', ['lang_pair_id'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    for column in (*TAG_ID_COLUMNS.values(), 'lang_pair_id'):
+        op.drop_index(op.f(f'ix_master_row_words_{column}'), table_name='master_row_words')
+        # Dropping the column drops its foreign key too
+        op.drop_column('master_row_words', column)
+    op.drop_index(op.f('ix_lang_pairs_id'), table_name='lang_pairs')
+    op.drop_table('lang_pairs')
+    op.drop_index(op.f('ix_tags_id'), table_name='tags')
+    op.drop_table('tags')
@@ -0,0 +1,38 @@
+"""master_row_words links_array
+
+Revision ID: b83d5a2f9c61
+Revises: f4a8c3e61b07
+Create Date: 2026-10-19 18:52:06.318274
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'b83d5a2f9c61'
+down_revision: Union[str, Sequence[str], None] = 'f4a8c3e61b07'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# Same expression as models.master_row_word.LINKS_ARRAY_SQL
+LINKS_ARRAY_SQL = "CASE WHEN links ~ '^[0-9,]*[0-9][0-9,]*$' THEN array_remove(string_to_array(links, ','), '')::integer[] END"
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # A stored generated column: adding it rewrites every partition, which backfills the existing rows
+    op.add_column('master_row_words', sa.Column(
+        'links_array', postgresql.ARRAY(sa.Integer()), sa.Computed(LINKS_ARRAY_SQL, persisted=True), nullable=True,
+    ))
+    op.create_index('ix_master_row_words_links_array', 'master_row_words', ['links_array'],
+                    unique=False, postgresql_using='gin')
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_master_row_words_links_array', table_name='master_row_words')
+    op.drop_column('master_row_words', 'links_array')
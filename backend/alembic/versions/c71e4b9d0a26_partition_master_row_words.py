@@ -0,0 +1,82 @@
+"""partition master_row_words by lang_pair_id
+
+Revision ID: c71e4b9d0a26
+Revises: a3f19c7e52d4
+Create Date: 2026-10-19 13:40:52.204117
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'c71e4b9d0a26'
+down_revision: Union[str, Sequence[str], None] = 'a3f19c7e52d4'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# Same names as services.master_row_word_partitions
+DEFAULT_PARTITION = 'master_row_words_default'
+UNASSIGNED_LANG_PAIR = ''
+
+INDEXED_COLUMNS = ('id', 'word_norm', 'word_toneless', 'pos_id', 'ner_id', 'semantic_id')
+FOREIGN_KEYS = (
+    ('row_word_id', 'row_words'),
+    ('create_by', 'users'),
+    ('approval_by', 'users'),
+    ('pos_id', 'tags'),
+    ('ner_id', 'tags'),
+    ('semantic_id', 'tags'),
+    ('lang_pair_id', 'lang_pairs'),
+)
+
+
+def partition_name(lang_pair_id: int) -> str:
+    return f'master_row_words_p{int(lang_pair_id)}'
+
+
+def _rebuild(partitioned: bool) -> None:
+    """Copy master_row_words into a new table (partitioned or not) and swap it in."""
+    op.execute("CREATE TABLE master_row_words_new (LIKE master_row_words INCLUDING DEFAULTS)"
+               + (" PARTITION BY LIST (lang_pair_id)" if partitioned else ""))
+    if partitioned:
+        conn = op.get_bind()
+        for (lang_pair_id,) in conn.execute(sa.text("SELECT id FROM lang_pairs ORDER BY id")):
+            op.execute(f"CREATE TABLE {partition_name(lang_pair_id)} PARTITION OF master_row_words_new "
+                       f"FOR VALUES IN ({int(lang_pair_id)})")
+        op.execute(f"CREATE TABLE {DEFAULT_PARTITION} PARTITION OF master_row_words_new DEFAULT")
+
+    op.execute("INSERT INTO master_row_words_new SELECT * FROM master_row_words")
+    # The id sequence belongs to the old table and would be dropped with it
+    op.execute("ALTER SEQUENCE master_row_words_id_seq OWNED BY master_row_words_new.id")
+    op.drop_table('master_row_words')
+    op.rename_table('master_row_words_new', 'master_row_words')
+
+    # A partitioned table's primary key must contain the partition key
+    op.create_primary_key('master_row_words_pkey', 'master_row_words',
+                          ['id', 'lang_pair_id'] if partitioned else ['id'])
+    for column in INDEXED_COLUMNS + (() if partitioned else ('lang_pair_id',)):
+        op.create_index(op.f(f'ix_master_row_words_{column}'), 'master_row_words', [column], unique=False)
+    for column, referred in FOREIGN_KEYS:
+        op.create_foreign_key(f'master_row_words_{column}_fkey', 'master_row_words', referred, [column], ['id'])
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # Rows without a language pair go to the unassigned pair; the partition key is never NULL
+    op.execute(f"INSERT INTO lang_pairs (code) SELECT DISTINCT coalesce(btrim(lang_pair), '{UNASSIGNED_LANG_PAIR}') "
+               f"FROM master_row_words WHERE lang_pair_id IS NULL ON CONFLICT (code) DO NOTHING")
+    op.execute(f"UPDATE master_row_words SET lang_pair_id = (SELECT id FROM lang_pairs "
+               f"WHERE code = coalesce(btrim(master_row_words.lang_pair), '{UNASSIGNED_LANG_PAIR}')) "
+               f"WHERE lang_pair_id IS NULL")
+    op.alter_column('master_row_words', 'lang_pair_id', existing_type=sa.Integer(), nullable=False)
+
+    _rebuild(partitioned=True)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    _rebuild(partitioned=False)
+    op.alter_column('master_row_words', 'lang_pair_id', existing_type=sa.Integer(), nullable=True)
@@ -0,0 +1,41 @@
+"""master_row_words position
+
+Revision ID: d2e97c14a8b5
+Revises: b83d5a2f9c61
+Create Date: 2026-10-19 19:06:41.927503
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'd2e97c14a8b5'
+down_revision: Union[str, Sequence[str], None] = 'b83d5a2f9c61'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# Copy of models.master_row_word.POSITION_SQL as of this revision (not imported, so later
+# changes to the model do not change this migration)
+POSITION_SQL = (
+    "CASE WHEN length(btrim(replace(id_string, chr(65279), ''))) >= 8 "
+    "THEN substring(btrim(replace(id_string, chr(65279), '')) from '([0-9]{2})$')::integer END"
+)
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # A stored generated column: adding it rewrites every partition, which backfills the existing rows
+    op.add_column('master_row_words', sa.Column(
+        'position', sa.Integer(), sa.Computed(POSITION_SQL, persisted=True), nullable=True,
+    ))
+    op.create_index('ix_master_row_words_id_sen_lang_code_position', 'master_row_words',
+                    ['id_sen', 'lang_code', 'position'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_master_row_words_id_sen_lang_code_position', table_name='master_row_words')
+    op.drop_column('master_row_words', 'position')
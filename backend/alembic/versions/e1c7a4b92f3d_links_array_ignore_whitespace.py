@@ -0,0 +1,51 @@
+"""links_array ignores whitespace
+
+Revision ID: e1c7a4b92f3d
+Revises: d2e97c14a8b5
+Create Date: 2026-10-19 21:14:52.604183
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'e1c7a4b92f3d'
+down_revision: Union[str, Sequence[str], None] = 'd2e97c14a8b5'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# Same expression as models.master_row_word.LINKS_ARRAY_SQL
+LINKS_ARRAY_SQL = (
+    "CASE WHEN regexp_replace(regexp_replace(links, '[ \\t\\r\\n]*,[ \\t\\r\\n]*', ',', 'g'), '^[ \\t\\r\\n]+|[ \\t\\r\\n]+$', '', 'g') "
+    "~ '^,*[0-9]{1,9}(,+[0-9]{1,9})*,*$' "
+    "THEN array_remove(string_to_array(regexp_replace(regexp_replace(links, '[ \\t\\r\\n]*,[ \\t\\r\\n]*', ',', 'g'), "
+    "'^[ \\t\\r\\n]+|[ \\t\\r\\n]+$', '', 'g'), ','), '')::integer[] END"
+)
+# Expression of revision b83d5a2f9c61
+OLD_LINKS_ARRAY_SQL = "CASE WHEN links ~ '^[0-9,]*[0-9][0-9,]*$' THEN array_remove(string_to_array(links, ','), '')::integer[] END"
+
+
+def _replace_links_array(expression: str) -> None:
+    # Postgres 16 cannot change the expression of a generated column: drop and add it again,
+    # which rewrites every partition and so recomputes the existing rows
+    op.drop_index('ix_master_row_words_links_array', table_name='master_row_words')
+    op.drop_column('master_row_words', 'links_array')
+    op.add_column('master_row_words', sa.Column(
+        'links_array', postgresql.ARRAY(sa.Integer()), sa.Computed(expression, persisted=True), nullable=True,
+    ))
+    op.create_index('ix_master_row_words_links_array', 'master_row_words', ['links_array'],
+                    unique=False, postgresql_using='gin')
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    _replace_links_array(LINKS_ARRAY_SQL)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    _replace_links_array(OLD_LINKS_ARRAY_SQL)
@@ -0,0 +1,29 @@
+"""row_word_id index
+
+Revision ID: e5b20d7c4f18
+Revises: c71e4b9d0a26
+Create Date: 2026-10-19 16:25:09.871342
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'e5b20d7c4f18'
+down_revision: Union[str, Sequence[str], None] = 'c71e4b9d0a26'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # Anti-join of MasterRowWordService.migrate_row_words
+    op.create_index(op.f('ix_master_row_words_row_word_id'), 'master_row_words', ['row_word_id'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index(op.f('ix_master_row_words_row_word_id'), table_name='master_row_words')
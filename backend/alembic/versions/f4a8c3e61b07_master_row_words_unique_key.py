@@ -0,0 +1,62 @@
+"""master_row_words unique key
+
+Revision ID: f4a8c3e61b07
+Revises: e5b20d7c4f18
+Create Date: 2026-10-19 17:48:33.415720
+
+"""
+import logging
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'f4a8c3e61b07'
+down_revision: Union[str, Sequence[str], None] = 'e5b20d7c4f18'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+logger = logging.getLogger("alembic.runtime.migration")
+
+# Duplicated rows removed by the upgrade, kept for audit (and put back by the downgrade)
+DUPLICATES_TABLE = 'master_row_words_duplicates_f4a8c3e61b07'
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # Keep the first imported row (lowest id) of every duplicated key, move the others to DUPLICATES_TABLE
+    conn = op.get_bind()
+    conn.execute(sa.text(
+        f"CREATE TABLE {DUPLICATES_TABLE} AS SELECT * FROM master_row_words WHERE (id, lang_pair_id) IN ("
+        "SELECT id, lang_pair_id FROM ("
+        "SELECT id, lang_pair_id, row_number() OVER "
+        "(PARTITION BY lang_pair_id, lang_code, id_string ORDER BY id) AS rn "
+        "FROM master_row_words WHERE lang_code IS NOT NULL AND id_string IS NOT NULL"
+        ") duplicates WHERE rn > 1)"
+    ))
+    count = conn.execute(sa.text(f"SELECT count(*) FROM {DUPLICATES_TABLE}")).scalar_one()
+    if count:
+        conn.execute(sa.text(
+            "DELETE FROM master_row_words WHERE (id, lang_pair_id) IN "
+            f"(SELECT id, lang_pair_id FROM {DUPLICATES_TABLE})"
+        ))
+        logger.warning(f"Removed {count} duplicated master_row_words rows, copied to {DUPLICATES_TABLE}")
+    else:
+        op.drop_table(DUPLICATES_TABLE)
+    # A unique constraint on a partitioned table must contain the partition key
+    op.create_unique_constraint(
+        'uq_master_row_words_lang_pair_id_lang_code_id_string',
+        'master_row_words',
+        ['lang_pair_id', 'lang_code', 'id_string'],
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_constraint('uq_master_row_words_lang_pair_id_lang_code_id_string', 'master_row_words', type_='unique')
+    conn = op.get_bind()
+    if conn.execute(sa.text("SELECT to_regclass(:name)"), {"name": DUPLICATES_TABLE}).scalar() is not None:
+        conn.execute(sa.text(f"INSERT INTO master_row_words SELECT * FROM {DUPLICATES_TABLE}"))
+        op.drop_table(DUPLICATES_TABLE)
@@ -6,6 +6,8 @@ from schemas.rowword import RowWordCreate
 from schemas.word_row_master import MasterRowWordCreate
 from schemas.user import UserCreate
 from auth import get_password_hash
+from services.master_row_word_service import MasterRowWordService
+from services.tag_dictionary import tag_dictionary
 from datetime import datetime
 
 
@@ -92,7 +94,7 @@ def create_initial_users(db: Session):
 
 # MasterRowWord CRUD operations
 def create_word_row_master(db: Session, word_data: MasterRowWordCreate, creator_id: int = None):
-    db_word = MasterRowWord(**word_data.dict())
+    db_word = MasterRowWord(**tag_dictionary.with_ids(db, [word_data.dict()], insert=True)[0])
     db_word.create_by = creator_id
     db_word.created_at = datetime.now()
     db.add(db_word)
@@ -107,32 +109,5 @@ def get_word_row_masters_by_lang(db: Session, lang_code: str, skip: int = 0, lim
     return db.query(MasterRowWord).filter(MasterRowWord.lang_code == lang_code).offset(skip).limit(limit).all()
 
 def migrate_row_words_to_word_row_master(db: Session, creator_id: int = None):
-    """Migrate all data from row_words to word_row_master"""
-    row_words = db.query(RowWord).all()
-    migrated_count = 0
-    
-    for row_word in row_words:
-        # Check if already exists
-        existing = db.query(MasterRowWord).filter(MasterRowWord.row_word_id == row_word.ID).first()
-        if not existing:
-            word_master = MasterRowWord(
-                row_word_id=row_word.ID,
-                id_sen=row_word.ID_sen,
-                word=row_word.Word,
-                lemma=row_word.Lemma,
-                links=row_word.Links,
-                morph=row_word.Morph,
-                pos=row_word.POS,
-                phrase=row_word.Phrase,
-                grm=row_word.Grm,
-                ner=row_word.NER,
-                semantic=row_word.Semantic,
-                lang_code=row_word.Lang_code,
-                create_by=creator_id,
-                created_at=datetime.now()
-            )
-            db.add(word_master)
-            migrated_count += 1
-    
-    db.commit()
-    return migrated_count
\ No newline at end of file
+    """Migrate all data from row_words to word_row_master (rows already migrated are skipped)"""
+    return MasterRowWordService(MasterRowWord).migrate_row_words(db, create_by=creator_id)
\ No newline at end of file
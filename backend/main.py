@@ -1,6 +1,7 @@
 from fastapi_cache import FastAPICache
 from fastapi_cache.backends.redis import RedisBackend
 from fastapi_cache.decorator import cache
+import os
 import redis
 from fastapi import FastAPI
 from crud import create_initial_users
@@ -8,6 +9,7 @@ from database import SessionLocal
 from fastapi.middleware.cors import CORSMiddleware
 from routers import auth_router, user_api, master_api, nlp_router, vietnamese_normalization_api, sentence_pair_api
 from init_db import create_database_if_not_exists
+from services.model_registry import model_registry
 create_database_if_not_exists()
 
 app = FastAPI(
@@ -57,3 +59,7 @@ async def startup_event():
         create_initial_users(db)
     finally:
         db.close()
+    # Load NLP models in the background so the API starts accepting requests immediately;
+    # with NLP_MODEL_WARMUP=false each model is loaded on its first request instead
+    if os.getenv("NLP_MODEL_WARMUP", "true").lower() in ("1", "true", "yes"):
+        model_registry.warm_up()
@@ -2,5 +2,7 @@ from .base import Base
 from .row_word import RowWord
 from .master_row_word import MasterRowWord
 from .user import User, UserRole
+from .tag import Tag
+from .lang_pair import LangPair
 
-__all__ = ["Base", "RowWord", "MasterRowWord", "User", "UserRole"]
+__all__ = ["Base", "RowWord", "MasterRowWord", "User", "UserRole", "Tag", "LangPair"]
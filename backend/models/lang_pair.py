@@ -0,0 +1,8 @@
+from sqlalchemy import Column, Integer, String
+from .base import Base
+
+class LangPair(Base):
+    __tablename__ = "lang_pairs"
+
+    id = Column(Integer, primary_key=True, index=True)
+    code = Column(String, unique=True, nullable=False)  # e.g. "vi_en"
@@ -1,25 +1,84 @@
-from sqlalchemy import Column, Integer, String, DateTime, ForeignKey
-from sqlalchemy.orm import relationship
+import re
+from typing import List, Optional
+
+from sqlalchemy import Column, Computed, Integer, String, DateTime, ForeignKey, Index, UniqueConstraint, select
+from sqlalchemy.dialects.postgresql import ARRAY
+from sqlalchemy.orm import column_property, relationship
 from .base import Base
+from .lang_pair import LangPair
+from .tag import Tag
+
+# `links` ("3,4", "3, 4") as integer[]; NULL for "-" (not aligned) and anything that is not a
+# list of positions. Whitespace around commas and at the ends is ignored, and positions have at
+# most 9 digits (so they fit an integer).
+LINKS_ARRAY_SQL = (
+    "CASE WHEN regexp_replace(regexp_replace(links, '[ \\t\\r\\n]*,[ \\t\\r\\n]*', ',', 'g'), '^[ \\t\\r\\n]+|[ \\t\\r\\n]+$', '', 'g') "
+    "~ '^,*[0-9]{1,9}(,+[0-9]{1,9})*,*$' "
+    "THEN array_remove(string_to_array(regexp_replace(regexp_replace(links, '[ \\t\\r\\n]*,[ \\t\\r\\n]*', ',', 'g'), "
+    "'^[ \\t\\r\\n]+|[ \\t\\r\\n]+$', '', 'g'), ','), '')::integer[] END"
+)
+_LINKS_COMMA = re.compile(r"[ \t\r\n]*,[ \t\r\n]*")
+_LINKS_ENDS = re.compile(r"\A[ \t\r\n]+|[ \t\r\n]+\Z")
+_LINKS_PATTERN = re.compile(r",*[0-9]{1,9}(,+[0-9]{1,9})*,*")
+
+def parse_links(links: Optional[str]) -> Optional[List[int]]:
+    """links_array computed in Python, for rows that do not come from the table (same rules as LINKS_ARRAY_SQL)"""
+    if links is None:
+        return None
+    compact = _LINKS_ENDS.sub("", _LINKS_COMMA.sub(",", links))
+    if not _LINKS_PATTERN.fullmatch(compact):
+        return None
+    return [int(p) for p in compact.split(",") if p]
+
+# Token position in its sentence: the last 2 digits of id_string (without BOM / spaces, at least 8 characters)
+POSITION_SQL = (
+    "CASE WHEN length(btrim(replace(id_string, chr(65279), ''))) >= 8 "
+    "THEN substring(btrim(replace(id_string, chr(65279), '')) from '([0-9]{2})$')::integer END"
+)
 
 class MasterRowWord(Base):
     __tablename__ = "master_row_words"
+    __table_args__ = (
+        # Natural key of a token; target of MasterRowWordService.bulk_upsert
+        UniqueConstraint("lang_pair_id", "lang_code", "id_string", name="uq_master_row_words_lang_pair_id_lang_code_id_string"),
+        # "Which tokens link to any of these positions": links_array && ARRAY[...]
+        Index("ix_master_row_words_links_array", "links_array", postgresql_using="gin"),
+        # A sentence of one language in token order is a range of this index
+        Index("ix_master_row_words_id_sen_lang_code_position", "id_sen", "lang_code", "position"),
+        # LIST-partitioned by lang_pair_id, see services.master_row_word_partitions
+        {"postgresql_partition_by": "LIST (lang_pair_id)"},
+    )
 
     id = Column(Integer, primary_key=True, index=True)
     id_string = Column(String)
-    row_word_id = Column(String, ForeignKey("row_words.id"))
+    row_word_id = Column(String, ForeignKey("row_words.id"), index=True)
     id_sen = Column(String)
+    # Computed by Postgres from id_string on every write
+    position = Column(Integer, Computed(POSITION_SQL, persisted=True))
     word = Column(String)
+    # Search forms of `word` (services.vietnamese_normalization.word_search_forms)
+    word_norm = Column(String, index=True)      # typed form, e.g. "bo2"
+    word_toneless = Column(String, index=True)  # without any accents, e.g. "bo"
     lemma = Column(String)
     links = Column(String)
+    # Parsed `links`, computed by Postgres on every write
+    links_array = Column(ARRAY(Integer), Computed(LINKS_ARRAY_SQL, persisted=True))
     morph = Column(String)
-    pos = Column(String)
     phrase = Column(String)
     grm = Column(String)
-    ner = Column(String)
-    semantic = Column(String)
     lang_code = Column(String)
-    lang_pair = Column(String)
+    # Tags and language pair as integer keys (models.tag, models.lang_pair); services.tag_dictionary
+    # turns the values written as pos / ner / semantic / lang_pair into these keys.
+    # lang_pair_id is the partition key (the table's primary key is (id, lang_pair_id))
+    pos_id = Column(Integer, ForeignKey("tags.id"), index=True)
+    ner_id = Column(Integer, ForeignKey("tags.id"), index=True)
+    semantic_id = Column(Integer, ForeignKey("tags.id"), index=True)
+    lang_pair_id = Column(Integer, ForeignKey("lang_pairs.id"), nullable=False)
+    # Their values, read-only and looked up when rows are loaded (not stored on the rows)
+    pos = column_property(select(Tag.value).where(Tag.id == pos_id).scalar_subquery())
+    ner = column_property(select(Tag.value).where(Tag.id == ner_id).scalar_subquery())
+    semantic = column_property(select(Tag.value).where(Tag.id == semantic_id).scalar_subquery())
+    lang_pair = column_property(select(LangPair.code).where(LangPair.id == lang_pair_id).scalar_subquery())
     create_by = Column(Integer, ForeignKey("users.id"))
     approval_by = Column(Integer, ForeignKey("users.id"))
     created_at = Column(DateTime)
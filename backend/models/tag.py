@@ -0,0 +1,10 @@
+from sqlalchemy import Column, Integer, String, UniqueConstraint
+from .base import Base
+
+class Tag(Base):
+    __tablename__ = "tags"
+    __table_args__ = (UniqueConstraint("tag_type", "value", name="uq_tags_tag_type_value"),)
+
+    id = Column(Integer, primary_key=True, index=True)
+    tag_type = Column(String, nullable=False)  # "pos", "ner" or "semantic"
+    value = Column(String, nullable=False)
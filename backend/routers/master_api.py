@@ -6,29 +6,95 @@ from sqlalchemy.orm import Session
 from models.master_row_word import MasterRowWord
 from database import get_db
 from fastapi import APIRouter, UploadFile, File, Depends, Form, HTTPException, BackgroundTasks
+from fastapi.concurrency import run_in_threadpool
 from sqlalchemy.orm import Session
 import pandas as pd
 import io
 from auth import get_current_user
 from models.user import User, UserRole
-from typing import List, Optional
+from typing import Iterator, List, Optional
 from sqlalchemy import distinct, func, or_
 import math
+import uuid
+from datetime import datetime
+from fastapi.responses import StreamingResponse
 from fastapi_cache.decorator import cache
 
 
 from responses.master_row_word_list_response import MasterRowWordListResponse
 from responses.row_word_list_response import RowWordListResponse
 from schemas.word_row_master import MasterRowWordUpdate
-from services.master_row_word_service import MasterRowWordService
+from services.master_row_word_service import MasterRowWordService, with_search_forms
+from services.tag_dictionary import tag_dictionary
+from services.corpus_export_service import (
+    EXPORT_FORMATS, MEDIA_TYPES, corpus_export_service, export_filename, parquet_available,
+)
+from services.corpus_snapshot import corpus_snapshot
+from services.corpus_store import corpus_store
+from services.vietnamese_normalization import normalize_vietnamese_text, remove_vietnamese_accents
+from services.corpus_annotation_pipeline import CorpusAnnotationPipeline, PipelineStats, SUPPORTED_LANGUAGES
+from services.model_registry import get_english_nlp, get_vietnamese_nlp_service
+from database import SessionLocal
 
 master_row_word_service = MasterRowWordService(MasterRowWord)
 
+# search_mode of /words and /dicid: exact word, typed (Telex-style, e.g. "bo2") or toneless (e.g. "bo")
+SEARCH_MODES = ("exact", "typed", "toneless")
+
+def search_column_and_key(search_mode: str, key: str):
+    """Column to compare and the search key converted to that column's form"""
+    if search_mode == "typed":
+        return MasterRowWord.word_norm, normalize_vietnamese_text(key)
+    if search_mode == "toneless":
+        return MasterRowWord.word_toneless, remove_vietnamese_accents(key)
+    if search_mode == "exact":
+        return MasterRowWord.word, key
+    raise HTTPException(status_code=400, detail=f"search_mode must be one of {SEARCH_MODES}")
+
+# mode of /import for rows whose (lang_pair, lang_code, id_string) already exists -> bulk_upsert on_conflict
+IMPORT_MODES = {"skip": "skip", "overwrite": "update"}
+
+# source of the statistics and tag facet endpoints: Postgres or the Parquet snapshot (POST /master/snapshot)
+ANALYTICS_SOURCES = ("db", "snapshot")
+
+def check_analytics_source(source: str) -> bool:
+    """Whether to answer from the snapshot"""
+    if source not in ANALYTICS_SOURCES:
+        raise HTTPException(status_code=400, detail=f"source must be one of {ANALYTICS_SOURCES}")
+    if source == "snapshot" and not parquet_available():
+        raise HTTPException(status_code=503, detail="The corpus snapshot needs pyarrow installed on the server")
+    if source == "snapshot" and not corpus_snapshot.available():
+        raise HTTPException(status_code=404, detail="No corpus snapshot, build one with POST /master/snapshot")
+    return source == "snapshot"
+
+# source of /dicid and /align-sentence: Postgres or the memory-mapped corpus store (POST /master/corpus-store)
+SERVING_SOURCES = ("db", "store")
+
+def check_serving_source(source: str) -> bool:
+    """Whether to answer from the corpus store"""
+    if source not in SERVING_SOURCES:
+        raise HTTPException(status_code=400, detail=f"source must be one of {SERVING_SOURCES}")
+    if source == "store" and not corpus_store.available():
+        raise HTTPException(status_code=404, detail="No corpus store, build one with POST /master/corpus-store")
+    return source == "store"
+
+# Pre-annotation, corpus replacement, snapshot and corpus store jobs by id (in-memory, lost on restart)
+pre_annotation_jobs: dict = {}
+replace_jobs: dict = {}
+snapshot_jobs: dict = {}
+store_jobs: dict = {}
+
 router = APIRouter(prefix="/master", tags=["master"])
 
 @router.post("/import")
 async def import_corpus_file(current_user: Optional[User] = Depends(get_current_user), file: UploadFile = File(...),
-                             lang_code: str = Form(...), lang_pair: str = Form(...), db: Session = Depends(get_db), background_tasks: BackgroundTasks = BackgroundTasks()):
+                             lang_code: str = Form(...), lang_pair: str = Form(...), mode: str = Form("skip"),
+                             db: Session = Depends(get_db)):
+    """
+    Import a corpus file. Rows whose (lang_pair, lang_code, id_string) already exists,
+    in the database or earlier in the file, are left alone with mode=skip and replaced
+    with mode=overwrite, so importing the same file twice does not duplicate the corpus.
+    """
     if current_user is None:
         raise HTTPException(status_code=401, detail="Not authenticated")
     if current_user.role != UserRole.ADMIN:
@@ -37,22 +103,235 @@ async def import_corpus_file(current_user: Optional[User] = Depends(get_current_
         raise HTTPException(status_code=400, detail="No file uploaded")
     if lang_code is None:
         raise HTTPException(status_code=400, detail="Language code is required")
+    if mode not in IMPORT_MODES:
+        raise HTTPException(status_code=400, detail=f"mode must be one of {tuple(IMPORT_MODES)}")
     try:
         # Đọc file content
         content = await file.read()
         filename = file.filename.lower()
 
-        background_tasks.add_task(process_file_job(content, filename, lang_code, lang_pair, db))
+        # Parsing and the upsert are blocking; keep them off the event loop
+        count = await run_in_threadpool(process_file_job, content, filename, lang_code, lang_pair, db, mode=mode)
 
-        return {"message": "File imported successfully"}
+        return {"message": "File imported successfully", "rows": count}
 
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Import failed: {str(e)}")
 
+@router.post("/replace")
+async def replace_corpus_file(current_user: Optional[User] = Depends(get_current_user), file: UploadFile = File(...),
+                              lang_code: str = Form(...), lang_pair: str = Form(...),
+                              background_tasks: BackgroundTasks = BackgroundTasks()):
+    """
+    Replace every lang_code row of lang_pair with the content of a .txt corpus file (the /import format).
+    The new corpus is loaded into a staging table in the background and swapped in atomically,
+    so readers see the old corpus until the swap and never an empty or half-loaded one.
+    Poll GET /master/replace/{job_id} for the result.
+    """
+    if current_user is None:
+        raise HTTPException(status_code=401, detail="Not authenticated")
+    if current_user.role != UserRole.ADMIN:
+        raise HTTPException(status_code=403, detail="No Permission. Only admin can import master data")
+    filename = (file.filename or "").lower()
+    if not filename.endswith(REPLACE_FILE_EXTENSIONS):
+        raise HTTPException(status_code=400, detail="File must be .txt")
+    if any(job["lang_pair"] == lang_pair and job["status"] in ("queued", "running") for job in replace_jobs.values()):
+        raise HTTPException(status_code=409, detail=f"A replacement of {lang_pair} is already running")
+
+    content = await file.read()
+    job_id = str(uuid.uuid4())
+    replace_jobs[job_id] = {
+        "job_id": job_id,
+        "status": "queued",
+        "lang_code": lang_code,
+        "lang_pair": lang_pair,
+        "rows": 0,
+        "error": None,
+        "created_at": datetime.utcnow(),
+        "finished_at": None,
+    }
+    background_tasks.add_task(run_replace_job, job_id, content, filename, lang_code, lang_pair, current_user.id)
+    return {"job_id": job_id, "status": "queued"}
+
+@router.get("/replace/{job_id}")
+def get_replace_job(job_id: str):
+    job = replace_jobs.get(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail="Replace job not found")
+    return job
+
+@router.get("/export")
+def export_corpus(current_user: Optional[User] = Depends(get_current_user), lang_pair: str = '', lang_code: str = '',
+                  format: str = 'tsv', gzip: bool = False, db: Session = Depends(get_db)):
+    """
+    Stream a language pair's corpus (only lang_code rows when given) as tsv (the /import file
+    format), csv, jsonl or parquet, optionally gzip-compressed. Rows are read through a
+    server-side cursor, so memory use does not grow with the size of the corpus.
+    """
+    if current_user is None:
+        raise HTTPException(status_code=401, detail="Not authenticated")
+    if current_user.role != UserRole.ADMIN:
+        raise HTTPException(status_code=403, detail="No Permission. Only admin can export master data")
+    if format not in EXPORT_FORMATS:
+        raise HTTPException(status_code=400, detail=f"format must be one of {EXPORT_FORMATS}")
+    if format == "parquet" and not parquet_available():
+        raise HTTPException(status_code=503, detail="Parquet export needs pyarrow installed on the server")
+    if not tag_dictionary.known_lang_pair_ids(db, [lang_pair]):
+        raise HTTPException(status_code=404, detail=f"Language pair {lang_pair!r} not found")
+
+    filename = export_filename(lang_pair, lang_code, format, gzip)
+    headers = {"Content-Disposition": f'attachment; filename="{filename}"'}
+    if gzip and format != "parquet":
+        media_type = "application/gzip"
+    else:
+        media_type = MEDIA_TYPES[format]
+    return StreamingResponse(export_chunks(format, lang_pair, lang_code, gzip), media_type=media_type, headers=headers)
+
+@router.post("/snapshot")
+def build_corpus_snapshot(current_user: Optional[User] = Depends(get_current_user), lang_pair: str = '',
+                          background_tasks: BackgroundTasks = BackgroundTasks()):
+    """
+    Rebuild the Parquet snapshot used by source=snapshot of the statistics and facet endpoints,
+    for one language pair or (lang_pair empty) all of them. Poll GET /master/snapshot/{job_id}.
+    """
+    if current_user is None:
+        raise HTTPException(status_code=401, detail="Not authenticated")
+    if current_user.role != UserRole.ADMIN:
+        raise HTTPException(status_code=403, detail="No Permission. Only admin can build the snapshot")
+    if not parquet_available():
+        raise HTTPException(status_code=503, detail="The corpus snapshot needs pyarrow installed on the server")
+    if any(job["status"] in ("queued", "running") for job in snapshot_jobs.values()):
+        raise HTTPException(status_code=409, detail="A snapshot build is already running")
+
+    job_id = str(uuid.uuid4())
+    snapshot_jobs[job_id] = {
+        "job_id": job_id,
+        "status": "queued",
+        "lang_pair": lang_pair or None,
+        "pairs": {},
+        "error": None,
+        "created_at": datetime.utcnow(),
+        "finished_at": None,
+    }
+    background_tasks.add_task(run_snapshot_job, job_id, [lang_pair] if lang_pair else None)
+    return {"job_id": job_id, "status": "queued"}
+
+@router.get("/snapshot")
+def get_corpus_snapshot():
+    """Manifest of the current snapshot: build time and rows per language pair"""
+    manifest = corpus_snapshot.manifest()
+    if manifest is None:
+        raise HTTPException(status_code=404, detail="No corpus snapshot")
+    return manifest
+
+@router.get("/snapshot/{job_id}")
+def get_snapshot_job(job_id: str):
+    job = snapshot_jobs.get(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail="Snapshot job not found")
+    return job
+
+@router.post("/corpus-store")
+def build_corpus_store(current_user: Optional[User] = Depends(get_current_user),
+                       background_tasks: BackgroundTasks = BackgroundTasks()):
+    """
+    Rebuild the memory-mapped corpus store used by source=store of /dicid and /align-sentence.
+    Every worker switches to the new build on its next request. Poll GET /master/corpus-store/{job_id}.
+    """
+    if current_user is None:
+        raise HTTPException(status_code=401, detail="Not authenticated")
+    if current_user.role != UserRole.ADMIN:
+        raise HTTPException(status_code=403, detail="No Permission. Only admin can build the corpus store")
+    if any(job["status"] in ("queued", "running") for job in store_jobs.values()):
+        raise HTTPException(status_code=409, detail="A corpus store build is already running")
+
+    job_id = str(uuid.uuid4())
+    store_jobs[job_id] = {
+        "job_id": job_id,
+        "status": "queued",
+        "manifest": None,
+        "error": None,
+        "created_at": datetime.utcnow(),
+        "finished_at": None,
+    }
+    background_tasks.add_task(run_store_job, job_id)
+    return {"job_id": job_id, "status": "queued"}
+
+@router.get("/corpus-store")
+def get_corpus_store():
+    """Manifest of the published corpus store: build, time and size"""
+    manifest = corpus_store.manifest()
+    if manifest is None:
+        raise HTTPException(status_code=404, detail="No corpus store")
+    return manifest
+
+@router.get("/corpus-store/{job_id}")
+def get_store_job(job_id: str):
+    job = store_jobs.get(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail="Corpus store job not found")
+    return job
+
+def export_chunks(fmt: str, lang_pair: str, lang_code: str, gzip: bool) -> Iterator[bytes]:
+    # The cursor outlives the request, so the stream uses its own session
+    db = SessionLocal()
+    try:
+        yield from corpus_export_service.stream(db, fmt, lang_pair, lang_code=lang_code or None, gzip=gzip)
+    finally:
+        db.close()
+
+@router.post("/pre-annotate")
+async def pre_annotate_corpus(current_user: Optional[User] = Depends(get_current_user),
+                              source_file: UploadFile = File(...), target_file: UploadFile = File(...),
+                              source_lang: str = Form(...), target_lang: str = Form(...), lang_pair: str = Form(...),
+                              batch_size: int = Form(64), background_tasks: BackgroundTasks = BackgroundTasks()):
+    """
+    Segment and tag two raw parallel text files (one sentence per line, line N of each file
+    is a pair) and load the result into master_row_words in the background.
+    Poll GET /master/pre-annotate/{job_id} for progress and per-stage throughput.
+    """
+    if current_user is None:
+        raise HTTPException(status_code=401, detail="Not authenticated")
+    if current_user.role != UserRole.ADMIN:
+        raise HTTPException(status_code=403, detail="No Permission. Only admin can import master data")
+    if source_lang not in SUPPORTED_LANGUAGES or target_lang not in SUPPORTED_LANGUAGES or source_lang == target_lang:
+        raise HTTPException(status_code=400, detail=f"source_lang and target_lang must be two different languages of {SUPPORTED_LANGUAGES}")
+
+    try:
+        source_lines = (await source_file.read()).decode("utf-8").splitlines()
+        target_lines = (await target_file.read()).decode("utf-8").splitlines()
+    except UnicodeDecodeError:
+        raise HTTPException(status_code=400, detail="Files must be UTF-8 text")
+    if len(source_lines) != len(target_lines):
+        raise HTTPException(status_code=400, detail=f"Files are not parallel: {len(source_lines)} and {len(target_lines)} lines")
+
+    job_id = str(uuid.uuid4())
+    stats = PipelineStats()
+    pre_annotation_jobs[job_id] = {
+        "job_id": job_id,
+        "status": "queued",
+        "lang_pair": lang_pair,
+        "total_pairs": len(source_lines),
+        "stats": stats,
+        "error": None,
+        "created_at": datetime.utcnow(),
+        "finished_at": None,
+    }
+    background_tasks.add_task(run_pre_annotation_job, job_id, source_lines, target_lines,
+                              source_lang, target_lang, lang_pair, batch_size, current_user.id)
+    return {"job_id": job_id, "status": "queued", "total_pairs": len(source_lines)}
+
+@router.get("/pre-annotate/{job_id}")
+def get_pre_annotation_job(job_id: str):
+    job = pre_annotation_jobs.get(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail="Pre-annotation job not found")
+    return {**job, "stats": job["stats"].as_dict()}
+
 @router.get("/words")
 @cache(expire=600)
 def get_all(db: Session = Depends(get_db), response_model=MasterRowWordListResponse,
-            page: int = 1, limit: int = 10, lang_code: str = '', search: str = ''):
+            page: int = 1, limit: int = 10, lang_code: str = '', search: str = '', search_mode: str = 'exact'):
     total_all = db.query(func.count(MasterRowWord.id)).scalar()
     total_all_sen = db.query(func.count(distinct(MasterRowWord.id_sen))).scalar()
     query = db.query(MasterRowWord)
@@ -60,7 +339,11 @@ def get_all(db: Session = Depends(get_db), response_model=MasterRowWordListRespo
     if lang_code != '':
         query = query.filter(MasterRowWord.lang_code == lang_code)
 
-    if search != '':
+    if search != '' and search_mode != 'exact':
+        # Indexed equality on the precomputed search form
+        column, key = search_column_and_key(search_mode, search.strip().replace(" ", "_"))
+        query = query.filter(column == key)
+    elif search != '':
         query = query.filter(
             or_(
                 MasterRowWord.word.contains(search),
@@ -104,15 +387,11 @@ def get_all(db: Session = Depends(get_db), response_model=MasterRowWordListRespo
 
 
 @router.get("/pos")
-def get_all_pos(db: Session = Depends(get_db), lang_code: str = ""):
-    # SELECT pos FROM master_row_words [WHERE lang_code=?] GROUP BY pos;
-    query = db.query(distinct(MasterRowWord.pos))
-    if lang_code:
-        query = query.filter(MasterRowWord.lang_code == lang_code)
-    rows = query.all()
-    values = [r[0] for r in rows if r[0] is not None and str(r[0]).strip() != ""]
-    values = sorted(values)
-    return {"data": values}
+def get_all_pos(db: Session = Depends(get_db), lang_code: str = "", source: str = "db"):
+    if check_analytics_source(source):
+        return {"data": corpus_snapshot.distinct_values("pos", lang_code)}
+    conditions = [MasterRowWord.lang_code == lang_code] if lang_code else []
+    return {"data": tag_dictionary.values_in_use(db, "pos", *conditions)}
 
 @router.get("/statistic-with-tag")
 def get_statistic_with_tag(
@@ -120,6 +399,7 @@ def get_statistic_with_tag(
     lang_code: str = "",
     tag_type: str = "",
     tag_value: str = "",
+    source: str = "db",
 ):
     """
     Return frequency statistics per word filtered by optional lang_code and a tag filter.
@@ -128,23 +408,24 @@ def get_statistic_with_tag(
     - lang_code: optional language code to scope the corpus
     - tag_type: one of ['pos', 'ner', 'semantic']
     - tag_value: the value of the selected tag (case-insensitive)
+    - source: 'db' (default) or 'snapshot' to aggregate the Parquet snapshot instead of Postgres
 
     Response:
     { "data": [{"Word": str, "Count": int, "Percent": float, "F": float}, ...] }
     where Percent = 100 * Count / N and F = -log10(Count / N)
     """
+    if check_analytics_source(source):
+        total_tokens, rows = corpus_snapshot.word_frequencies(lang_code, tag_type, tag_value)
+        return {"data": frequency_data(total_tokens, rows)}
+
     # Compute N applying the same filters
+    tag_condition = tag_dictionary.tag_filter(tag_type, tag_value) if tag_type and tag_value else None
+
     total_query = db.query(func.count(MasterRowWord.id))
     if lang_code:
         total_query = total_query.filter(MasterRowWord.lang_code == lang_code)
-    if tag_type and tag_value:
-        tv = (tag_value or "").lower()
-        if tag_type == 'pos':
-            total_query = total_query.filter(func.lower(MasterRowWord.pos) == tv)
-        elif tag_type == 'ner':
-            total_query = total_query.filter(func.lower(MasterRowWord.ner) == tv)
-        elif tag_type == 'semantic':
-            total_query = total_query.filter(func.lower(MasterRowWord.semantic) == tv)
+    if tag_condition is not None:
+        total_query = total_query.filter(tag_condition)
 
     total_tokens = total_query.scalar() or 0
     if total_tokens == 0:
@@ -157,14 +438,8 @@ def get_statistic_with_tag(
     )
     if lang_code:
         agg_query = agg_query.filter(MasterRowWord.lang_code == lang_code)
-    if tag_type and tag_value:
-        tv = (tag_value or "").lower()
-        if tag_type == 'pos':
-            agg_query = agg_query.filter(func.lower(MasterRowWord.pos) == tv)
-        elif tag_type == 'ner':
-            agg_query = agg_query.filter(func.lower(MasterRowWord.ner) == tv)
-        elif tag_type == 'semantic':
-            agg_query = agg_query.filter(func.lower(MasterRowWord.semantic) == tv)
+    if tag_condition is not None:
+        agg_query = agg_query.filter(tag_condition)
 
     agg_query = (
         agg_query
@@ -174,8 +449,24 @@ def get_statistic_with_tag(
         .order_by(func.count(MasterRowWord.id).desc(), MasterRowWord.word.asc())
     )
 
-    rows = agg_query.all()
+    return {"data": frequency_data(total_tokens, agg_query.all())}
+
+@router.get("/ner")
+def get_all_ner(db: Session = Depends(get_db), lang_code: str = "", source: str = "db"):
+    if check_analytics_source(source):
+        return {"data": corpus_snapshot.distinct_values("ner", lang_code)}
+    conditions = [MasterRowWord.lang_code == lang_code] if lang_code else []
+    return {"data": tag_dictionary.values_in_use(db, "ner", *conditions)}
 
+@router.get("/semantic")
+def get_all_semantic(db: Session = Depends(get_db), lang_code: str = "", source: str = "db"):
+    if check_analytics_source(source):
+        return {"data": corpus_snapshot.distinct_values("semantic", lang_code)}
+    conditions = [MasterRowWord.lang_code == lang_code] if lang_code else []
+    return {"data": tag_dictionary.values_in_use(db, "semantic", *conditions)}
+
+def frequency_data(total_tokens: int, rows) -> List[dict]:
+    """Word, Count, Percent = 100 * Count / N and F = -log10(Count / N) of (word, count) rows"""
     data = []
     for word, cnt in rows:
         n = int(cnt)
@@ -188,35 +479,13 @@ def get_statistic_with_tag(
             "Percent": percent,
             "F": f_value,
         })
-
-    return {"data": data}
-
-@router.get("/ner")
-def get_all_ner(db: Session = Depends(get_db), lang_code: str = ""):
-    # SELECT ner FROM master_row_words [WHERE lang_code=?] GROUP BY ner;
-    query = db.query(distinct(MasterRowWord.ner))
-    if lang_code:
-        query = query.filter(MasterRowWord.lang_code == lang_code)
-    rows = query.all()
-    values = [r[0] for r in rows if r[0] is not None and str(r[0]).strip() != ""]
-    values = sorted(values)
-    return {"data": values}
-
-@router.get("/semantic")
-def get_all_semantic(db: Session = Depends(get_db), lang_code: str = ""):
-    # SELECT semantic FROM master_row_words [WHERE lang_code=?] GROUP BY semantic;
-    query = db.query(distinct(MasterRowWord.semantic))
-    if lang_code:
-        query = query.filter(MasterRowWord.lang_code == lang_code)
-    rows = query.all()
-    values = [r[0] for r in rows if r[0] is not None and str(r[0]).strip() != ""]
-    values = sorted(values)
-    return {"data": values}
+    return data
 
 @router.get("/statistics")
-def get_all_statistics(db: Session = Depends(get_db), lang_code: str = ""):
+def get_all_statistics(db: Session = Depends(get_db), lang_code: str = "", source: str = "db"):
     """
     Return frequency statistics per word with optional language filter.
+    source=snapshot aggregates the Parquet snapshot instead of Postgres.
 
     Response format:
     {
@@ -227,6 +496,10 @@ def get_all_statistics(db: Session = Depends(get_db), lang_code: str = ""):
     }
     where Percent = 100 * Count / N and F = -log10(Count / N), with N being total tokens under the same filter.
     """
+    if check_analytics_source(source):
+        total_tokens, rows = corpus_snapshot.word_frequencies(lang_code)
+        return {"data": frequency_data(total_tokens, rows)}
+
     total_query = db.query(func.count(MasterRowWord.id))
     if lang_code:
         total_query = total_query.filter(MasterRowWord.lang_code == lang_code)
@@ -251,22 +524,7 @@ def get_all_statistics(db: Session = Depends(get_db), lang_code: str = ""):
         .order_by(func.count(MasterRowWord.id).desc(), MasterRowWord.word.asc())
     )
 
-    rows = agg_query.all()
-
-    data = []
-    for word, cnt in rows:
-        n = int(cnt)
-        percent = (n * 100.0) / float(total_tokens)
-        ratio = n / float(total_tokens)
-        f_value = -math.log10(ratio) if ratio > 0 else float("inf")
-        data.append({
-            "Word": word,
-            "Count": n,
-            "Percent": percent,
-            "F": f_value,
-        })
-
-    return {"data": data}
+    return {"data": frequency_data(total_tokens, agg_query.all())}
 @router.put("/words/{id}")
 def update_word(db: Session = Depends(get_db), response_model=MasterRowWordListResponse,
                 current_user: Optional[User] = Depends(get_current_user), 
@@ -282,7 +540,7 @@ def update_word(db: Session = Depends(get_db), response_model=MasterRowWordListR
         raise HTTPException(status_code=404, detail="Word not found - id: " + str(id))
 
     # Cập nhật các trường
-    update_data = payload.dict(exclude_unset=True)
+    update_data = tag_dictionary.with_ids(db, [with_search_forms(payload.dict(exclude_unset=True))])[0]
     for key, value in update_data.items():
         setattr(db_word, key, value)
 
@@ -297,27 +555,34 @@ def update_word(db: Session = Depends(get_db), response_model=MasterRowWordListR
 
 @router.delete("/words/delete-all")
 def delete_all(db: Session = Depends(get_db), lang_code: str = "", lang_pair: str = ""):
-    master_row_word_service.delete_all_fast(db, lang_code, lang_pair)
-    return {"message": "All words deleted successfully", "lang_code": lang_code, "lang_pair": lang_pair}
+    deleted = master_row_word_service.delete_all_fast(db, lang_code, lang_pair)
+    return {"message": "All words deleted successfully", "lang_code": lang_code, "lang_pair": lang_pair, "deleted": deleted}
 
 @router.get("/dicid")
-def get_dicid_by_lang(lang_code: str, other_lang_code: str, lang_pair: str, search: str = '', is_morph: bool = False, is_phrase: bool = False, page: int = 1, limit: int = 10, db: Session = Depends(get_db)):
+def get_dicid_by_lang(lang_code: str, other_lang_code: str, lang_pair: str, search: str = '', is_morph: bool = False, is_phrase: bool = False, page: int = 1, limit: int = 10, search_mode: str = 'exact', source: str = 'db', db: Session = Depends(get_db)):
     """
     Return a dictionary mapping ID_sen -> { start: int, end: int }
     computed over all RowWord rows for the given lang_code.
 
     The indices are based on the order of rows sorted by (ID_sen, ID).
     Now returns data for both language directions regardless of lang_pair value.
+    search_mode "typed" / "toneless" matches the word's precomputed search form instead of the word itself.
+    source=store answers from the memory-mapped corpus store instead of Postgres.
     """
     if not lang_code:
         raise HTTPException(status_code=400, detail="lang_code is required")
+    if search_mode not in SEARCH_MODES:
+        raise HTTPException(status_code=400, detail=f"search_mode must be one of {SEARCH_MODES}")
+    use_store = check_serving_source(source)
 
     # Determine both possible language pairs
     pair1 = f"{lang_code}_{other_lang_code}"
     pair2 = f"{other_lang_code}_{lang_code}"
     
     query = db.query(MasterRowWord).filter(MasterRowWord.lang_code == lang_code)
-    query = query.filter(MasterRowWord.lang_pair.in_([pair1, pair2]))
+    query = query.filter(tag_dictionary.lang_pair_filter(db, [pair1, pair2]))
+    # The same filters as (column name, accepted values) for the corpus store
+    store_conditions = []
 
     
     if search != '':  # Kiểm tra search khác rỗng
@@ -326,33 +591,45 @@ def get_dicid_by_lang(lang_code: str, other_lang_code: str, lang_pair: str, sear
         norm_key = (search or "").strip().replace(" ", "_")
         key_lower = norm_key.lower()
         
+        word_column, word_key = search_column_and_key(search_mode, norm_key)
+
         if is_phrase:
             phrase_search = create_phrase2(search)
-            query = query.filter(MasterRowWord.word.in_(phrase_search))
+            phrase_keys = [search_column_and_key(search_mode, p)[1] for p in phrase_search]
+            query = query.filter(word_column.in_(phrase_keys))
+            store_conditions.append((word_column.key, phrase_keys))
 
         if not is_morph:
-            query = query.filter(MasterRowWord.word == norm_key)
+            query = query.filter(word_column == word_key)
+            store_conditions.append((word_column.key, [word_key]))
         else:
             # Case-insensitive compare for Morph
             query = query.filter(func.lower(MasterRowWord.morph) == key_lower)
-            
-    total = query.count()
-    rows = (
-        query
-        .order_by(MasterRowWord.id_sen, MasterRowWord.id)
-        .offset((page - 1) * limit).limit(limit)
-        .all()
-    )
-    list_id_sen = [row.id_sen for row in rows]
+            store_conditions.append(("morph_lower", [key_lower]))
 
-    rows_in_list_id_sen = (
-        db.query(MasterRowWord)
-        .filter(MasterRowWord.lang_code.in_([lang_code, other_lang_code]))
-        .filter(MasterRowWord.id_sen.in_(list_id_sen))
-        .filter(MasterRowWord.lang_pair.in_([pair1, pair2]))
-        .order_by(MasterRowWord.id_sen, MasterRowWord.id)
-        .all()
-    )
+    if use_store:
+        total, rows = corpus_store.search(lang_code, [pair1, pair2], store_conditions,
+                                          offset=(page - 1) * limit, limit=limit)
+        rows_in_list_id_sen = corpus_store.sentence_tokens([pair1, pair2], [lang_code, other_lang_code],
+                                                           [row.id_sen for row in rows])
+    else:
+        total = query.count()
+        rows = (
+            query
+            .order_by(MasterRowWord.id_sen, MasterRowWord.position, MasterRowWord.id)
+            .offset((page - 1) * limit).limit(limit)
+            .all()
+        )
+        list_id_sen = [row.id_sen for row in rows]
+
+        rows_in_list_id_sen = (
+            db.query(MasterRowWord)
+            .filter(MasterRowWord.lang_code.in_([lang_code, other_lang_code]))
+            .filter(MasterRowWord.id_sen.in_(list_id_sen))
+            .filter(tag_dictionary.lang_pair_filter(db, [pair1, pair2]))
+            .order_by(MasterRowWord.id_sen, MasterRowWord.lang_code, MasterRowWord.position)
+            .all()
+        )
     # return rows_in_list_id_sen
     lang_code_dic = []
     other_lang_code_dic = []
@@ -362,31 +639,31 @@ def get_dicid_by_lang(lang_code: str, other_lang_code: str, lang_pair: str, sear
             "id_string": row.id_string,
             "id_sen": row.id_sen,
             "center": row.word,
-            "position": extract_last_key_id(row.id_string),
+            "position": row.position,
         }
         rows_same_sen = [r for r in rows_in_list_id_sen if r.id_sen == row.id_sen and r.lang_code == lang_code]
 
-        row_links = [s for s in (row.links or "").split(",") if s]
-        row_start = row_links[0]
-        row_end = row_links[row_links.__len__() - 1]
+        row_links = list(row.links_array or [])
+        row_start = row_links[0] if row_links else None
+        row_end = row_links[-1] if row_links else None
         new_dic = []
         for r in rows_same_sen:
-            position = extract_last_key_id(r.id_string)
-            links = [s for s in (r.links or "").split(",") if s]
+            position = r.position
+            links = list(r.links_array or [])
             new_dic.append({
                 "position": position,
                 "word": r.word,
                 "links_array": links,
                 "links": r.links,
-                "start": links[0],
-                "end": links[links.__len__() - 1]
+                "start": links[0] if links else None,
+                "end": links[-1] if links else None
             })
 
         sentence_left = ""
         sentence_right = ""
-        sorted_same_sen = sorted(new_dic, key=lambda x: x["position"])
+        sorted_same_sen = new_dic  # rows are queried in position order
 
-        center_position = extract_last_key_id(row.id_string)
+        center_position = row.position
         for r in sorted_same_sen:
             if r['position'] < center_position:
                 sentence_left += f"{r['word']} "
@@ -406,38 +683,38 @@ def get_dicid_by_lang(lang_code: str, other_lang_code: str, lang_pair: str, sear
             "start_center": row_start,
             "end_center": row_end,
             # "center": other_lang_row.word,
-            # "position": extract_last_key_id(other_lang_row.id_string),
+            # "position": other_lang_row.position,
         }
 
         other_lang_rows_same_sen = [r for r in rows_in_list_id_sen if (r.id_sen == row.id_sen and r.lang_code == other_lang_code)]
         other_lang_new_dic = []
         for r in other_lang_rows_same_sen:
-            position = extract_last_key_id(r.id_string)
-            links = [s for s in (r.links or "").split(",") if s]
+            position = r.position
+            links = list(r.links_array or [])
             other_lang_new_dic.append({
                 "position": position,
                 "word": r.word,
                 "links": r.links,
                 "links_array": links,
-                "start": links[0],
-                "end": links[links.__len__() - 1]
+                "start": links[0] if links else None,
+                "end": links[-1] if links else None
             })
 
         other_lang_sentence_left = ""
         other_lang_sentence_right = ""
-        other_lang_sorted_same_sen = sorted(other_lang_new_dic, key=lambda x: x["position"])
+        other_lang_sorted_same_sen = other_lang_new_dic  # rows are queried in position order
 
-        if row.links == "-":
+        if not row_links:
             other_lang_row_full["center"] = "-"
             for r in other_lang_sorted_same_sen:
                 other_lang_sentence_right += f"{r['word']} "
         else:
             other_lang_sentence_center = ""
             for r in other_lang_sorted_same_sen:
-                if r['position'] < int(row_start):
+                if r['position'] < row_start:
                     other_lang_sentence_left += f"{r['word']} "
                 else :
-                    if r['position'] > int(row_end):
+                    if r['position'] > row_end:
                         other_lang_sentence_right += f"{r['word']} "
                     else :
                         other_lang_sentence_center += f"{r['word']} "
@@ -497,7 +774,7 @@ def get_dicid_by_lang_with_tag(
     pair2 = f"{other_lang_code}_{lang_code}"
     
     query = db.query(MasterRowWord).filter(MasterRowWord.lang_code == lang_code)
-    query = query.filter(MasterRowWord.lang_pair.in_([pair1, pair2]))
+    query = query.filter(tag_dictionary.lang_pair_filter(db, [pair1, pair2]))
 
     # Apply search filter
     if search != '':
@@ -512,18 +789,14 @@ def get_dicid_by_lang_with_tag(
     
     # Apply tag filter
     if tag_type and tag_value:
-        tag_value_lower = tag_value.lower()
-        if tag_type == 'pos':
-            query = query.filter(func.lower(MasterRowWord.pos) == tag_value_lower)
-        elif tag_type == 'ner':
-            query = query.filter(func.lower(MasterRowWord.ner) == tag_value_lower)
-        elif tag_type == 'semantic':
-            query = query.filter(func.lower(MasterRowWord.semantic) == tag_value_lower)
+        tag_condition = tag_dictionary.tag_filter(tag_type, tag_value)
+        if tag_condition is not None:
+            query = query.filter(tag_condition)
             
     total = query.count()
     rows = (
         query
-        .order_by(MasterRowWord.id_sen, MasterRowWord.id)
+        .order_by(MasterRowWord.id_sen, MasterRowWord.position, MasterRowWord.id)
         .offset((page - 1) * limit).limit(limit)
         .all()
     )
@@ -533,8 +806,8 @@ def get_dicid_by_lang_with_tag(
         db.query(MasterRowWord)
         .filter(MasterRowWord.lang_code.in_([lang_code, other_lang_code]))
         .filter(MasterRowWord.id_sen.in_(list_id_sen))
-        .filter(MasterRowWord.lang_pair.in_([pair1, pair2]))
-        .order_by(MasterRowWord.id_sen, MasterRowWord.id)
+        .filter(tag_dictionary.lang_pair_filter(db, [pair1, pair2]))
+        .order_by(MasterRowWord.id_sen, MasterRowWord.lang_code, MasterRowWord.position)
         .all()
     )
     
@@ -546,31 +819,31 @@ def get_dicid_by_lang_with_tag(
             "id_string": row.id_string,
             "id_sen": row.id_sen,
             "center": row.word,
-            "position": extract_last_key_id(row.id_string),
+            "position": row.position,
         }
         rows_same_sen = [r for r in rows_in_list_id_sen if r.id_sen == row.id_sen and r.lang_code == lang_code]
 
-        row_links = [s for s in (row.links or "").split(",") if s]
-        row_start = row_links[0]
-        row_end = row_links[row_links.__len__() - 1]
+        row_links = list(row.links_array or [])
+        row_start = row_links[0] if row_links else None
+        row_end = row_links[-1] if row_links else None
         new_dic = []
         for r in rows_same_sen:
-            position = extract_last_key_id(r.id_string)
-            links = [s for s in (r.links or "").split(",") if s]
+            position = r.position
+            links = list(r.links_array or [])
             new_dic.append({
                 "position": position,
                 "word": r.word,
                 "links_array": links,
                 "links": r.links,
-                "start": links[0],
-                "end": links[links.__len__() - 1]
+                "start": links[0] if links else None,
+                "end": links[-1] if links else None
             })
 
         sentence_left = ""
         sentence_right = ""
-        sorted_same_sen = sorted(new_dic, key=lambda x: x["position"])
+        sorted_same_sen = new_dic  # rows are queried in position order
 
-        center_position = extract_last_key_id(row.id_string)
+        center_position = row.position
         for r in sorted_same_sen:
             if r['position'] < center_position:
                 sentence_left += f"{r['word']} "
@@ -588,45 +861,45 @@ def get_dicid_by_lang_with_tag(
             "start_center": row_start,
             "end_center": row_end,
             # "center": row.word,
-            # "position": extract_last_key_id(row.id_string),
+            # "position": row.position,
         }
         other_lang_rows_same_sen = [r for r in rows_in_list_id_sen if r.id_sen == row.id_sen and r.lang_code == other_lang_code]
 
         other_lang_new_dic = []
         for r in other_lang_rows_same_sen:
-            position = extract_last_key_id(r.id_string)
-            links = [s for s in (r.links or "").split(",") if s]
+            position = r.position
+            links = list(r.links_array or [])
             other_lang_new_dic.append({
                 "position": position,
                 "word": r.word,
                 "links_array": links,
                 "links": r.links,
-                "start": links[0],
-                "end": links[links.__len__() - 1]
+                "start": links[0] if links else None,
+                "end": links[-1] if links else None
             })
 
         other_lang_sentence_left = ""
         other_lang_sentence_right = ""
-        other_lang_sorted_same_sen = sorted(other_lang_new_dic, key=lambda x: x["position"])
+        other_lang_sorted_same_sen = other_lang_new_dic  # rows are queried in position order
 
-        # other_lang_center_position = extract_last_key_id(row.id_string)
+        # other_lang_center_position = row.position
         # for r in other_lang_sorted_same_sen:
         #     if r['position'] < other_lang_center_position:
         #         other_lang_sentence_left += f"{r['word']} "
         #     if r['position'] > other_lang_center_position:
         #         other_lang_sentence_right += f"{r['word']} "
         
-        if row.links == "-":
+        if not row_links:
             other_lang_row_full["center"] = "-"
             for r in other_lang_sorted_same_sen:
                 other_lang_sentence_right += f"{r['word']} "
         else:
             other_lang_sentence_center = ""
             for r in other_lang_sorted_same_sen:
-                if r['position'] < int(row_start):
+                if r['position'] < row_start:
                     other_lang_sentence_left += f"{r['word']} "
                 else :
-                    if r['position'] > int(row_end):
+                    if r['position'] > row_end:
                         other_lang_sentence_right += f"{r['word']} "
                     else :
                         other_lang_sentence_center += f"{r['word']} "
@@ -659,64 +932,72 @@ def get_dicid_by_lang_with_tag(
     }
 
 @router.get("/align-sentence")
-def get_align_sentence(db: Session = Depends(get_db), id_string: str = '', lang_code: str = 'en', other_lang_code: str = 'vi', lang_pair: str = 'vi_en'):
-
+def get_align_sentence(db: Session = Depends(get_db), id_string: str = '', lang_code: str = 'en', other_lang_code: str = 'vi', lang_pair: str = 'vi_en',
+                       source: str = 'db'):
+    """source=store answers from the memory-mapped corpus store instead of Postgres"""
     if id_string == '':
         raise HTTPException(status_code=404, detail="Row not found - id_string is empty")
+    use_store = check_serving_source(source)
     
     # Determine both possible language pairs
     pair1 = f"{lang_code}_{other_lang_code}"
     pair2 = f"{other_lang_code}_{lang_code}"
     
-    row = db.query(MasterRowWord).filter(MasterRowWord.id_string == id_string)
-    row = row.filter(MasterRowWord.lang_code == lang_code)
-    row = row.filter(MasterRowWord.lang_pair.in_([pair1, pair2]))
-    row = row.first()
+    if use_store:
+        row = corpus_store.find(id_string, lang_code, [pair1, pair2])
+    else:
+        row = db.query(MasterRowWord).filter(MasterRowWord.id_string == id_string)
+        row = row.filter(MasterRowWord.lang_code == lang_code)
+        row = row.filter(tag_dictionary.lang_pair_filter(db, [pair1, pair2]))
+        row = row.first()
     if not row:
         raise HTTPException(status_code=404, detail="Row not found - id_string not exist")
 
 
-    rows_in_list_id_sen = (
-        db.query(MasterRowWord)
-        .filter(MasterRowWord.lang_code.in_([lang_code, other_lang_code]))
-        .filter(MasterRowWord.lang_pair.in_([pair1, pair2]))
-        .filter(MasterRowWord.id_sen == row.id_sen)
-        .order_by(MasterRowWord.id_sen, MasterRowWord.id)
-        .all()
-    )
+    if use_store:
+        rows_in_list_id_sen = corpus_store.sentence_tokens([pair1, pair2], [lang_code, other_lang_code], [row.id_sen])
+    else:
+        rows_in_list_id_sen = (
+            db.query(MasterRowWord)
+            .filter(MasterRowWord.lang_code.in_([lang_code, other_lang_code]))
+            .filter(tag_dictionary.lang_pair_filter(db, [pair1, pair2]))
+            .filter(MasterRowWord.id_sen == row.id_sen)
+            .order_by(MasterRowWord.id_sen, MasterRowWord.lang_code, MasterRowWord.position)
+            .all()
+        )
     rows_in_lang_code = [r for r in rows_in_list_id_sen if r.lang_code == lang_code]
     rows_in_other_lang_code = [r for r in rows_in_list_id_sen if r.lang_code == other_lang_code]
 
     new_dic_in_lang_code = []
     for r in rows_in_lang_code:
-        position = extract_last_key_id(r.id_string)
-        links = [s for s in (r.links or "").split(",") if s]
+        position = r.position
+        links = list(r.links_array or [])
         new_dic_in_lang_code.append({
             "position": position,
             "word": r.word,
             "pos": r.pos,
             "links_array": links,
             "links": r.links,
-            "start": links[0],
-            "end": links[links.__len__() - 1]
+            "start": links[0] if links else None,
+            "end": links[-1] if links else None
         })
 
     new_dic_in_other_lang_code = []
     for r in rows_in_other_lang_code:
-        position = extract_last_key_id(r.id_string)
-        links = [s for s in (r.links or "").split(",") if s]
+        position = r.position
+        links = list(r.links_array or [])
         new_dic_in_other_lang_code.append({
             "position": position,
             "word": r.word,
             "pos": r.pos,
             "links_array": links,
             "links": r.links,
-            "start": links[0],
-            "end": links[links.__len__() - 1]
+            "start": links[0] if links else None,
+            "end": links[-1] if links else None
         })
 
-    new_dic_in_lang_code_sorted = sorted(new_dic_in_lang_code, key=lambda x: x["position"])
-    new_dic_in_other_lang_code_sorted = sorted(new_dic_in_other_lang_code, key=lambda x: x["position"])
+    new_dic_in_lang_code_sorted = new_dic_in_lang_code  # rows are queried in position order
+    new_dic_in_other_lang_code_sorted = new_dic_in_other_lang_code
 
     sentence_1 = []
     sentence_2 = []
@@ -731,7 +1012,7 @@ def get_align_sentence(db: Session = Depends(get_db), id_string: str = '', lang_
             # "links": row["links"],
             # "links_array": row["links_array"],
             # "id_target": [int(x) - 1 for x in row["links_array"]],
-            "id_target": [int(x) - 1 for x in row["links_array"]] if row["links"] != "-" else []
+            "id_target": [x - 1 for x in row["links_array"]]
             # "start": row["start"],
             # "end": row["end"]
         }
@@ -759,6 +1040,36 @@ def get_align_sentence(db: Session = Depends(get_db), id_string: str = '', lang_
         "sentence_2": sentence_2
     }
 
+@router.get("/linked-tokens")
+def get_linked_tokens(db: Session = Depends(get_db), id_sen: str = '', positions: str = '', lang_code: str = 'vi',
+                      other_lang_code: str = 'en'):
+    """
+    Tokens of sentence id_sen in lang_code aligned with a span of the other language, given as its
+    comma-separated token positions (e.g. positions=3,4 for the words of other_lang_code at 3 and 4).
+    """
+    if id_sen == '':
+        raise HTTPException(status_code=404, detail="Sentence not found - id_sen is empty")
+    try:
+        span = [int(p) for p in positions.split(",") if p.strip()]
+    except ValueError:
+        raise HTTPException(status_code=400, detail="positions must be comma-separated integers")
+    if not span:
+        raise HTTPException(status_code=400, detail="positions is required")
+
+    pair1 = f"{lang_code}_{other_lang_code}"
+    pair2 = f"{other_lang_code}_{lang_code}"
+    rows = master_row_word_service.linked_to(db, id_sen, lang_code, span, lang_pairs=[pair1, pair2])
+    return [
+        {
+            "id_string": r.id_string,
+            "position": r.position,
+            "word": r.word,
+            "pos": r.pos,
+            "links_array": list(r.links_array or []),
+        }
+        for r in rows
+    ]
+
 def extract_sentence_id(id_str: str) -> str:
     """
     Trích xuất 6 chữ số chính từ chuỗi ID dạng VDxxxxxxYY
@@ -781,17 +1092,6 @@ def extract_main_id(id_str: str) -> str:
         return id_str[2:10]
     raise ValueError(f"ID(extract_main_id) không hợp lệ: {id_str}")
 
-def extract_last_key_id(id_str: str) -> int:
-    """
-    Trích xuất 2 chữ số cuối từ chuỗi ID dạng xxxxxxYY
-    Ví dụ: '01821301' -> 1
-    Ví dụ: '00000201' -> 1
-    """
-    id_str = id_str.replace("\ufeff", "").strip()
-    if len(id_str) >= 8:
-        return int(id_str[-2:])
-    raise ValueError(f"ID(extract_last_key_id) không hợp lệ: {id_str}")
-
 def create_phrase(key: str) -> List[List[str]]:
     """
     Tách 1 phrase nhập vào thành các trường hợp có thể trong corpus.
@@ -876,60 +1176,141 @@ def create_phrase2(key: str) -> List[List[str]]:
 
     return merged
 
-def process_file_job(content: bytes, filename: str, lang_code: str, lang_pair: str, db: Session):
-    try:
-        count = 0
-        data_db = []
-        seen_ids = set()  # để kiểm tra trùng
-
-        if filename.endswith(".csv"):
-            df = pd.read_csv(io.StringIO(content.decode("utf-8")), sep=",")
-        elif filename.endswith(".xlsx"):
-            df = pd.read_excel(io.BytesIO(content), engine="openpyxl")
-        elif filename.endswith(".txt"):
-            lines = content.decode("utf-8").splitlines()
-            for line in lines:
-                if not line.strip():
-                    continue
-                fields = line.strip().split("\t")
-                if len(fields) < 9 or not fields[0].strip():
-                    continue
-
-                id_string = extract_main_id(fields[0])
-                id_sen = extract_sentence_id(fields[0])
-                if id_string in seen_ids:
-                    continue
-                seen_ids.add(id_string)
-
-                item = dict(
-                    id_string=id_string,
-                    id_sen=id_sen,
-                    word=fields[1],
-                    lemma=fields[2],
-                    links=fields[3],
-                    morph=fields[4],
-                    pos=fields[5],
-                    phrase=fields[6],
-                    grm=fields[7],
-                    ner=fields[8],
-                    semantic=fields[9] if len(fields) > 9 else "",
-                    lang_code=lang_code,
-                    lang_pair=lang_pair
-                )
-                data_db.append(item)
-                count += 1
-        else:
-            raise HTTPException(status_code=400, detail="File must be .csv, .xlsx, or .txt")
+# Only .txt rows are parsed, and a replace from a file without rows would empty the corpus
+REPLACE_FILE_EXTENSIONS = (".txt",)
 
-        # Bulk insert theo batch (mỗi batch 10k record)
-        chunk_size = 5000
-        for i in range(0, len(data_db), chunk_size):
-            db.bulk_insert_mappings(MasterRowWord, data_db[i:i+chunk_size])
-            db.commit()
+def parse_corpus_rows(content: bytes, filename: str, lang_code: str, lang_pair: str) -> Iterator[dict]:
+    """
+    Các dòng master_row_words đọc từ file corpus (.txt: mỗi dòng một token, các cột cách nhau bằng tab).
+    Các id_string trùng được giữ nguyên, việc loại trùng do database xử lý (xem process_file_job).
+    """
+    if filename.endswith(".csv"):
+        df = pd.read_csv(io.StringIO(content.decode("utf-8")), sep=",")
+    elif filename.endswith(".xlsx"):
+        df = pd.read_excel(io.BytesIO(content), engine="openpyxl")
+    elif filename.endswith(".txt"):
+        lines = content.decode("utf-8").splitlines()
+        for line in lines:
+            if not line.strip():
+                continue
+            fields = line.strip().split("\t")
+            if len(fields) < 9 or not fields[0].strip():
+                continue
+
+            id_string = extract_main_id(fields[0])
+            id_sen = extract_sentence_id(fields[0])
+
+            yield with_search_forms(dict(
+                id_string=id_string,
+                id_sen=id_sen,
+                word=fields[1],
+                lemma=fields[2],
+                links=fields[3],
+                morph=fields[4],
+                pos=fields[5],
+                phrase=fields[6],
+                grm=fields[7],
+                ner=fields[8],
+                semantic=fields[9] if len(fields) > 9 else "",
+                lang_code=lang_code,
+                lang_pair=lang_pair
+            ))
+    else:
+        raise HTTPException(status_code=400, detail="File must be .csv, .xlsx, or .txt")
 
-        print(f"Imported {count} rows from {filename}")
+def process_file_job(content: bytes, filename: str, lang_code: str, lang_pair: str, db: Session,
+                     mode: str = "skip") -> int:
+    """Upsert the file's rows on the unique key of master_row_words; returns the number of written rows"""
+    try:
+        # INSERT ... ON CONFLICT theo batch, mỗi batch một commit
+        count = master_row_word_service.bulk_upsert(
+            db, parse_corpus_rows(content, filename, lang_code, lang_pair),
+            on_conflict=IMPORT_MODES[mode], chunk_size=5000,
+        )
+
+        print(f"Imported {count} rows from {filename} (mode={mode})")
+        return count
 
     except Exception as e:
         print(f"Error processing file: {str(e)}")
         db.rollback()
         raise
+
+def run_pre_annotation_job(job_id: str, source_lines: List[str], target_lines: List[str], source_lang: str,
+                           target_lang: str, lang_pair: str, batch_size: int, user_id: int):
+    job = pre_annotation_jobs[job_id]
+    job["status"] = "running"
+    langs = {source_lang, target_lang}
+    vietnamese_service = get_vietnamese_nlp_service() if "vi" in langs else None
+    english_nlp = get_english_nlp() if "en" in langs else None
+    if ("vi" in langs and vietnamese_service is None) or ("en" in langs and english_nlp is None):
+        job["status"] = "failed"
+        job["error"] = "NLP model not available"
+        job["finished_at"] = datetime.utcnow()
+        return
+
+    # The request session is closed once the response is sent, so the job uses its own
+    db = SessionLocal()
+    try:
+        pipeline = CorpusAnnotationPipeline(vietnamese_service, english_nlp, batch_size=batch_size)
+        pipeline.run(db, source_lines, target_lines, source_lang=source_lang, target_lang=target_lang,
+                     lang_pair=lang_pair, create_by=user_id, stats=job["stats"])
+        job["status"] = "completed"
+    except Exception as e:
+        db.rollback()
+        print(f"Error in pre-annotation job {job_id}: {str(e)}")
+        job["status"] = "failed"
+        job["error"] = str(e)
+    finally:
+        job["finished_at"] = datetime.utcnow()
+        db.close()
+
+def run_replace_job(job_id: str, content: bytes, filename: str, lang_code: str, lang_pair: str, user_id: int):
+    job = replace_jobs[job_id]
+    job["status"] = "running"
+    db = SessionLocal()
+    try:
+        now = datetime.utcnow()
+        rows = (
+            {**row, "create_by": user_id, "created_at": now, "updated_at": now}
+            for row in parse_corpus_rows(content, filename, lang_code, lang_pair)
+        )
+        job["rows"] = master_row_word_service.replace_lang_pair(db, lang_pair, rows, lang_code=lang_code)
+        job["status"] = "completed"
+    except Exception as e:
+        print(f"Error in replace job {job_id}: {str(e)}")
+        job["status"] = "failed"
+        job["error"] = str(e)
+    finally:
+        job["finished_at"] = datetime.utcnow()
+        db.close()
+
+def run_snapshot_job(job_id: str, lang_pairs: Optional[List[str]]):
+    job = snapshot_jobs[job_id]
+    job["status"] = "running"
+    db = SessionLocal()
+    try:
+        corpus_snapshot.build(db, lang_pairs, progress=lambda code, rows: job["pairs"].__setitem__(code, rows))
+        job["status"] = "completed"
+    except Exception as e:
+        print(f"Error in snapshot job {job_id}: {str(e)}")
+        job["status"] = "failed"
+        job["error"] = str(e)
+    finally:
+        job["finished_at"] = datetime.utcnow()
+        db.close()
+
+def run_store_job(job_id: str):
+    job = store_jobs[job_id]
+    job["status"] = "running"
+    db = SessionLocal()
+    try:
+        job["manifest"] = corpus_store.build(db)
+        job["status"] = "completed"
+    except Exception as e:
+        print(f"Error in corpus store job {job_id}: {str(e)}")
+        job["status"] = "failed"
+        job["error"] = str(e)
+    finally:
+        job["finished_at"] = datetime.utcnow()
+        db.close()
@@ -1,9 +1,15 @@
 from fastapi import APIRouter, HTTPException, status
+from fastapi.concurrency import run_in_threadpool
 from pydantic import BaseModel
 from typing import List, Dict, Any, Optional
+import os
+import asyncio
 import spacy
 import logging
-from services.vietnamese_nlp_service import vietnamese_nlp_service
+from services.model_registry import model_registry, get_english_nlp, get_vietnamese_nlp_service, SPACY_EN_MODEL, VNCORENLP_MODEL, READY, FAILED
+from services.vncorenlp_pool import PoolSaturatedError, AnnotationTimeoutError
+from services.inference_executor import BoundedExecutor, ExecutorSaturatedError
+from services.latency_metrics import endpoint_latency
 from services.pos_ner_mapping import map_pos_tag, map_ner_label, get_all_pos_tags, get_all_ner_labels
 
 # Cấu hình logging
@@ -12,19 +18,105 @@ logger = logging.getLogger(__name__)
 
 router = APIRouter()
 
-# Khởi tạo spaCy model
-try:
-    nlp = spacy.load("en_core_web_sm")
-    logger.info("SpaCy model 'en_core_web_sm' loaded successfully")
-except OSError:
-    logger.warning("SpaCy model 'en_core_web_sm' not found. Please install it using: python -m spacy download en_core_web_sm")
-    nlp = None
+# Upper bound on texts accepted by one batch request
+MAX_BATCH_TEXTS = 1000
+
+# spaCy inference runs on its own bounded thread pool; requests beyond workers + queue get 503
+spacy_executor = BoundedExecutor(
+    max_workers=int(os.getenv("SPACY_WORKERS", str(min(4, os.cpu_count() or 1)))),
+    max_queue=int(os.getenv("SPACY_QUEUE_SIZE", "32")),
+    name="spacy",
+)
+
+# Pipeline components each English task does not need; skipping them saves most of the inference time
+UNUSED_COMPONENTS = {
+    "pos": ["parser", "lemmatizer", "ner"],
+    "lemmatize": ["parser", "ner"],
+    "ner": ["tagger", "parser", "attribute_ruler", "lemmatizer"],
+    "analyze": [],
+}
+
+def _english_nlp():
+    """Shared spaCy pipeline from the model registry; 503 if it could not be loaded"""
+    nlp = get_english_nlp()
+    if nlp is None:
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail="NLP model not available. Please ensure spaCy model is installed."
+        )
+    return nlp
+
+def _vietnamese_service():
+    """Shared VietnameseNLPService from the model registry; 503 if VnCoreNLP is unavailable"""
+    service = get_vietnamese_nlp_service()
+    if service is None:
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail="Vietnamese NLP service not available. Please ensure VnCoreNLP is properly installed."
+        )
+    return service
+
+async def _run_spacy(endpoint: str, func, *args):
+    """
+    Run spaCy inference on the bounded executor and record its latency (queue wait included) under `endpoint`.
+    A saturated executor answers 503 with Retry-After, like the VnCoreNLP pool; rejected requests are counted by the executor, not the histogram.
+    """
+    try:
+        future = spacy_executor.submit(func, *args)
+    except ExecutorSaturatedError as e:
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail=str(e),
+            headers={"Retry-After": "1"}
+        )
+    with endpoint_latency.time(endpoint):
+        return await asyncio.wrap_future(future)
+
+async def _run_vietnamese(endpoint: str, func, *args):
+    """
+    Run a blocking VietnameseNLPService call in the threadpool so annotation does not block the event loop,
+    recording its latency under `endpoint`. A full worker pool answers 503 and a worker timeout 504.
+    """
+    try:
+        with endpoint_latency.time(endpoint):
+            return await run_in_threadpool(func, *args)
+    except PoolSaturatedError as e:
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail=str(e),
+            headers={"Retry-After": "1"}
+        )
+    except AnnotationTimeoutError as e:
+        raise HTTPException(
+            status_code=status.HTTP_504_GATEWAY_TIMEOUT,
+            detail=str(e)
+        )
+
+def _disabled_components(nlp, task: str) -> List[str]:
+    return [name for name in UNUSED_COMPONENTS[task] if name in nlp.pipe_names]
+
+def _pipe(nlp, texts: List[str], task: str, batch_size: int, n_process: int):
+    """Run spaCy over many texts with nlp.pipe, skipping components the task does not need"""
+    n_process = max(1, min(n_process, os.cpu_count() or 1))
+    return nlp.pipe(
+        texts,
+        batch_size=max(1, batch_size),
+        n_process=n_process,
+        disable=_disabled_components(nlp, task),
+    )
 
 # Pydantic models
 class TextRequest(BaseModel):
     text: str
     language: str = "en"  # Default to English
 
+class BatchTextRequest(BaseModel):
+    texts: List[str]
+    batch_size: int = 32
+
+class SpacyBatchRequest(BatchTextRequest):
+    n_process: int = 1
+
 class TokenInfo(BaseModel):
     text: str
     pos: str
@@ -71,6 +163,10 @@ class VietnameseNLPResponse(BaseModel):
     token_count: int
     sentence_count: int
 
+class VietnameseBatchNLPResponse(BaseModel):
+    results: List[VietnameseNLPResponse]
+    count: int
+
 class DependencyInfo(BaseModel):
     text: str
     pos: str
@@ -85,21 +181,29 @@ class NLPResponse(BaseModel):
     token_count: int
     sentence_count: int
 
+class NLPBatchResponse(BaseModel):
+    results: List[NLPResponse]
+    count: int
+
+class POSBatchResponse(BaseModel):
+    results: List[List[Dict[str, Optional[str]]]]
+    count: int
+
+class NERBatchResponse(BaseModel):
+    results: List[List[EntityInfo]]
+    count: int
+
 @router.post("/tokenize", response_model=List[str])
 async def tokenize_text(request: TextRequest):
     """
     Tokenize text into individual tokens/words
     """
-    if not nlp:
-        raise HTTPException(
-            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
-            detail="NLP model not available. Please ensure spaCy model is installed."
-        )
+    nlp = await run_in_threadpool(_english_nlp)
     
     try:
-        doc = nlp(request.text)
-        tokens = [token.text for token in doc]
-        return tokens
+        return await _run_spacy("tokenize", _tokenize, nlp, request.text)
+    except HTTPException:
+        raise
     except Exception as e:
         logger.error(f"Error in tokenization: {str(e)}")
         raise HTTPException(
@@ -112,26 +216,12 @@ async def pos_tagging(request: TextRequest):
     """
     Perform Part-of-Speech tagging on text
     """
-    if not nlp:
-        raise HTTPException(
-            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
-            detail="NLP model not available. Please ensure spaCy model is installed."
-        )
+    nlp = await run_in_threadpool(_english_nlp)
     
     try:
-        doc = nlp(request.text)
-        pos_tags = []
-        
-        for token in doc:
-            pos_tags.append({
-                "text": token.text,
-                "pos": token.pos_,
-                "pos_explanation": spacy.explain(token.pos_),
-                "tag": token.tag_,
-                "tag_explanation": spacy.explain(token.tag_)
-            })
-        
-        return pos_tags
+        return await _run_spacy("pos-tagging", _pos_tag_text, nlp, request.text)
+    except HTTPException:
+        raise
     except Exception as e:
         logger.error(f"Error in POS tagging: {str(e)}")
         raise HTTPException(
@@ -144,26 +234,12 @@ async def lemmatize_text(request: TextRequest):
     """
     Perform lemmatization on text tokens
     """
-    if not nlp:
-        raise HTTPException(
-            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
-            detail="NLP model not available. Please ensure spaCy model is installed."
-        )
+    nlp = await run_in_threadpool(_english_nlp)
     
     try:
-        doc = nlp(request.text)
-        lemmas = []
-        
-        for token in doc:
-            lemmas.append({
-                "text": token.text,
-                "lemma": token.lemma_,
-                "pos": token.pos_,
-                "is_alpha": token.is_alpha,
-                "is_stop": token.is_stop
-            })
-        
-        return lemmas
+        return await _run_spacy("lemmatize", _lemmatize_text, nlp, request.text)
+    except HTTPException:
+        raise
     except Exception as e:
         logger.error(f"Error in lemmatization: {str(e)}")
         raise HTTPException(
@@ -176,26 +252,12 @@ async def named_entity_recognition(request: TextRequest):
     """
     Perform Named Entity Recognition on text
     """
-    if not nlp:
-        raise HTTPException(
-            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
-            detail="NLP model not available. Please ensure spaCy model is installed."
-        )
+    nlp = await run_in_threadpool(_english_nlp)
     
     try:
-        doc = nlp(request.text)
-        entities = []
-        
-        for ent in doc.ents:
-            entities.append(EntityInfo(
-                text=ent.text,
-                label=ent.label_,
-                label_explanation=spacy.explain(ent.label_),
-                start=ent.start_char,
-                end=ent.end_char
-            ))
-        
-        return entities
+        return await _run_spacy("ner", _ner_text, nlp, request.text)
+    except HTTPException:
+        raise
     except Exception as e:
         logger.error(f"Error in NER: {str(e)}")
         raise HTTPException(
@@ -208,74 +270,211 @@ async def full_text_analysis(request: TextRequest):
     """
     Perform complete text analysis including tokenization, POS tagging, lemmatization, and NER
     """
-    if not nlp:
-        raise HTTPException(
-            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
-            detail="NLP model not available. Please ensure spaCy model is installed."
-        )
+    nlp = await run_in_threadpool(_english_nlp)
     
     try:
-        doc = nlp(request.text)
+        return await _run_spacy("analyze", _analyze_text, nlp, request.text)
         
-        # Process sentences
-        sentences = []
-        for sent in doc.sents:
-            tokens = []
-            for token in sent:
-                # Map POS tag to specific value
-                specific_pos, pos_explanation = map_pos_tag(token.pos_, "en")
-                tokens.append(TokenInfo(
-                    text=token.text,
-                    pos=specific_pos,
-                    pos_explanation=pos_explanation,
-                    lemma=token.lemma_,
-                    dep=token.dep_,
-                    head=token.head.text
-                ))
-            
-            sentences.append(SentenceInfo(
-                text=sent.text,
-                tokens=tokens
+    except HTTPException:
+        raise
+    except Exception as e:
+        logger.error(f"Error in full text analysis: {str(e)}")
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"Error during text analysis: {str(e)}"
+        )
+
+# Inference functions run on spacy_executor; each takes the pipeline and returns plain response data
+
+def _tokenize(nlp, text: str) -> List[str]:
+    # Tokenization needs none of the statistical components
+    return [token.text for token in nlp.make_doc(text)]
+
+def _pos_tag_text(nlp, text: str) -> List[Dict[str, str]]:
+    return _doc_to_pos_tags(nlp(text, disable=_disabled_components(nlp, "pos")))
+
+def _lemmatize_text(nlp, text: str) -> List[Dict[str, Any]]:
+    doc = nlp(text, disable=_disabled_components(nlp, "lemmatize"))
+    lemmas = []
+    
+    for token in doc:
+        lemmas.append({
+            "text": token.text,
+            "lemma": token.lemma_,
+            "pos": token.pos_,
+            "is_alpha": token.is_alpha,
+            "is_stop": token.is_stop
+        })
+    
+    return lemmas
+
+def _ner_text(nlp, text: str) -> List[EntityInfo]:
+    return _doc_to_entities(nlp(text, disable=_disabled_components(nlp, "ner")))
+
+def _analyze_text(nlp, text: str) -> NLPResponse:
+    return _doc_to_analysis(text, nlp(text))
+
+def _pos_tag_batch(nlp, request: SpacyBatchRequest) -> List[List[Dict[str, Optional[str]]]]:
+    docs = _pipe(nlp, request.texts, "pos", request.batch_size, request.n_process)
+    return [_doc_to_pos_tags(doc) for doc in docs]
+
+def _ner_batch(nlp, request: SpacyBatchRequest) -> List[List[EntityInfo]]:
+    docs = _pipe(nlp, request.texts, "ner", request.batch_size, request.n_process)
+    return [_doc_to_entities(doc) for doc in docs]
+
+def _analyze_batch(nlp, request: SpacyBatchRequest) -> List[NLPResponse]:
+    docs = _pipe(nlp, request.texts, "analyze", request.batch_size, request.n_process)
+    return [_doc_to_analysis(text, doc) for text, doc in zip(request.texts, docs)]
+
+def _doc_to_pos_tags(doc) -> List[Dict[str, str]]:
+    pos_tags = []
+    
+    for token in doc:
+        pos_tags.append({
+            "text": token.text,
+            "pos": token.pos_,
+            "pos_explanation": spacy.explain(token.pos_),
+            "tag": token.tag_,
+            "tag_explanation": spacy.explain(token.tag_)
+        })
+    
+    return pos_tags
+
+def _doc_to_entities(doc) -> List[EntityInfo]:
+    entities = []
+    
+    for ent in doc.ents:
+        entities.append(EntityInfo(
+            text=ent.text,
+            label=ent.label_,
+            label_explanation=spacy.explain(ent.label_),
+            start=ent.start_char,
+            end=ent.end_char
+        ))
+    
+    return entities
+
+def _doc_to_analysis(text: str, doc) -> NLPResponse:
+    # Process sentences
+    sentences = []
+    for sent in doc.sents:
+        tokens = []
+        for token in sent:
+            # Map POS tag to specific value
+            specific_pos, pos_explanation = map_pos_tag(token.pos_, "en")
+            tokens.append(TokenInfo(
+                text=token.text,
+                pos=specific_pos,
+                pos_explanation=pos_explanation,
+                lemma=token.lemma_,
+                dep=token.dep_,
+                head=token.head.text
             ))
         
-        # Process entities
-        entities = []
-        for ent in doc.ents:
-            # Map NER label to specific value
-            specific_ner, ner_explanation = map_ner_label(ent.label_, "en")
-            
-            entities.append(EntityInfo(
-                text=ent.text,
-                label=specific_ner,
-                label_explanation=ner_explanation,
-                start=ent.start_char,
-                end=ent.end_char
-            ))
+        sentences.append(SentenceInfo(
+            text=sent.text,
+            tokens=tokens
+        ))
+    
+    # Process entities
+    entities = []
+    for ent in doc.ents:
+        # Map NER label to specific value
+        specific_ner, ner_explanation = map_ner_label(ent.label_, "en")
         
-        return NLPResponse(
-            original_text=request.text,
-            sentences=sentences,
-            entities=entities,
-            token_count=len(doc),
-            sentence_count=len(list(doc.sents))
+        entities.append(EntityInfo(
+            text=ent.text,
+            label=specific_ner,
+            label_explanation=ner_explanation,
+            start=ent.start_char,
+            end=ent.end_char
+        ))
+    
+    return NLPResponse(
+        original_text=text,
+        sentences=sentences,
+        entities=entities,
+        token_count=len(doc),
+        sentence_count=len(sentences)
+    )
+
+async def _check_batch(request: BatchTextRequest):
+    if len(request.texts) > MAX_BATCH_TEXTS:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"At most {MAX_BATCH_TEXTS} texts per request"
         )
-        
+    return await run_in_threadpool(_english_nlp)
+
+@router.post("/pos-tagging-batch", response_model=POSBatchResponse)
+async def pos_tagging_batch(request: SpacyBatchRequest):
+    """
+    Perform Part-of-Speech tagging on many texts with nlp.pipe (parser, lemmatizer and NER disabled)
+    """
+    nlp = await _check_batch(request)
+    
+    try:
+        results = await _run_spacy("pos-tagging-batch", _pos_tag_batch, nlp, request)
+        return POSBatchResponse(results=results, count=len(results))
+    except HTTPException:
+        raise
     except Exception as e:
-        logger.error(f"Error in full text analysis: {str(e)}")
+        logger.error(f"Error in batch POS tagging: {str(e)}")
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-            detail=f"Error during text analysis: {str(e)}"
+            detail=f"Error during batch POS tagging: {str(e)}"
+        )
+
+@router.post("/ner-batch", response_model=NERBatchResponse)
+async def named_entity_recognition_batch(request: SpacyBatchRequest):
+    """
+    Perform Named Entity Recognition on many texts with nlp.pipe (tagger, parser and lemmatizer disabled)
+    """
+    nlp = await _check_batch(request)
+    
+    try:
+        results = await _run_spacy("ner-batch", _ner_batch, nlp, request)
+        return NERBatchResponse(results=results, count=len(results))
+    except HTTPException:
+        raise
+    except Exception as e:
+        logger.error(f"Error in batch NER: {str(e)}")
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"Error during batch NER: {str(e)}"
+        )
+
+@router.post("/analyze-batch", response_model=NLPBatchResponse)
+async def full_text_analysis_batch(request: SpacyBatchRequest):
+    """
+    Perform complete text analysis on many texts with nlp.pipe
+    """
+    nlp = await _check_batch(request)
+    
+    try:
+        results = await _run_spacy("analyze-batch", _analyze_batch, nlp, request)
+        return NLPBatchResponse(results=results, count=len(results))
+    except HTTPException:
+        raise
+    except Exception as e:
+        logger.error(f"Error in batch text analysis: {str(e)}")
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"Error during batch text analysis: {str(e)}"
         )
 
 @router.get("/health")
 async def health_check():
     """
-    Check if NLP service is available
+    Check if NLP service is available. Does not load the model; a model that is
+    not loaded yet is loaded on first use or by the startup warm-up.
     """
-    if nlp:
+    model_status = model_registry.state(SPACY_EN_MODEL)
+    if model_status != FAILED:
         return {
             "status": "healthy",
-            "model": "en_core_web_sm",
+            "model": SPACY_EN_MODEL,
+            "model_status": model_status,
             "message": "NLP service is running"
         }
     else:
@@ -284,6 +483,23 @@ async def health_check():
             detail="NLP model not available"
         )
 
+@router.get("/models")
+async def get_models_status():
+    """
+    Readiness of the shared NLP models (not_loaded, loading, ready, failed), their load time and the process peak RSS
+    """
+    return model_registry.status()
+
+@router.get("/metrics")
+async def get_metrics():
+    """
+    Per-endpoint inference latency histograms (milliseconds) and spaCy executor load
+    """
+    return {
+        "spacy_executor": spacy_executor.stats(),
+        "endpoints": endpoint_latency.snapshot()
+    }
+
 # Vietnamese NLP Endpoints
 
 @router.post("/vietnamese/word-segmentation", response_model=List[str])
@@ -291,15 +507,13 @@ async def vietnamese_word_segmentation(request: TextRequest):
     """
     Perform word segmentation on Vietnamese text using VnCoreNLP
     """
-    if not vietnamese_nlp_service.is_available():
-        raise HTTPException(
-            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
-            detail="Vietnamese NLP service not available. Please ensure VnCoreNLP is properly installed."
-        )
+    service = await run_in_threadpool(_vietnamese_service)
     
     try:
-        words = vietnamese_nlp_service.word_segmentation(request.text)
+        words = await _run_vietnamese("vietnamese/word-segmentation", service.word_segmentation, request.text)
         return words
+    except HTTPException:
+        raise
     except Exception as e:
         logger.error(f"Error in Vietnamese word segmentation: {str(e)}")
         raise HTTPException(
@@ -312,15 +526,13 @@ async def vietnamese_pos_tagging(request: TextRequest):
     """
     Perform Part-of-Speech tagging on Vietnamese text using VnCoreNLP
     """
-    if not vietnamese_nlp_service.is_available():
-        raise HTTPException(
-            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
-            detail="Vietnamese NLP service not available. Please ensure VnCoreNLP is properly installed."
-        )
+    service = await run_in_threadpool(_vietnamese_service)
     
     try:
-        pos_tags = vietnamese_nlp_service.pos_tagging(request.text)
+        pos_tags = await _run_vietnamese("vietnamese/pos-tagging", service.pos_tagging, request.text)
         return pos_tags
+    except HTTPException:
+        raise
     except Exception as e:
         logger.error(f"Error in Vietnamese POS tagging: {str(e)}")
         raise HTTPException(
@@ -333,15 +545,13 @@ async def vietnamese_named_entity_recognition(request: TextRequest):
     """
     Perform Named Entity Recognition on Vietnamese text using VnCoreNLP
     """
-    if not vietnamese_nlp_service.is_available():
-        raise HTTPException(
-            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
-            detail="Vietnamese NLP service not available. Please ensure VnCoreNLP is properly installed."
-        )
+    service = await run_in_threadpool(_vietnamese_service)
     
     try:
-        entities = vietnamese_nlp_service.named_entity_recognition(request.text)
+        entities = await _run_vietnamese("vietnamese/ner", service.named_entity_recognition, request.text)
         return [VietnameseEntityInfo(**entity) for entity in entities]
+    except HTTPException:
+        raise
     except Exception as e:
         logger.error(f"Error in Vietnamese NER: {str(e)}")
         raise HTTPException(
@@ -354,15 +564,13 @@ async def vietnamese_dependency_parsing(request: TextRequest):
     """
     Perform dependency parsing on Vietnamese text using VnCoreNLP
     """
-    if not vietnamese_nlp_service.is_available():
-        raise HTTPException(
-            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
-            detail="Vietnamese NLP service not available. Please ensure VnCoreNLP is properly installed."
-        )
+    service = await run_in_threadpool(_vietnamese_service)
     
     try:
-        dependencies = vietnamese_nlp_service.dependency_parsing(request.text)
+        dependencies = await _run_vietnamese("vietnamese/dependency-parsing", service.dependency_parsing, request.text)
         return [[DependencyInfo(**dep) for dep in sentence_deps] for sentence_deps in dependencies]
+    except HTTPException:
+        raise
     except Exception as e:
         logger.error(f"Error in Vietnamese dependency parsing: {str(e)}")
         raise HTTPException(
@@ -375,34 +583,14 @@ async def vietnamese_full_analysis(request: TextRequest):
     """
     Perform complete Vietnamese text analysis including word segmentation, POS tagging, NER, and dependency parsing
     """
-    if not vietnamese_nlp_service.is_available():
-        raise HTTPException(
-            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
-            detail="Vietnamese NLP service not available. Please ensure VnCoreNLP is properly installed."
-        )
+    service = await run_in_threadpool(_vietnamese_service)
     
     try:
-        analysis_result = vietnamese_nlp_service.full_analysis(request.text)
-        
-        # Convert to Pydantic models
-        sentences = []
-        for sent in analysis_result["sentences"]:
-            tokens = [VietnameseTokenInfo(**token) for token in sent["tokens"]]
-            sentences.append(VietnameseSentenceInfo(
-                text=sent["text"],
-                tokens=tokens
-            ))
-        
-        entities = [VietnameseEntityInfo(**entity) for entity in analysis_result["entities"]]
-        
-        return VietnameseNLPResponse(
-            original_text=analysis_result["original_text"],
-            sentences=sentences,
-            entities=entities,
-            token_count=analysis_result["token_count"],
-            sentence_count=analysis_result["sentence_count"]
-        )
+        analysis_result = await _run_vietnamese("vietnamese/analyze", service.full_analysis, request.text)
+        return _to_vietnamese_response(analysis_result)
         
+    except HTTPException:
+        raise
     except Exception as e:
         logger.error(f"Error in Vietnamese full analysis: {str(e)}")
         raise HTTPException(
@@ -410,6 +598,60 @@ async def vietnamese_full_analysis(request: TextRequest):
             detail=f"Error during Vietnamese text analysis: {str(e)}"
         )
 
+@router.post("/vietnamese/analyze-batch", response_model=VietnameseBatchNLPResponse)
+async def vietnamese_full_analysis_batch(request: BatchTextRequest):
+    """
+    Perform complete Vietnamese analysis on many texts, annotating `batch_size` texts per VnCoreNLP call.
+    Results are returned in the same order as the input texts.
+    """
+    service = await run_in_threadpool(_vietnamese_service)
+    if len(request.texts) > MAX_BATCH_TEXTS:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"At most {MAX_BATCH_TEXTS} texts per request"
+        )
+    
+    try:
+        analysis_results = await _run_vietnamese("vietnamese/analyze-batch", service.full_analysis_batch, request.texts, request.batch_size)
+        results = [_to_vietnamese_response(result) for result in analysis_results]
+        return VietnameseBatchNLPResponse(results=results, count=len(results))
+    except HTTPException:
+        raise
+    except Exception as e:
+        logger.error(f"Error in Vietnamese batch analysis: {str(e)}")
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"Error during Vietnamese batch analysis: {str(e)}"
+        )
+
+def _to_vietnamese_response(analysis_result: Dict[str, Any]) -> VietnameseNLPResponse:
+    """Convert a VietnameseNLPService analysis dict to the response model"""
+    sentences = []
+    for sent in analysis_result["sentences"]:
+        tokens = [VietnameseTokenInfo(**token) for token in sent["tokens"]]
+        sentences.append(VietnameseSentenceInfo(
+            text=sent["text"],
+            tokens=tokens
+        ))
+    
+    entities = [VietnameseEntityInfo(**entity) for entity in analysis_result["entities"]]
+    
+    return VietnameseNLPResponse(
+        original_text=analysis_result["original_text"],
+        sentences=sentences,
+        entities=entities,
+        token_count=analysis_result["token_count"],
+        sentence_count=analysis_result["sentence_count"]
+    )
+
+def _language_status(model_name: str) -> str:
+    model_status = model_registry.state(model_name)
+    if model_status == READY:
+        return "available"
+    if model_status == FAILED:
+        return "not_installed"
+    return model_status
+
 @router.get("/supported-languages")
 async def get_supported_languages():
     """
@@ -421,13 +663,13 @@ async def get_supported_languages():
                 "code": "en",
                 "name": "English",
                 "model": "en_core_web_sm",
-                "status": "available" if nlp else "not_installed"
+                "status": _language_status(SPACY_EN_MODEL)
             },
             {
                 "code": "vi",
                 "name": "Vietnamese",
                 "model": "VnCoreNLP",
-                "status": "available" if vietnamese_nlp_service.is_available() else "not_installed"
+                "status": _language_status(VNCORENLP_MODEL)
             }
         ],
         "note": "To add more languages, install additional spaCy models using: python -m spacy download [model_name]"
@@ -1,4 +1,5 @@
 from fastapi import APIRouter, Depends, HTTPException, status
+from sqlalchemy import distinct
 from sqlalchemy.orm import Session
 from pydantic import BaseModel
 from typing import List, Optional, Dict, Any
@@ -10,22 +11,19 @@ from auth import get_current_user
 from models.user import User, UserRole
 from models.row_word import RowWord
 from models.master_row_word import MasterRowWord
-from services.vietnamese_nlp_service import vietnamese_nlp_service
 from services.pos_ner_mapping import map_pos_tag, map_ner_label
-import spacy
+from services.master_row_word_service import MasterRowWordService
 
 router = APIRouter(prefix="/sentence-pairs", tags=["sentence-pairs"])
 
+master_row_word_service = MasterRowWordService(MasterRowWord)
+
+MAX_SAVE_BATCH_SIZE = 5000
+
 # In-memory storage for sentence pairs (in production, use database)
 sentence_pairs_storage: Dict[str, Dict[str, Any]] = {}
 pending_approvals: Dict[str, Dict[str, Any]] = {}
 
-# Initialize spaCy model
-try:
-    nlp = spacy.load("en_core_web_sm")
-except OSError:
-    nlp = None
-
 # Pydantic models
 class CreateSentencePairRequest(BaseModel):
     vietnameseText: str
@@ -50,6 +48,13 @@ class SaveSentencePairRequest(BaseModel):
     englishAnalysis: List[WordAnalysis]
     langPair: str
 
+class SaveSentencePairBatchRequest(BaseModel):
+    pairs: List[SaveSentencePairRequest]
+
+class BatchApproveRequest(BaseModel):
+    sentenceIds: List[str]
+    batchSize: int = 500
+
 class SentencePairResponse(BaseModel):
     id: str
     sentenceId: str
@@ -93,39 +98,13 @@ async def create_sentence_pair(
     return SentencePairResponse(**sentence_pair)
 
 
-@router.post("/save")
-async def save_sentence_pair(
-    request: SaveSentencePairRequest,
-    current_user: Optional[User] = Depends(get_current_user),
-    db: Session = Depends(get_db)
-):
-    """Save sentence pair with analysis results to row_words table"""
-    if current_user is None:
-        raise HTTPException(status_code=401, detail="Not authenticated")
-    
-    try:
-        # Save Vietnamese words to row_words
-        for i, word_analysis in enumerate(request.vietnameseAnalysis):
-            row_word = RowWord(
-                id=f"{request.sentenceId}_vi_{i:03d}",
-                id_sen=request.sentenceId,
-                word=word_analysis.word,
-                lemma=word_analysis.lemma,
-                links=word_analysis.links,
-                morph=word_analysis.morph,
-                pos=word_analysis.pos,
-                phrase=word_analysis.phrase,
-                grm=word_analysis.grm,
-                ner=word_analysis.ner,
-                semantic=word_analysis.semantic,
-                lang_code=word_analysis.langCode
-            )
-            db.add(row_word)
-        
-        # Save English words to row_words
-        for i, word_analysis in enumerate(request.englishAnalysis):
-            row_word = RowWord(
-                id=f"{request.sentenceId}_en_{i:03d}",
+def _row_word_mappings(request: SaveSentencePairRequest) -> List[Dict[str, Any]]:
+    """Build row_words insert mappings for both sides of an analysed pair."""
+    mappings: List[Dict[str, Any]] = []
+    for lang, analysis in (("vi", request.vietnameseAnalysis), ("en", request.englishAnalysis)):
+        for i, word_analysis in enumerate(analysis):
+            mappings.append(dict(
+                id=f"{request.sentenceId}_{lang}_{i:03d}",
                 id_sen=request.sentenceId,
                 word=word_analysis.word,
                 lemma=word_analysis.lemma,
@@ -137,22 +116,46 @@ async def save_sentence_pair(
                 ner=word_analysis.ner,
                 semantic=word_analysis.semantic,
                 lang_code=word_analysis.langCode
-            )
-            db.add(row_word)
-        
+            ))
+    return mappings
+
+def _validate_pair(request: SaveSentencePairRequest) -> Optional[str]:
+    """Return an error message for a malformed pair, or None if it can be saved."""
+    if not request.sentenceId.strip():
+        return "sentenceId is required"
+    if not request.vietnameseAnalysis and not request.englishAnalysis:
+        return "Analysis is empty"
+    for analysis in (request.vietnameseAnalysis, request.englishAnalysis):
+        for i, word_analysis in enumerate(analysis):
+            if not word_analysis.word.strip():
+                return f"Empty word at {word_analysis.langCode} position {i}"
+    return None
+
+def _mark_pending(sentence_id: str) -> None:
+    """Move the stored draft pair (if any) to the pending approval queue."""
+    for pid, pair in sentence_pairs_storage.items():
+        if pair["sentenceId"] == sentence_id:
+            pair["status"] = "pending"
+            pair["updatedAt"] = datetime.now().isoformat()
+            pending_approvals[sentence_id] = pair
+            break
+
+@router.post("/save")
+async def save_sentence_pair(
+    request: SaveSentencePairRequest,
+    current_user: Optional[User] = Depends(get_current_user),
+    db: Session = Depends(get_db)
+):
+    """Save sentence pair with analysis results to row_words table"""
+    if current_user is None:
+        raise HTTPException(status_code=401, detail="Not authenticated")
+    
+    try:
+        db.bulk_insert_mappings(RowWord, _row_word_mappings(request))
         db.commit()
         
         # Move to pending approval
-        pair_id = None
-        for pid, pair in sentence_pairs_storage.items():
-            if pair["sentenceId"] == request.sentenceId:
-                pair_id = pid
-                break
-        
-        if pair_id:
-            sentence_pairs_storage[pair_id]["status"] = "pending"
-            sentence_pairs_storage[pair_id]["updatedAt"] = datetime.now().isoformat()
-            pending_approvals[request.sentenceId] = sentence_pairs_storage[pair_id]
+        _mark_pending(request.sentenceId)
         
         return {"message": "Sentence pair saved successfully"}
     
@@ -160,6 +163,87 @@ async def save_sentence_pair(
         db.rollback()
         raise HTTPException(status_code=500, detail=f"Failed to save sentence pair: {str(e)}")
 
+@router.post("/save-batch")
+async def save_sentence_pairs_batch(
+    request: SaveSentencePairBatchRequest,
+    current_user: Optional[User] = Depends(get_current_user),
+    db: Session = Depends(get_db)
+):
+    """Save many analysed sentence pairs to row_words in one bulk insert.
+
+    Pairs are validated first; invalid ones are reported and skipped. If the bulk
+    insert itself fails, each remaining pair is retried in its own savepoint so the
+    response can say exactly which pairs were rejected by the database.
+    """
+    if current_user is None:
+        raise HTTPException(status_code=401, detail="Not authenticated")
+    if len(request.pairs) > MAX_SAVE_BATCH_SIZE:
+        raise HTTPException(status_code=400, detail=f"At most {MAX_SAVE_BATCH_SIZE} pairs per request")
+
+    results: Dict[int, Dict[str, Any]] = {}
+    seen: set = set()
+    for idx, pair in enumerate(request.pairs):
+        error = _validate_pair(pair)
+        if error is None and pair.sentenceId in seen:
+            error = "Duplicate sentenceId in batch"
+        seen.add(pair.sentenceId)
+        if error is not None:
+            results[idx] = {"sentenceId": pair.sentenceId, "status": "error", "error": error}
+
+    candidates = [idx for idx in range(len(request.pairs)) if idx not in results]
+    if candidates:
+        existing = {
+            r[0] for r in db.query(distinct(RowWord.id_sen))
+            .filter(RowWord.id_sen.in_([request.pairs[idx].sentenceId for idx in candidates]))
+            .all()
+        }
+        for idx in candidates:
+            if request.pairs[idx].sentenceId in existing:
+                results[idx] = {"sentenceId": request.pairs[idx].sentenceId, "status": "error", "error": "Sentence already saved"}
+        candidates = [idx for idx in candidates if idx not in results]
+
+    saved: List[int] = []
+    if candidates:
+        try:
+            db.bulk_insert_mappings(
+                RowWord,
+                [m for idx in candidates for m in _row_word_mappings(request.pairs[idx])]
+            )
+            db.commit()
+            saved = candidates
+        except Exception:
+            db.rollback()
+            for idx in candidates:
+                try:
+                    with db.begin_nested():
+                        db.bulk_insert_mappings(RowWord, _row_word_mappings(request.pairs[idx]))
+                    saved.append(idx)
+                except Exception as e:
+                    results[idx] = {"sentenceId": request.pairs[idx].sentenceId, "status": "error", "error": str(e)}
+            db.commit()
+
+    for idx in saved:
+        _mark_pending(request.pairs[idx].sentenceId)
+        results[idx] = {"sentenceId": request.pairs[idx].sentenceId, "status": "saved", "error": None}
+
+    return {
+        "message": f"Saved {len(saved)} of {len(request.pairs)} sentence pairs",
+        "saved": len(saved),
+        "failed": len(request.pairs) - len(saved),
+        "results": [results[idx] for idx in range(len(request.pairs))],
+    }
+
+def _mark_reviewed(sentence_id: str, status: str, reviewer_id: int) -> None:
+    """Record an admin decision on a pending pair in both in-memory stores."""
+    pending_approvals[sentence_id]["status"] = status
+    pending_approvals[sentence_id]["approvalBy"] = reviewer_id
+    pending_approvals[sentence_id]["updatedAt"] = datetime.now().isoformat()
+
+    for pid, pair in sentence_pairs_storage.items():
+        if pair["sentenceId"] == sentence_id:
+            sentence_pairs_storage[pid] = pending_approvals[sentence_id]
+            break
+
 @router.get("/", response_model=Dict[str, Any])
 async def get_sentence_pairs(
     page: int = 1,
@@ -287,6 +371,62 @@ async def delete_sentence_pair(
     
     return {"message": "Sentence pair deleted successfully"}
 
+@router.post("/approve-batch")
+async def approve_sentence_pairs_batch(
+    request: BatchApproveRequest,
+    current_user: Optional[User] = Depends(get_current_user),
+    db: Session = Depends(get_db)
+):
+    """Approve many pending sentence pairs at once (admin only).
+
+    Tokens are copied from row_words to master_row_words with one INSERT ... SELECT
+    per batch of sentences; all batches share a single transaction, so either every
+    requested pair is approved or none is.
+    """
+    if current_user is None:
+        raise HTTPException(status_code=401, detail="Not authenticated")
+    if current_user.role != UserRole.ADMIN:
+        raise HTTPException(status_code=403, detail="Admin access required")
+
+    batch_size = max(1, min(request.batchSize, 5000))
+    approved: List[str] = []
+    skipped: List[str] = []
+    # Group by the values that are constant inside one INSERT ... SELECT
+    groups: Dict[tuple, List[str]] = {}
+    for sentence_id in dict.fromkeys(request.sentenceIds):
+        pair = pending_approvals.get(sentence_id)
+        if pair is None or pair["status"] != "pending":
+            skipped.append(sentence_id)
+            continue
+        groups.setdefault((pair["langPair"], pair["createdBy"]), []).append(sentence_id)
+        approved.append(sentence_id)
+
+    inserted_rows = 0
+    try:
+        for (lang_pair, created_by), sentence_ids in groups.items():
+            for i in range(0, len(sentence_ids), batch_size):
+                inserted_rows += master_row_word_service.insert_from_row_words(
+                    db,
+                    sentence_ids[i:i + batch_size],
+                    lang_pair=lang_pair,
+                    create_by=created_by,
+                    approval_by=current_user.id,
+                )
+        db.commit()
+    except Exception as e:
+        db.rollback()
+        raise HTTPException(status_code=500, detail=f"Failed to approve sentence pairs: {str(e)}")
+
+    for sentence_id in approved:
+        _mark_reviewed(sentence_id, "approved", current_user.id)
+
+    return {
+        "message": f"Approved {len(approved)} sentence pairs",
+        "approved": approved,
+        "skipped": skipped,
+        "insertedRows": inserted_rows,
+    }
+
 @router.post("/{pair_id}/approve")
 async def approve_sentence_pair(
     pair_id: str,
@@ -305,52 +445,20 @@ async def approve_sentence_pair(
     sentence_id = pair_id
     
     try:
-        # Move from row_words to master_row_words
-        row_words = db.query(RowWord).filter(RowWord.id_sen == sentence_id).all()
-        
-        # First, create master_row_words
-        for row_word in row_words:
-            master_row_word = MasterRowWord(
-                id_string=row_word.id,
-                row_word_id=row_word.id,
-                id_sen=row_word.id_sen,
-                word=row_word.word,
-                lemma=row_word.lemma,
-                links=row_word.links,
-                morph=row_word.morph,
-                pos=row_word.pos,
-                phrase=row_word.phrase,
-                grm=row_word.grm,
-                ner=row_word.ner,
-                semantic=row_word.semantic,
-                lang_code=row_word.lang_code,
-                lang_pair=pending_approvals[sentence_id]["langPair"],
-                create_by=pending_approvals[sentence_id]["createdBy"],
-                approval_by=current_user.id,
-                created_at=datetime.now(),
-                updated_at=datetime.now()
-            )
-            db.add(master_row_word)
-        
-        # Commit master_row_words first
+        # Copy row_words into master_row_words in a single INSERT ... SELECT
+        master_row_word_service.insert_from_row_words(
+            db,
+            [sentence_id],
+            lang_pair=pending_approvals[sentence_id]["langPair"],
+            create_by=pending_approvals[sentence_id]["createdBy"],
+            approval_by=current_user.id,
+        )
         db.commit()
         
         # Note: We don't delete from row_words to avoid foreign key constraint issues
         # The master_row_words table references row_words, so we keep both
         
-        # Update status
-        pending_approvals[sentence_id]["status"] = "approved"
-        pending_approvals[sentence_id]["approvalBy"] = current_user.id
-        pending_approvals[sentence_id]["updatedAt"] = datetime.now().isoformat()
-        
-        # Update in main storage
-        for pid, pair in sentence_pairs_storage.items():
-            if pair["sentenceId"] == sentence_id:
-                sentence_pairs_storage[pid] = pending_approvals[sentence_id]
-                break
-        
-        # Final commit for status update and row_words deletion
-        db.commit()
+        _mark_reviewed(sentence_id, "approved", current_user.id)
         
         return {"message": "Sentence pair approved successfully"}
     
@@ -378,20 +486,10 @@ async def reject_sentence_pair(
     try:
         # Remove from row_words
         db.query(RowWord).filter(RowWord.id_sen == sentence_id).delete()
-        
-        # Update status
-        pending_approvals[sentence_id]["status"] = "rejected"
-        pending_approvals[sentence_id]["approvalBy"] = current_user.id
-        pending_approvals[sentence_id]["updatedAt"] = datetime.now().isoformat()
-        
-        # Update in main storage
-        for pid, pair in sentence_pairs_storage.items():
-            if pair["sentenceId"] == sentence_id:
-                sentence_pairs_storage[pid] = pending_approvals[sentence_id]
-                break
-        
         db.commit()
         
+        _mark_reviewed(sentence_id, "rejected", current_user.id)
+        
         return {"message": "Sentence pair rejected successfully"}
     
     except Exception as e:
@@ -0,0 +1,224 @@
+"""
+Server-side pre-annotation of raw parallel text into master_row_words.
+
+Two plain-text files are read line by line; line N of one file is the
+translation of line N of the other. Each batch of sentence pairs is segmented
+and tagged (VnCoreNLP for Vietnamese, spaCy for English), turned into
+MasterRowWord-shaped rows and handed straight to the bulk loader, so the whole
+corpus is never held in memory.
+
+Generated ids follow the imported corpus format: `id_sen` is a 6 digit sentence
+number shared by both sides of a pair and `id_string` is `id_sen` plus the 2 digit
+1-based token position. Links are left as "-" (not aligned yet).
+"""
+
+import time
+from dataclasses import dataclass, field
+from datetime import datetime
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Tuple
+
+from sqlalchemy import func
+from sqlalchemy.orm import Session
+
+from models.master_row_word import MasterRowWord
+from .master_row_word_service import BOM, MasterRowWordService
+from .pos_ner_mapping import map_ner_label, map_pos_tag
+from .tag_dictionary import tag_dictionary
+
+SUPPORTED_LANGUAGES = ("vi", "en")
+
+# id_string keeps 2 digits for the token position
+MAX_TOKENS_PER_SENTENCE = 99
+
+STAGES = ("read", "annotate_vi", "annotate_en", "build_rows", "load")
+
+
+@dataclass
+class StageStats:
+    items: int = 0
+    seconds: float = 0.0
+
+    def as_dict(self) -> Dict[str, Any]:
+        return {
+            "items": self.items,
+            "seconds": round(self.seconds, 3),
+            "items_per_second": round(self.items / self.seconds, 1) if self.seconds else None,
+        }
+
+
+@dataclass
+class PipelineStats:
+    pairs: int = 0
+    skipped_pairs: int = 0
+    rows: int = 0
+    stages: Dict[str, StageStats] = field(default_factory=lambda: {name: StageStats() for name in STAGES})
+
+    def record(self, stage: str, items: int, started: float) -> None:
+        self.stages[stage].items += items
+        self.stages[stage].seconds += time.perf_counter() - started
+
+    def as_dict(self) -> Dict[str, Any]:
+        return {
+            "pairs": self.pairs,
+            "skipped_pairs": self.skipped_pairs,
+            "rows": self.rows,
+            "stages": {name: stats.as_dict() for name, stats in self.stages.items()},
+        }
+
+
+# A token as the pipeline needs it: (word, lemma, morph, pos, grm, ner)
+Token = Tuple[str, str, str, str, str, str]
+
+
+class CorpusAnnotationPipeline:
+    def __init__(
+        self,
+        vietnamese_service=None,
+        english_nlp=None,
+        *,
+        batch_size: int = 64,
+        load_chunk_size: int = 1000,
+    ):
+        """
+        Args:
+            vietnamese_service: VietnameseNLPService, required when one side is Vietnamese
+            english_nlp: spaCy pipeline, required when one side is English
+            batch_size: Sentence pairs annotated together
+            load_chunk_size: Rows per bulk insert
+        """
+        self.vietnamese_service = vietnamese_service
+        self.english_nlp = english_nlp
+        self.batch_size = max(1, batch_size)
+        self.load_chunk_size = load_chunk_size
+        self.master_row_word_service = MasterRowWordService(MasterRowWord)
+
+    def run(
+        self,
+        db: Session,
+        source_lines: Iterable[str],
+        target_lines: Iterable[str],
+        *,
+        source_lang: str,
+        target_lang: str,
+        lang_pair: str,
+        create_by: Optional[int] = None,
+        stats: Optional[PipelineStats] = None,
+    ) -> PipelineStats:
+        """Annotate and load every line pair; `stats` is updated in place as batches complete"""
+        stats = stats if stats is not None else PipelineStats()
+        # Create a new pair (and its partition) before this session reads master_row_words
+        tag_dictionary.lang_pair_id(db, lang_pair)
+        next_id_sen = self._last_id_sen(db, lang_pair) + 1
+
+        for batch in self._read_batches(source_lines, target_lines, stats):
+            source_tokens = self._annotate(source_lang, [s for s, _ in batch], stats)
+            target_tokens = self._annotate(target_lang, [t for _, t in batch], stats)
+
+            started = time.perf_counter()
+            rows: List[Dict[str, Any]] = []
+            now = datetime.utcnow()
+            for src, tgt in zip(source_tokens, target_tokens):
+                if not src or not tgt or max(len(src), len(tgt)) > MAX_TOKENS_PER_SENTENCE:
+                    stats.skipped_pairs += 1
+                    continue
+                id_sen = f"{next_id_sen:06d}"
+                next_id_sen += 1
+                rows.extend(self._rows(src, id_sen, source_lang, lang_pair, create_by, now))
+                rows.extend(self._rows(tgt, id_sen, target_lang, lang_pair, create_by, now))
+            stats.record("build_rows", len(rows), started)
+
+            started = time.perf_counter()
+            stats.rows += self.master_row_word_service.bulk_create(db, rows, chunk_size=self.load_chunk_size)
+            stats.record("load", len(rows), started)
+        return stats
+
+    def _read_batches(
+        self, source_lines: Iterable[str], target_lines: Iterable[str], stats: PipelineStats
+    ) -> Iterator[List[Tuple[str, str]]]:
+        batch: List[Tuple[str, str]] = []
+        started = time.perf_counter()
+        for source, target in zip(source_lines, target_lines):
+            source, target = source.replace(BOM, "").strip(), target.replace(BOM, "").strip()
+            if not source or not target:
+                stats.skipped_pairs += 1
+                continue
+            batch.append((source, target))
+            if len(batch) >= self.batch_size:
+                stats.pairs += len(batch)
+                stats.record("read", len(batch), started)
+                yield batch
+                batch = []
+                started = time.perf_counter()
+        if batch:
+            stats.pairs += len(batch)
+            stats.record("read", len(batch), started)
+            yield batch
+
+    def _annotate(self, lang: str, texts: List[str], stats: PipelineStats) -> List[List[Token]]:
+        started = time.perf_counter()
+        if lang == "vi":
+            tokens = self._annotate_vietnamese(texts)
+        else:
+            tokens = self._annotate_english(texts)
+        stats.record(f"annotate_{lang}", len(texts), started)
+        return tokens
+
+    def _annotate_vietnamese(self, texts: List[str]) -> List[List[Token]]:
+        results = []
+        for sentences in self.vietnamese_service.annotate_batch(texts, self.batch_size):
+            tokens = []
+            for sentence in sentences:
+                for word in sentence:
+                    pos, _ = map_pos_tag(word["posTag"], "vi")
+                    ner_tag = word.get("nerLabel") or "O"
+                    ner = ner_tag[2:] if ner_tag[:2] in ("B-", "I-") else ner_tag
+                    tokens.append((word["wordForm"], word["wordForm"], "-", pos, word.get("depLabel") or "-", ner))
+            results.append(tokens)
+        return results
+
+    def _annotate_english(self, texts: List[str]) -> List[List[Token]]:
+        results = []
+        for doc in self.english_nlp.pipe(texts, batch_size=self.batch_size):
+            tokens = []
+            for token in doc:
+                if token.is_space:
+                    continue
+                # Same EN tag set as /nlp/pos (universal tag -> EN tag), not the raw Penn tag_
+                pos = map_pos_tag(token.pos_, "en")[0] if token.pos_ else "-"
+                ner = map_ner_label(token.ent_type_, "en")[0] if token.ent_type_ else "O"
+                tokens.append((token.text, token.lemma_ or token.text, str(token.morph) or "-", pos, token.dep_ or "-", ner))
+            results.append(tokens)
+        return results
+
+    @staticmethod
+    def _rows(
+        tokens: List[Token], id_sen: str, lang_code: str, lang_pair: str, create_by: Optional[int], now: datetime
+    ) -> Iterator[Dict[str, Any]]:
+        for position, (word, lemma, morph, pos, grm, ner) in enumerate(tokens, start=1):
+            yield dict(
+                id_string=f"{id_sen}{position:02d}",
+                id_sen=id_sen,
+                word=word,
+                lemma=lemma,
+                links="-",
+                morph=morph,
+                pos=pos,
+                phrase="-",
+                grm=grm,
+                ner=ner,
+                semantic="",
+                lang_code=lang_code,
+                lang_pair=lang_pair,
+                create_by=create_by,
+                created_at=now,
+                updated_at=now,
+            )
+
+    @staticmethod
+    def _last_id_sen(db: Session, lang_pair: str) -> int:
+        """Highest numeric id_sen already stored for the language pair (0 if none)"""
+        last = db.query(func.max(MasterRowWord.id_sen)).filter(
+            tag_dictionary.lang_pair_filter(db, [lang_pair]),
+            func.length(MasterRowWord.id_sen) == 6,
+        ).scalar()
+        return int(last) if last and last.isdigit() else 0
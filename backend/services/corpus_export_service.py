@@ -0,0 +1,151 @@
+"""
+Streaming export of master_row_words.
+
+Rows of a language pair are read through a server-side cursor and encoded one
+batch at a time, so an export of any size runs in constant memory. Formats:
+
+- tsv: the 10-column corpus file format read by /master/import (id, word, lemma,
+  links, morph, pos, phrase, grm, ner, semantic), so an export can be imported back.
+- csv / jsonl: every text column of the row, with a header / one object per line.
+- parquet: same columns, one row group per batch (pyarrow, see requirements.txt).
+
+tsv, csv and jsonl can be gzip-compressed on the fly; parquet is compressed
+internally (snappy, or gzip when asked).
+"""
+import csv
+import io
+import json
+import zlib
+from typing import Any, Dict, Iterator, List, Optional, Sequence, Tuple
+
+from sqlalchemy.orm import Session
+
+from models.master_row_word import MasterRowWord
+from .tag_dictionary import tag_dictionary
+
+EXPORT_FORMATS = ("tsv", "csv", "jsonl", "parquet")
+
+# Columns after the id in the corpus file format (see routers.master_api.parse_corpus_rows)
+TSV_COLUMNS = ("word", "lemma", "links", "morph", "pos", "phrase", "grm", "ner", "semantic")
+EXPORT_COLUMNS = ("id_string", "id_sen", *TSV_COLUMNS, "lang_code", "lang_pair")
+
+MEDIA_TYPES = {
+    "tsv": "text/tab-separated-values; charset=utf-8",
+    "csv": "text/csv; charset=utf-8",
+    "jsonl": "application/x-ndjson",
+    "parquet": "application/vnd.apache.parquet",
+}
+
+BATCH_SIZE = 5000
+
+def parquet_available() -> bool:
+    try:
+        import pyarrow  # noqa: F401
+    except ImportError:
+        return False
+    return True
+
+def file_id(id_string: str, lang_code: Optional[str]) -> str:
+    """
+    Full token id of the corpus file: a 2-letter prefix and the 8-digit id_string.
+    The import only keeps the digits, so the prefix is rebuilt from the language
+    (language initial + "D", as in VD01821301 / ED01821301).
+    """
+    return f"{(lang_code or 'x')[:1].upper()}D{id_string}"
+
+def export_filename(lang_pair: str, lang_code: Optional[str], fmt: str, gzip: bool) -> str:
+    name = "_".join(part for part in ("corpus", lang_pair, lang_code) if part)
+    return f"{name}.{fmt}" + (".gz" if gzip and fmt != "parquet" else "")
+
+class CorpusExportService:
+    def __init__(self, batch_size: int = BATCH_SIZE):
+        self.batch_size = batch_size
+
+    def iter_batches(self, db: Session, lang_pair: str, lang_code: Optional[str] = None) -> Iterator[List[Tuple[Any, ...]]]:
+        """Rows of EXPORT_COLUMNS in file order (by id), `batch_size` at a time from a server-side cursor"""
+        stmt = tag_dictionary.select_values(EXPORT_COLUMNS).where(tag_dictionary.lang_pair_filter(db, [lang_pair]))
+        if lang_code:
+            stmt = stmt.where(MasterRowWord.lang_code == lang_code)
+        stmt = stmt.order_by(MasterRowWord.id).execution_options(yield_per=self.batch_size)
+        for partition in db.execute(stmt).partitions():
+            yield [tuple(row) for row in partition]
+
+    def stream(self, db: Session, fmt: str, lang_pair: str, *, lang_code: Optional[str] = None,
+               gzip: bool = False) -> Iterator[bytes]:
+        """Encoded export, one chunk per batch of rows"""
+        if fmt not in EXPORT_FORMATS:
+            raise ValueError(f"format must be one of {EXPORT_FORMATS}")
+        batches = self.iter_batches(db, lang_pair, lang_code)
+        if fmt == "parquet":
+            yield from _parquet_chunks(batches, compression="gzip" if gzip else "snappy")
+            return
+        encode = {"tsv": _tsv_chunk, "csv": _csv_chunk, "jsonl": _jsonl_chunk}[fmt]
+        chunks = _with_header(fmt, (encode(batch) for batch in batches))
+        yield from (_gzip_chunks(chunks) if gzip else chunks)
+
+def _text(value: Any) -> str:
+    return "" if value is None else str(value)
+
+def _tsv_chunk(batch: Sequence[Tuple[Any, ...]]) -> bytes:
+    lines = []
+    for row in batch:
+        record = dict(zip(EXPORT_COLUMNS, row))
+        fields = [file_id(record["id_string"], record["lang_code"])]
+        fields += [_text(record[c]).replace("\t", " ").replace("\n", " ") for c in TSV_COLUMNS]
+        lines.append("\t".join(fields) + "\n")
+    return "".join(lines).encode("utf-8")
+
+def _csv_chunk(batch: Sequence[Tuple[Any, ...]]) -> bytes:
+    buffer = io.StringIO()
+    csv.writer(buffer).writerows([[_text(v) for v in row] for row in batch])
+    return buffer.getvalue().encode("utf-8")
+
+def _jsonl_chunk(batch: Sequence[Tuple[Any, ...]]) -> bytes:
+    return "".join(
+        json.dumps(dict(zip(EXPORT_COLUMNS, row)), ensure_ascii=False) + "\n" for row in batch
+    ).encode("utf-8")
+
+def _with_header(fmt: str, chunks: Iterator[bytes]) -> Iterator[bytes]:
+    if fmt == "csv":
+        buffer = io.StringIO()
+        csv.writer(buffer).writerow(EXPORT_COLUMNS)
+        yield buffer.getvalue().encode("utf-8")
+    yield from chunks
+
+def _gzip_chunks(chunks: Iterator[bytes]) -> Iterator[bytes]:
+    compressor = zlib.compressobj(wbits=31)  # gzip container
+    for chunk in chunks:
+        data = compressor.compress(chunk)
+        if data:
+            yield data
+    yield compressor.flush()
+
+def _parquet_chunks(batches: Iterator[List[Tuple[Any, ...]]], compression: str) -> Iterator[bytes]:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+
+    schema = pa.schema([(c, pa.string()) for c in EXPORT_COLUMNS])
+    sink = io.BytesIO()
+    writer = pq.ParquetWriter(sink, schema, compression=compression)
+
+    def drain() -> bytes:
+        data = sink.getvalue()
+        sink.seek(0)
+        sink.truncate()
+        return data
+
+    try:
+        for batch in batches:
+            columns: Dict[str, list] = {c: [] for c in EXPORT_COLUMNS}
+            for row in batch:
+                for c, value in zip(EXPORT_COLUMNS, row):
+                    columns[c].append(value)
+            writer.write_table(pa.table(columns, schema=schema))
+            data = drain()
+            if data:
+                yield data
+    finally:
+        writer.close()
+    yield drain()
+
+corpus_export_service = CorpusExportService()
@@ -0,0 +1,173 @@
+"""
+Columnar Parquet snapshot of master_row_words for analytics.
+
+A snapshot job writes every language pair to its own Parquet file
+(`<dir>/lang_pair_id=<id>/data.parquet`, hive-style partitions) with the tag
+and language columns dictionary-encoded. Word statistics and tag facets can then
+be computed from the snapshot with pyarrow compute instead of aggregating the
+OLTP table in Postgres.
+
+The snapshot is a copy as of its build time (see `manifest()["created_at"]`);
+writes made afterwards show up after the next build. Each pair's file is
+written to a temporary name and renamed into place, so readers never see a
+half-written file. Needs pyarrow (see requirements.txt).
+"""
+import json
+import os
+import shutil
+from datetime import datetime
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple
+
+from sqlalchemy import select
+from sqlalchemy.orm import Session
+
+from models.lang_pair import LangPair
+from .corpus_export_service import EXPORT_COLUMNS, corpus_export_service, parquet_available
+from .tag_dictionary import TAG_TYPES
+
+SNAPSHOT_DIR = os.getenv("CORPUS_SNAPSHOT_DIR", "corpus_snapshot")
+
+# Few distinct values each: stored and read back as dictionary arrays
+DICTIONARY_COLUMNS = ("lang_code", "lang_pair", *TAG_TYPES)
+
+PARTITION_FIELD = "lang_pair_id"
+DATA_FILE = "data.parquet"
+# Names starting with "." or "_" are ignored by pyarrow datasets
+TMP_FILE = ".data.parquet.tmp"
+MANIFEST_FILE = "_manifest.json"
+
+class SnapshotNotFound(Exception):
+    pass
+
+def _schema():
+    import pyarrow as pa
+
+    return pa.schema([
+        (c, pa.dictionary(pa.int32(), pa.string()) if c in DICTIONARY_COLUMNS else pa.string())
+        for c in EXPORT_COLUMNS
+    ])
+
+class CorpusSnapshot:
+    def __init__(self, directory: str = SNAPSHOT_DIR):
+        self.directory = directory
+
+    # ---------- Build -------------------------------------------------------
+    def build(
+        self,
+        db: Session,
+        lang_pairs: Optional[Sequence[str]] = None,
+        *,
+        progress: Optional[Callable[[str, int], None]] = None,
+    ) -> Dict[str, Any]:
+        """Write the given language pairs (all when None) and return the new manifest.
+
+        Building every pair also removes the files of pairs that no longer exist.
+        `progress(lang_pair, rows)` is called after each pair.
+        """
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+
+        query = select(LangPair.code, LangPair.id).order_by(LangPair.id)
+        if lang_pairs is not None:
+            query = query.where(LangPair.code.in_(list(lang_pairs)))
+        pairs = db.execute(query).all()
+
+        schema = _schema()
+        manifest = self.manifest() or {"pairs": {}}
+        if lang_pairs is None:
+            self._remove_partitions_except({lang_pair_id for _, lang_pair_id in pairs})
+            manifest["pairs"] = {}
+
+        for code, lang_pair_id in pairs:
+            directory = os.path.join(self.directory, f"{PARTITION_FIELD}={lang_pair_id}")
+            os.makedirs(directory, exist_ok=True)
+            tmp_path = os.path.join(directory, TMP_FILE)
+            rows = 0
+            with pq.ParquetWriter(tmp_path, schema, use_dictionary=list(DICTIONARY_COLUMNS)) as writer:
+                for batch in corpus_export_service.iter_batches(db, code):
+                    columns = list(zip(*batch))
+                    writer.write_table(pa.table(
+                        [pa.array(values, type=field.type) for values, field in zip(columns, schema)],
+                        schema=schema,
+                    ))
+                    rows += len(batch)
+            os.replace(tmp_path, os.path.join(directory, DATA_FILE))
+            manifest["pairs"][code] = {"lang_pair_id": lang_pair_id, "rows": rows}
+            if progress:
+                progress(code, rows)
+
+        manifest["created_at"] = datetime.utcnow().isoformat()
+        manifest["rows"] = sum(p["rows"] for p in manifest["pairs"].values())
+        self._write_manifest(manifest)
+        return manifest
+
+    def _remove_partitions_except(self, lang_pair_ids: set) -> None:
+        if not os.path.isdir(self.directory):
+            return
+        for name in os.listdir(self.directory):
+            key, _, value = name.partition("=")
+            if key == PARTITION_FIELD and value.isdigit() and int(value) not in lang_pair_ids:
+                shutil.rmtree(os.path.join(self.directory, name))
+
+    def _write_manifest(self, manifest: Dict[str, Any]) -> None:
+        os.makedirs(self.directory, exist_ok=True)
+        tmp_path = os.path.join(self.directory, f".{MANIFEST_FILE}.tmp")
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(manifest, f, ensure_ascii=False, indent=2)
+        os.replace(tmp_path, os.path.join(self.directory, MANIFEST_FILE))
+
+    def manifest(self) -> Optional[Dict[str, Any]]:
+        try:
+            with open(os.path.join(self.directory, MANIFEST_FILE), encoding="utf-8") as f:
+                return json.load(f)
+        except FileNotFoundError:
+            return None
+
+    def available(self) -> bool:
+        return parquet_available() and self.manifest() is not None
+
+    # ---------- Analytics ---------------------------------------------------
+    def _table(self, columns: List[str], lang_code: str = ""):
+        import pyarrow.compute as pc
+        import pyarrow.dataset as ds
+
+        if not self.available():
+            raise SnapshotNotFound(f"No corpus snapshot in {self.directory}")
+        dataset = ds.dataset(self.directory, format="parquet", partitioning="hive")
+        condition = pc.field("lang_code") == lang_code if lang_code else None
+        return dataset.to_table(columns=columns, filter=condition)
+
+    def word_frequencies(self, lang_code: str = "", tag_type: str = "", tag_value: str = "") -> Tuple[int, List[Tuple[str, int]]]:
+        """(N, [(word, count), ...]) like the Postgres statistics queries.
+
+        N counts every token under the filters; words that are NULL or blank are
+        not listed. Sorted by count descending, then word. The tag filter is
+        case-insensitive and ignored for an unknown tag_type.
+        """
+        import pyarrow.compute as pc
+
+        tag_column = tag_type if tag_type in TAG_TYPES and tag_value else None
+        table = self._table(["word"] + ([tag_column] if tag_column else []), lang_code)
+        if tag_column:
+            tags = pc.cast(table[tag_column], "string")
+            table = table.filter(pc.fill_null(pc.equal(pc.utf8_lower(tags), tag_value.lower()), False))
+        total = table.num_rows
+
+        words = table["word"]
+        table = table.filter(pc.fill_null(pc.not_equal(pc.utf8_trim_whitespace(words), ""), False))
+        counts = (
+            table.group_by("word").aggregate([("word", "count")])
+            .sort_by([("word_count", "descending"), ("word", "ascending")])
+        )
+        return total, list(zip(counts["word"].to_pylist(), counts["word_count"].to_pylist()))
+
+    def distinct_values(self, column: str, lang_code: str = "") -> List[str]:
+        """Sorted non-blank values of a tag column (the /pos, /ner, /semantic facets)"""
+        import pyarrow.compute as pc
+
+        if column not in TAG_TYPES:
+            raise ValueError(f"column must be one of {TAG_TYPES}")
+        values = pc.unique(pc.cast(self._table([column], lang_code)[column], "string")).to_pylist()
+        return sorted(v for v in values if v is not None and v.strip() != "")
+
+corpus_snapshot = CorpusSnapshot()
@@ -0,0 +1,334 @@
+"""
+Read-only, memory-mapped copy of master_row_words for serving.
+
+For read-mostly deployments the sentence and concordance lookups (/align-sentence,
+/dicid) can be answered from NumPy arrays instead of Postgres. A build job writes:
+
+- a string table: every distinct string of the stored columns, sorted, as one
+  UTF-8 blob plus offsets; strings are referred to by their index, and the
+  sorted order makes string -> id a binary search;
+- per-token columns: string ids (word, lemma, pos, links, id_string, id_sen, ...),
+  the database id, position and links_array (offsets into one flat array);
+- a sorted permutation per searchable column, to find a word's tokens by
+  binary search.
+
+Tokens are ordered by (lang_pair, lang_code, id_sen, position, id), so a
+sentence or a whole language is a contiguous slice. Every file is opened with mmap, so the
+pages are shared by all uvicorn workers through the page cache.
+
+The store is a copy as of its build (see `manifest()["created_at"]`). A build
+goes to a new directory and is published by rewriting the CURRENT pointer;
+workers notice the new pointer on their next lookup and switch to it. The
+previous build is deleted by the build after, not when it is replaced.
+"""
+import bisect
+import json
+import os
+import shutil
+import threading
+from array import array
+from datetime import datetime
+from typing import Any, Dict, Iterable, List, NamedTuple, Optional, Sequence, Tuple
+
+import numpy as np
+from sqlalchemy.orm import Session
+
+from .tag_dictionary import tag_dictionary
+
+STORE_DIR = os.getenv("CORPUS_STORE_DIR", "corpus_store")
+
+CURRENT_FILE = "CURRENT"
+MANIFEST_FILE = "manifest.json"
+
+# Columns kept as string ids
+STRING_COLUMNS = (
+    "id_string", "id_sen", "word", "lemma", "links", "pos", "ner",
+    "word_norm", "word_toneless", "morph_lower", "lang_code", "lang_pair",
+)
+# Columns with a sorted permutation for lookups by value
+INDEXED_COLUMNS = ("id_string", "word", "word_norm", "word_toneless", "morph_lower")
+
+BUILD_BATCH_SIZE = 10000
+
+# Stored for a NULL position
+NO_POSITION = -1
+
+class StoreNotFound(Exception):
+    pass
+
+class StoredToken(NamedTuple):
+    """The MasterRowWord attributes read by the serving endpoints"""
+    id: int
+    id_string: str
+    id_sen: str
+    word: str
+    lemma: str
+    links: str
+    pos: str
+    ner: str
+    lang_code: str
+    lang_pair: str
+    position: Optional[int]
+    links_array: Tuple[int, ...]
+
+def _position_key(position: np.ndarray) -> np.ndarray:
+    """Sort key of positions with NULLs last (as Postgres ASC)"""
+    return np.where(position == NO_POSITION, np.iinfo(np.int16).max, position)
+
+class StringTable:
+    """Sorted strings in a UTF-8 blob; supports len(), [i] and binary search"""
+
+    def __init__(self, blob: np.ndarray, offsets: np.ndarray):
+        self.blob = blob
+        self.offsets = offsets
+
+    def __len__(self) -> int:
+        return len(self.offsets) - 1
+
+    def __getitem__(self, i: int) -> str:
+        return self.blob[self.offsets[i]:self.offsets[i + 1]].tobytes().decode("utf-8")
+
+    def id(self, value: str) -> Optional[int]:
+        i = bisect.bisect_left(self, value)
+        return i if i < len(self) and self[i] == value else None
+
+    def ids(self, values: Iterable[str]) -> List[int]:
+        """Ids of the values present in the table"""
+        return [i for i in map(self.id, values) if i is not None]
+
+class CorpusStore:
+    def __init__(self, directory: str = STORE_DIR):
+        self.directory = directory
+        self._lock = threading.Lock()
+        self._build: Optional[str] = None
+        self._strings: Optional[StringTable] = None
+        self._columns: Dict[str, np.ndarray] = {}
+
+    # ---------- Build -------------------------------------------------------
+    def build(self, db: Session, *, batch_size: int = BUILD_BATCH_SIZE) -> Dict[str, Any]:
+        """Write a new store from master_row_words, publish it and return its manifest"""
+        interned: Dict[str, int] = {}
+        columns = {c: array("i") for c in STRING_COLUMNS}
+        row_ids = array("q")
+        positions = array("h")
+        link_counts = array("i")
+        link_values = array("h")
+
+        def intern(value: Optional[str]) -> int:
+            value = value or ""
+            return interned.setdefault(value, len(interned))
+
+        stmt = tag_dictionary.select_values(
+            ["id", *(c for c in STRING_COLUMNS if c != "morph_lower"), "morph", "position", "links_array"]
+        ).execution_options(yield_per=batch_size)
+        for row in db.execute(stmt):
+            values = row._mapping
+            row_ids.append(values["id"])
+            positions.append(NO_POSITION if values["position"] is None else values["position"])
+            link_counts.append(len(values["links_array"] or ()))
+            link_values.extend(values["links_array"] or ())
+            for c in STRING_COLUMNS:
+                columns[c].append(intern((values["morph"] or "").lower() if c == "morph_lower" else values[c]))
+
+        # Final ids follow the sorted order of the strings
+        strings = sorted(interned)
+        remap = np.empty(len(strings), dtype=np.int32)
+        remap[np.fromiter((interned[s] for s in strings), dtype=np.int32, count=len(strings))] = np.arange(len(strings), dtype=np.int32)
+        del interned
+        data = {c: remap[np.frombuffer(columns.pop(c), dtype=np.int32)] for c in STRING_COLUMNS}
+        data["row_id"] = np.frombuffer(row_ids, dtype=np.int64)
+        data["position"] = np.frombuffer(positions, dtype=np.int16)
+
+        order = np.lexsort((data["row_id"], _position_key(data["position"]), data["id_sen"], data["lang_code"], data["lang_pair"]))
+        data = {c: values[order] for c, values in data.items()}
+
+        build = "build-" + datetime.utcnow().strftime("%Y%m%dT%H%M%S%f")
+        path = os.path.join(self.directory, build)
+        os.makedirs(path)
+        encoded = [s.encode("utf-8") for s in strings]
+        offsets = np.zeros(len(encoded) + 1, dtype=np.int64)
+        np.cumsum([len(b) for b in encoded], out=offsets[1:])
+        with open(os.path.join(path, "strings.bin"), "wb") as f:
+            f.write(b"".join(encoded))
+        np.save(os.path.join(path, "string_offsets.npy"), offsets)
+
+        # links_array of each token, gathered in token order
+        counts = np.frombuffer(link_counts, dtype=np.int32).astype(np.int64)
+        starts = np.concatenate(([0], np.cumsum(counts)[:-1])).astype(np.int64)
+        link_offsets = np.zeros(len(order) + 1, dtype=np.int64)
+        np.cumsum(counts[order], out=link_offsets[1:])
+        source = (np.repeat(starts[order], counts[order])
+                  + np.arange(link_offsets[-1]) - np.repeat(link_offsets[:-1], counts[order]))
+        flat_links = np.frombuffer(link_values, dtype=np.int16)[source]
+
+        for c, values in data.items():
+            np.save(os.path.join(path, f"{c}.npy"), values)
+        np.save(os.path.join(path, "link_offsets.npy"), link_offsets)
+        np.save(os.path.join(path, "links_array.npy"), flat_links)
+        for c in INDEXED_COLUMNS:
+            permutation = np.argsort(data[c], kind="stable").astype(np.int32)
+            np.save(os.path.join(path, f"index_{c}.npy"), permutation)
+            np.save(os.path.join(path, f"index_{c}_keys.npy"), data[c][permutation])
+
+        manifest = {"created_at": datetime.utcnow().isoformat(), "tokens": int(len(order)), "strings": len(strings)}
+        with open(os.path.join(path, MANIFEST_FILE), "w", encoding="utf-8") as f:
+            json.dump(manifest, f)
+        self._publish(build)
+        return manifest
+
+    def _publish(self, build: str) -> None:
+        previous = self._current_build()
+        tmp_path = os.path.join(self.directory, f".{CURRENT_FILE}.tmp")
+        with open(tmp_path, "w") as f:
+            f.write(build)
+        os.replace(tmp_path, os.path.join(self.directory, CURRENT_FILE))
+        # The previous build stays until the next publish: lookups that mapped it
+        # before the switch may still be reading its files
+        for name in os.listdir(self.directory):
+            if name.startswith("build-") and name not in (build, previous):
+                shutil.rmtree(os.path.join(self.directory, name), ignore_errors=True)
+
+    # ---------- Load --------------------------------------------------------
+    def _current_build(self) -> Optional[str]:
+        try:
+            with open(os.path.join(self.directory, CURRENT_FILE)) as f:
+                return f.read().strip() or None
+        except FileNotFoundError:
+            return None
+
+    def _load(self) -> None:
+        """Map the current build, if it changed since the last lookup"""
+        build = self._current_build()
+        if build is None:
+            raise StoreNotFound(f"No corpus store in {self.directory}")
+        if build == self._build:
+            return
+        with self._lock:
+            if build == self._build:
+                return
+            path = os.path.join(self.directory, build)
+            names = [*STRING_COLUMNS, "row_id", "position", "link_offsets", "links_array"]
+            names += [f"index_{c}" for c in INDEXED_COLUMNS] + [f"index_{c}_keys" for c in INDEXED_COLUMNS]
+            columns = {name: np.load(os.path.join(path, f"{name}.npy"), mmap_mode="r") for name in names}
+            offsets = np.load(os.path.join(path, "string_offsets.npy"), mmap_mode="r")
+            blob = (np.memmap(os.path.join(path, "strings.bin"), dtype=np.uint8, mode="r")
+                    if offsets[-1] else np.zeros(0, dtype=np.uint8))
+            self._strings = StringTable(blob, offsets)
+            self._columns = columns
+            self._build = build
+
+    def available(self) -> bool:
+        return self._current_build() is not None
+
+    def manifest(self) -> Optional[Dict[str, Any]]:
+        build = self._current_build()
+        if build is None:
+            return None
+        with open(os.path.join(self.directory, build, MANIFEST_FILE), encoding="utf-8") as f:
+            return {"build": build, **json.load(f)}
+
+    # ---------- Lookups -----------------------------------------------------
+    def _range(self, lang_pair: int, lang_code: int, start: int = 0, end: Optional[int] = None) -> Tuple[int, int]:
+        """Token slice of one language of one pair (tokens are sorted by these columns)"""
+        c = self._columns
+        end = len(c["row_id"]) if end is None else end
+        lo = start + int(np.searchsorted(c["lang_pair"][start:end], lang_pair, "left"))
+        hi = start + int(np.searchsorted(c["lang_pair"][start:end], lang_pair, "right"))
+        return (lo + int(np.searchsorted(c["lang_code"][lo:hi], lang_code, "left")),
+                lo + int(np.searchsorted(c["lang_code"][lo:hi], lang_code, "right")))
+
+    def _sorted_by_sentence(self, indices: np.ndarray, *, by_language: bool = False) -> np.ndarray:
+        """Ordered by (id_sen, [lang_code,] position, id), as the Postgres queries"""
+        c = self._columns
+        keys = [c["row_id"][indices], _position_key(c["position"][indices])]
+        if by_language:
+            keys.append(c["lang_code"][indices])
+        keys.append(c["id_sen"][indices])
+        return indices[np.lexsort(keys)]
+
+    def _tokens(self, indices: Iterable[int]) -> List[StoredToken]:
+        c, s = self._columns, self._strings
+        tokens = []
+        for i in indices:
+            links = c["links_array"][c["link_offsets"][i]:c["link_offsets"][i + 1]]
+            tokens.append(StoredToken(
+                id=int(c["row_id"][i]),
+                id_string=s[c["id_string"][i]],
+                id_sen=s[c["id_sen"][i]],
+                word=s[c["word"][i]],
+                lemma=s[c["lemma"][i]],
+                links=s[c["links"][i]],
+                pos=s[c["pos"][i]],
+                ner=s[c["ner"][i]],
+                lang_code=s[c["lang_code"][i]],
+                lang_pair=s[c["lang_pair"][i]],
+                position=None if c["position"][i] == NO_POSITION else int(c["position"][i]),
+                links_array=tuple(int(x) for x in links),
+            ))
+        return tokens
+
+    def search(
+        self,
+        lang_code: str,
+        lang_pairs: Sequence[str],
+        conditions: Sequence[Tuple[str, Sequence[str]]] = (),
+        *,
+        offset: int = 0,
+        limit: Optional[int] = None,
+    ) -> Tuple[int, List[StoredToken]]:
+        """(total, page) of the tokens of `lang_code` in `lang_pairs` matching every
+        (column, values) condition, ordered by (id_sen, position, id)."""
+        self._load()
+        c, s = self._columns, self._strings
+        lang_code_id = s.id(lang_code)
+        pair_ids = s.ids(lang_pairs)
+        if lang_code_id is None or not pair_ids:
+            return 0, []
+
+        if conditions:
+            column, values = conditions[0]
+            keys = c[f"index_{column}_keys"]
+            found = []
+            for value_id in s.ids(values):
+                lo, hi = np.searchsorted(keys, value_id, "left"), np.searchsorted(keys, value_id, "right")
+                found.append(np.asarray(c[f"index_{column}"][lo:hi]))
+            indices = np.concatenate(found) if found else np.zeros(0, dtype=np.int32)
+            indices = indices[np.isin(c["lang_pair"][indices], pair_ids) & (c["lang_code"][indices] == lang_code_id)]
+            for column, values in conditions[1:]:
+                indices = indices[np.isin(c[column][indices], s.ids(values))]
+            indices = self._sorted_by_sentence(indices)
+        else:
+            ranges = [self._range(pair_id, lang_code_id) for pair_id in pair_ids]
+            ranges = [(lo, hi) for lo, hi in ranges if hi > lo]
+            if len(ranges) == 1:
+                indices = np.arange(*ranges[0])
+            else:
+                indices = self._sorted_by_sentence(np.concatenate([np.arange(lo, hi) for lo, hi in ranges] or [np.zeros(0, dtype=np.int64)]))
+
+        end = None if limit is None else offset + limit
+        return len(indices), self._tokens(indices[offset:end])
+
+    def sentence_tokens(self, lang_pairs: Sequence[str], lang_codes: Sequence[str], id_sens: Sequence[str]) -> List[StoredToken]:
+        """Tokens of the given sentences in the given languages and pairs, ordered by (id_sen, lang_code, position)"""
+        self._load()
+        c, s = self._columns, self._strings
+        sentence_ids = s.ids(set(id_sens))
+        found = []
+        for pair_id in s.ids(lang_pairs):
+            for lang_code_id in s.ids(lang_codes):
+                lo, hi = self._range(pair_id, lang_code_id)
+                id_sen = c["id_sen"][lo:hi]
+                for sentence_id in sentence_ids:
+                    start = lo + int(np.searchsorted(id_sen, sentence_id, "left"))
+                    end = lo + int(np.searchsorted(id_sen, sentence_id, "right"))
+                    found.append(np.arange(start, end))
+        if not found:
+            return []
+        return self._tokens(self._sorted_by_sentence(np.concatenate(found), by_language=True))
+
+    def find(self, id_string: str, lang_code: str, lang_pairs: Sequence[str]) -> Optional[StoredToken]:
+        """One token of `lang_code` in `lang_pairs` by id_string"""
+        tokens = self.search(lang_code, lang_pairs, [("id_string", [id_string])], limit=1)[1]
+        return tokens[0] if tokens else None
+
+corpus_store = CorpusStore()
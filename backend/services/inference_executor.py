@@ -0,0 +1,59 @@
+"""
+Bounded executor for CPU-bound model inference.
+
+Inference runs on a fixed number of worker threads so it never blocks the event
+loop. At most `max_workers + max_queue` calls are accepted at once; further calls
+are rejected straight away instead of piling up behind long documents.
+"""
+
+import functools
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Any, Callable, Dict
+
+
+class ExecutorSaturatedError(RuntimeError):
+    """Every worker is busy and the queue is full"""
+
+
+class BoundedExecutor:
+    def __init__(self, max_workers: int, max_queue: int, name: str = "inference"):
+        self.max_workers = max(1, max_workers)
+        self.max_queue = max(0, max_queue)
+        self.name = name
+        self._executor = ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix=name)
+        self._slots = threading.BoundedSemaphore(self.max_workers + self.max_queue)
+        self._lock = threading.Lock()
+        self._in_flight = 0
+        self.rejected = 0
+
+    def submit(self, func: Callable[..., Any], *args: Any, **kwargs: Any) -> Future:
+        """Queue `func` on a worker thread, or raise ExecutorSaturatedError if no slot is free"""
+        if not self._slots.acquire(blocking=False):
+            self.rejected += 1
+            raise ExecutorSaturatedError(
+                f"{self.name}: all {self.max_workers} workers are busy and {self.max_queue} calls are queued"
+            )
+        try:
+            future = self._executor.submit(functools.partial(func, *args, **kwargs))
+        except Exception:
+            self._slots.release()
+            raise
+        with self._lock:
+            self._in_flight += 1
+        # Released when the work is done, even if the awaiting request was cancelled
+        future.add_done_callback(self._release)
+        return future
+
+    def _release(self, _: Future) -> None:
+        with self._lock:
+            self._in_flight -= 1
+        self._slots.release()
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "max_workers": self.max_workers,
+            "max_queue": self.max_queue,
+            "in_flight": self._in_flight,
+            "rejected": self.rejected,
+        }
@@ -0,0 +1,76 @@
+"""
+In-process latency histograms, one per endpoint.
+"""
+
+import bisect
+import threading
+import time
+from contextlib import contextmanager
+from typing import Any, Dict, Iterator, List
+
+# Upper bounds of the histogram buckets, in milliseconds; slower calls go to the "+Inf" bucket
+DEFAULT_BUCKETS_MS = [5, 10, 25, 50, 100, 250, 500, 1000, 2500, 5000, 10000, 30000]
+
+
+class LatencyHistogram:
+    def __init__(self, buckets_ms: List[float] = DEFAULT_BUCKETS_MS):
+        self.buckets_ms = list(buckets_ms)
+        self.counts = [0] * (len(self.buckets_ms) + 1)
+        self.count = 0
+        self.total_ms = 0.0
+        self.max_ms = 0.0
+        self.errors = 0
+        self._lock = threading.Lock()
+
+    def observe(self, elapsed_ms: float, error: bool = False) -> None:
+        with self._lock:
+            self.counts[bisect.bisect_left(self.buckets_ms, elapsed_ms)] += 1
+            self.count += 1
+            self.total_ms += elapsed_ms
+            self.max_ms = max(self.max_ms, elapsed_ms)
+            if error:
+                self.errors += 1
+
+    def snapshot(self) -> Dict[str, Any]:
+        with self._lock:
+            labels = [str(bound) for bound in self.buckets_ms] + ["+Inf"]
+            return {
+                "count": self.count,
+                "errors": self.errors,
+                "mean_ms": round(self.total_ms / self.count, 3) if self.count else None,
+                "max_ms": round(self.max_ms, 3),
+                "buckets_ms": dict(zip(labels, self.counts)),
+            }
+
+
+class LatencyRegistry:
+    def __init__(self):
+        self._histograms: Dict[str, LatencyHistogram] = {}
+        self._lock = threading.Lock()
+
+    def histogram(self, name: str) -> LatencyHistogram:
+        with self._lock:
+            if name not in self._histograms:
+                self._histograms[name] = LatencyHistogram()
+            return self._histograms[name]
+
+    @contextmanager
+    def time(self, name: str) -> Iterator[None]:
+        """Record the duration of the block under `name`, flagging it as an error if it raises"""
+        started = time.perf_counter()
+        error = False
+        try:
+            yield
+        except BaseException:
+            error = True
+            raise
+        finally:
+            self.histogram(name).observe((time.perf_counter() - started) * 1000, error)
+
+    def snapshot(self) -> Dict[str, Any]:
+        with self._lock:
+            names = sorted(self._histograms)
+        return {name: self.histogram(name).snapshot() for name in names}
+
+
+endpoint_latency = LatencyRegistry()
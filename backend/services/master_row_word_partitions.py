@@ -0,0 +1,222 @@
+"""
+Partitions of master_row_words.
+
+The table is LIST-partitioned by `lang_pair_id`: one partition per language pair,
+created together with its `lang_pairs` row, plus a DEFAULT partition as a safety
+net. Queries that filter on constant lang_pair ids only scan their partitions,
+and a whole language pair can be emptied with TRUNCATE.
+
+A language pair can also be replaced as a whole: its new rows are loaded into a
+plain staging table (invisible to readers), indexed, and then swapped in for the
+live partition with DETACH / ATTACH in one short transaction.
+"""
+import logging
+import time
+from typing import Any, Dict, Iterable, List, Optional
+
+from sqlalchemy import UniqueConstraint, column, insert, table, text
+from sqlalchemy.engine import Connection
+from sqlalchemy.exc import DBAPIError
+from sqlalchemy.orm import Session
+
+from models.master_row_word import MasterRowWord
+
+logger = logging.getLogger(__name__)
+
+TABLE = "master_row_words"
+DEFAULT_PARTITION = f"{TABLE}_default"
+
+# SQLSTATE of a lock_timeout
+LOCK_NOT_AVAILABLE = "55P03"
+
+# DDL on the parent waits at most this long for its lock per attempt, so it
+# neither hangs on a long reader nor queues every new reader behind it
+PARTITION_LOCK_TIMEOUT = "2s"
+PARTITION_LOCK_ATTEMPTS = 5
+PARTITION_RETRY_DELAY = 0.5  # seconds, doubled after each failed attempt
+
+def partition_name(lang_pair_id: int) -> str:
+    return f"{TABLE}_p{int(lang_pair_id)}"
+
+def _is_lock_timeout(e: DBAPIError) -> bool:
+    return getattr(e.orig, "pgcode", None) == LOCK_NOT_AVAILABLE
+
+def create_partition(conn: Connection, lang_pair_id: int) -> bool:
+    """Create the partition of a language pair if it has none (before any of its rows are written).
+
+    Runs on its own connection while the caller's session may already hold a lock
+    on master_row_words, so each attempt only waits PARTITION_LOCK_TIMEOUT for the
+    parent's lock, and the attempt is repeated PARTITION_LOCK_ATTEMPTS times. When
+    they all fail, the error is logged, the pair's rows go to the DEFAULT partition
+    and False is returned; the caller retries later (see TagDictionary.lang_pair_ids),
+    and a replace of the pair moves its rows to their own partition (see swap_partition).
+    """
+    delay = PARTITION_RETRY_DELAY
+    for attempt in range(1, PARTITION_LOCK_ATTEMPTS + 1):
+        savepoint = conn.begin_nested()
+        try:
+            conn.execute(text(f"SET LOCAL lock_timeout = '{PARTITION_LOCK_TIMEOUT}'"))
+            conn.execute(text(
+                f"CREATE TABLE IF NOT EXISTS {partition_name(lang_pair_id)} PARTITION OF {TABLE} "
+                f"FOR VALUES IN ({int(lang_pair_id)})"
+            ))
+            savepoint.commit()
+            return True
+        except DBAPIError as e:
+            savepoint.rollback()
+            if not _is_lock_timeout(e):
+                raise
+            if attempt == PARTITION_LOCK_ATTEMPTS:
+                logger.error(
+                    f"Partition for lang_pair_id {lang_pair_id} not created after {attempt} attempts, "
+                    f"its rows go to {DEFAULT_PARTITION} for now: {e.orig}"
+                )
+                return False
+            time.sleep(delay)
+            delay *= 2
+    return False
+
+def missing_partitions(conn: Connection, lang_pair_ids: Iterable[int]) -> List[int]:
+    """The given language pairs that have no partition of their own"""
+    ids = sorted({int(i) for i in lang_pair_ids})
+    if not ids:
+        return []
+    return [
+        lang_pair_id for lang_pair_id in ids
+        if conn.execute(text("SELECT to_regclass(:name)"), {"name": partition_name(lang_pair_id)}).scalar() is None
+    ]
+
+def truncate_partition(db: Session, lang_pair_id: int) -> Optional[int]:
+    """Empty one language pair's partition (no commit).
+
+    Returns the number of removed rows, or None when the pair has no partition of its own.
+    """
+    name = partition_name(lang_pair_id)
+    exists = db.execute(text("SELECT to_regclass(:name)"), {"name": name}).scalar()
+    if exists is None:
+        return None
+    count = db.execute(text(f"SELECT count(*) FROM {name}")).scalar_one()
+    db.execute(text(f"TRUNCATE TABLE {name}"))
+    return count
+
+def staging_name(lang_pair_id: int) -> str:
+    return f"{partition_name(lang_pair_id)}_staging"
+
+def create_staging(db: Session, lang_pair_id: int) -> str:
+    """Empty staging table shaped like a partition of the pair; returns its name (no commit).
+
+    The CHECK constraint lets ATTACH PARTITION skip its validation scan.
+    """
+    name = staging_name(lang_pair_id)
+    db.execute(text(f"DROP TABLE IF EXISTS {name}"))
+    db.execute(text(f"CREATE TABLE {name} (LIKE {TABLE} INCLUDING DEFAULTS INCLUDING GENERATED)"))
+    db.execute(text(f"ALTER TABLE {name} ADD CHECK (lang_pair_id = {int(lang_pair_id)})"))
+    return name
+
+def load_staging(db: Session, name: str, rows: Iterable[Dict[str, Any]], *, chunk_size: int = 5000) -> int:
+    """Insert row mappings (all with the same keys) into a staging table (no commit)"""
+    count = 0
+    chunk: List[Dict[str, Any]] = []
+
+    def flush():
+        staging = table(name, *[column(key) for key in chunk[0]])
+        db.execute(insert(staging), chunk)
+
+    for row in rows:
+        chunk.append(row)
+        if len(chunk) >= chunk_size:
+            flush()
+            count += len(chunk)
+            chunk = []
+    if chunk:
+        flush()
+        count += len(chunk)
+    return count
+
+def copy_to_staging(db: Session, name: str, lang_pair_id: int, where: str = "TRUE", params: Optional[dict] = None) -> int:
+    """Copy the pair's live rows matching `where` into the staging table (no commit)"""
+    columns = ", ".join(c.name for c in MasterRowWord.__table__.columns if c.computed is None)
+    return db.execute(
+        text(f"INSERT INTO {name} ({columns}) SELECT {columns} FROM {TABLE} "
+             f"WHERE lang_pair_id = {int(lang_pair_id)} AND ({where})"),
+        params or {},
+    ).rowcount
+
+def dedupe_staging(db: Session, name: str) -> int:
+    """Delete staging rows that repeat another row's unique key, keeping the first loaded (no commit).
+
+    Must run before index_staging, whose unique constraint would reject them. Rows
+    with a NULL key column never conflict, as in the constraint. Numbering the rows
+    of each key is one sort of the table, where a self-join on the key would not
+    be hashable. Returns the number of deleted rows.
+    """
+    count = 0
+    for constraint in MasterRowWord.__table__.constraints:
+        if not isinstance(constraint, UniqueConstraint):
+            continue
+        keys = [c.name for c in constraint.columns]
+        count += db.execute(text(
+            f"DELETE FROM {name} WHERE id IN ("
+            f"SELECT id FROM (SELECT id, row_number() OVER (PARTITION BY {', '.join(keys)} ORDER BY id) AS rn "
+            f"FROM {name} WHERE {' AND '.join(f'{k} IS NOT NULL' for k in keys)}) s WHERE rn > 1)"
+        )).rowcount
+    return count
+
+def index_staging(db: Session, name: str) -> None:
+    """Build the partition's keys, indexes and foreign keys on the loaded staging table (no commit).
+
+    They match the parent's, so ATTACH PARTITION adopts them instead of building new ones.
+    """
+    model_table = MasterRowWord.__table__
+    db.execute(text(f"ALTER TABLE {name} ADD PRIMARY KEY (id, lang_pair_id)"))
+    for constraint in model_table.constraints:
+        if isinstance(constraint, UniqueConstraint):
+            db.execute(text(f"ALTER TABLE {name} ADD UNIQUE ({', '.join(c.name for c in constraint.columns)})"))
+    for index in model_table.indexes:
+        using = index.dialect_options["postgresql"]["using"] or "btree"
+        db.execute(text(f"CREATE INDEX ON {name} USING {using} ({', '.join(c.name for c in index.columns)})"))
+    for fk in model_table.foreign_keys:
+        db.execute(text(
+            f"ALTER TABLE {name} ADD FOREIGN KEY ({fk.parent.name}) "
+            f"REFERENCES {fk.column.table.name} ({fk.column.name})"
+        ))
+    db.execute(text(f"ANALYZE {name}"))
+
+def swap_partition(db: Session, lang_pair_id: int, name: str) -> None:
+    """Replace the pair's live partition with the staging table and commit.
+
+    Readers see either the old or the new rows; the parent is locked only for the
+    DETACH / rename / ATTACH statements, and the old partition is dropped rather
+    than deleted from, so no dead tuples are left behind. Like create_partition,
+    each attempt waits at most PARTITION_LOCK_TIMEOUT for the parent's lock; the
+    staging table is committed, so a timed-out swap is simply run again.
+    """
+    live = partition_name(lang_pair_id)
+    delay = PARTITION_RETRY_DELAY
+    for attempt in range(1, PARTITION_LOCK_ATTEMPTS + 1):
+        try:
+            db.execute(text(f"SET LOCAL lock_timeout = '{PARTITION_LOCK_TIMEOUT}'"))
+            if db.execute(text("SELECT to_regclass(:name)"), {"name": live}).scalar() is not None:
+                db.execute(text(f"ALTER TABLE {TABLE} DETACH PARTITION {live}"))
+                db.execute(text(f"DROP TABLE {live}"))
+            else:
+                # Rows of a pair without its own partition live in DEFAULT and would block the ATTACH
+                db.execute(text(f"DELETE FROM {DEFAULT_PARTITION} WHERE lang_pair_id = {int(lang_pair_id)}"))
+            db.execute(text(f"ALTER TABLE {name} RENAME TO {live}"))
+            db.execute(text(f"ALTER TABLE {TABLE} ATTACH PARTITION {live} FOR VALUES IN ({int(lang_pair_id)})"))
+            db.commit()
+            return
+        except DBAPIError as e:
+            db.rollback()
+            if not _is_lock_timeout(e) or attempt == PARTITION_LOCK_ATTEMPTS:
+                raise
+            logger.warning(f"Swap of {live} timed out waiting for the {TABLE} lock (attempt {attempt}), retrying")
+            time.sleep(delay)
+            delay *= 2
+        except Exception:
+            db.rollback()
+            raise
+
+def drop_staging(db: Session, lang_pair_id: int) -> None:
+    db.execute(text(f"DROP TABLE IF EXISTS {staging_name(lang_pair_id)}"))
+    db.commit()
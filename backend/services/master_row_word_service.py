@@ -11,13 +11,29 @@ Feel free to adjust field names in `create()` / `update()` according to your act
 from __future__ import annotations
 
 from dataclasses import dataclass
-from typing import Any, Dict, Iterable, List, Optional, Sequence, Tuple
+from datetime import datetime
+from itertools import groupby
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional, Sequence, Tuple
 
-from sqlalchemy import func, select, and_, or_, asc, desc
+from sqlalchemy import DateTime, Integer, delete, func, insert, literal, select, and_, or_, asc, desc
+from sqlalchemy.dialects.postgresql import insert as pg_insert
 from sqlalchemy.orm import Session
 from sqlalchemy.exc import IntegrityError
 
 from models.master_row_word import MasterRowWord
+from models.row_word import RowWord
+from services.master_row_word_partitions import (
+    copy_to_staging,
+    create_staging,
+    dedupe_staging,
+    drop_staging,
+    index_staging,
+    load_staging,
+    swap_partition,
+    truncate_partition,
+)
+from services.tag_dictionary import tag_dictionary
+from services.vietnamese_normalization import word_search_forms
 
 # Import your model
 # from app.models import MasterRowWord  # <- adjust this import to your project structure
@@ -26,6 +42,16 @@ from models.master_row_word import MasterRowWord
 
 BOM = "\ufeff"
 
+# Rows per DELETE statement (and per commit) of the batched deletes
+DELETE_BATCH_SIZE = 5000
+
+# Unique key of master_row_words (models.master_row_word) used by bulk_upsert
+UNIQUE_CONSTRAINT = "uq_master_row_words_lang_pair_id_lang_code_id_string"
+UNIQUE_KEY = ("lang_pair_id", "lang_code", "id_string")
+UPSERT_MODES = ("update", "skip")
+# Columns an upsert never overwrites on existing rows
+UPSERT_KEEP_COLUMNS = ("id", "created_at", "create_by")
+
 def extract_main_id(id_str: str) -> str:
     """Extract core numeric ID from formats like 'VD01821301' -> '01821301'.
     - Removes BOM if present
@@ -41,6 +67,13 @@ def extract_main_id(id_str: str) -> str:
         return digits[-8:]
     return s
 
+def with_search_forms(item: Dict[str, Any]) -> Dict[str, Any]:
+    """Add word_norm / word_toneless to a row mapping that has a `word` but no search forms yet."""
+    if "word" in item and "word_norm" not in item:
+        word_norm, word_toneless = word_search_forms(item["word"])
+        item = {**item, "word_norm": word_norm, "word_toneless": word_toneless}
+    return item
+
 @dataclass
 class PageParams:
     page: int = 1
@@ -92,15 +125,7 @@ class MasterRowWordService:
         """
         pp = PageParams(page, limit).normalize()
 
-        conditions = []
-        if search:
-            conditions.append(self.model.word.ilike(f"%{search}%"))
-        if lang_codes:
-            conditions.append(self.model.lang_code.in_(list(lang_codes)))
-        if id_sen_list:
-            # Clean potential BOMs and keep original ids as well, to be safe
-            cleaned = [extract_main_id(x) for x in id_sen_list]
-            conditions.append(or_(self.model.id_sen.in_(id_sen_list), self.model.id_sen.in_(cleaned)))
+        conditions = self._conditions(search=search, lang_codes=lang_codes, id_sen_list=id_sen_list)
 
         stmt_base = select(self.model)
         if conditions:
@@ -109,14 +134,8 @@ class MasterRowWordService:
         # Count
         total = db.execute(select(func.count()).select_from(stmt_base.subquery())).scalar_one()
 
-        # Ordering
-        order_exprs = []
-        for col_name, dir_ in order:
-            col = getattr(self.model, col_name)
-            order_exprs.append(asc(col) if dir_.lower() == "asc" else desc(col))
-
         stmt = (
-            stmt_base.order_by(*order_exprs)
+            stmt_base.order_by(*self._order_by(order))
             .offset((pp.page - 1) * pp.limit)
             .limit(pp.limit)
         )
@@ -132,16 +151,50 @@ class MasterRowWordService:
         id_sen_list: Optional[Sequence[str]] = None,
         order: Sequence[Tuple[str, str]] = (("id_sen", "asc"), ("id", "asc")),
     ) -> List["MasterRowWord"]:
-        rows, _ = self.list(
+        """Every matching row (no page limit). Prefer `iter_all` for large results."""
+        return list(self.iter_all(db, search=search, lang_codes=lang_codes, id_sen_list=id_sen_list, order=order))
+
+    def iter_all(
+        self,
+        db: Session,
+        *,
+        search: Optional[str] = None,
+        lang_codes: Optional[Sequence[str]] = None,
+        id_sen_list: Optional[Sequence[str]] = None,
+        order: Sequence[Tuple[str, str]] = (("id_sen", "asc"), ("id", "asc")),
+        yield_per: int = 2000,
+    ) -> Iterator["MasterRowWord"]:
+        """Stream every matching row through a server-side cursor, `yield_per` rows in memory at a time.
+
+        Same filters as `list`, without pagination or count query.
+        """
+        stmt = select(self.model)
+        conditions = self._conditions(search=search, lang_codes=lang_codes, id_sen_list=id_sen_list)
+        if conditions:
+            stmt = stmt.where(and_(*conditions))
+        stmt = stmt.order_by(*self._order_by(order)).execution_options(yield_per=yield_per)
+        yield from db.execute(stmt).scalars()
+
+    def iter_sentence_groups(
+        self,
+        db: Session,
+        *,
+        lang_codes: Optional[Sequence[str]] = None,
+        id_sen_list: Optional[Sequence[str]] = None,
+        search: Optional[str] = None,
+        yield_per: int = 2000,
+    ) -> Iterator[Tuple[str, List["MasterRowWord"]]]:
+        """Stream (id_sen, rows) groups in (id_sen, id) order; only one sentence is held at a time."""
+        rows = self.iter_all(
             db,
-            page=1,
-            limit=10_000_000,
             search=search,
             lang_codes=lang_codes,
             id_sen_list=id_sen_list,
-            order=order,
+            order=(("id_sen", "asc"), ("id", "asc")),
+            yield_per=yield_per,
         )
-        return rows
+        for id_sen, group in groupby(rows, key=lambda r: r.id_sen):
+            yield id_sen, list(group)
 
     def group_by_id_sen(
         self,
@@ -151,21 +204,38 @@ class MasterRowWordService:
         id_sen_list: Optional[Sequence[str]] = None,
         search: Optional[str] = None,
     ) -> Dict[str, List["MasterRowWord"]]:
-        """Return a dictionary mapping id_sen -> [rows]."""
-        rows = self.list_all(
-            db,
-            search=search,
-            lang_codes=lang_codes,
-            id_sen_list=id_sen_list,
+        """Return a dictionary mapping id_sen -> [rows]. Prefer `iter_sentence_groups` for large results."""
+        return dict(self.iter_sentence_groups(db, lang_codes=lang_codes, id_sen_list=id_sen_list, search=search))
+
+    def linked_to(
+        self,
+        db: Session,
+        id_sen: str,
+        lang_code: str,
+        positions: Sequence[int],
+        *,
+        lang_pairs: Sequence[str],
+    ) -> List["MasterRowWord"]:
+        """Tokens of a sentence (in `lang_code`) aligned with any of `positions`, e.g. a span of the other language.
+
+        Compares links_array with && (overlap), which the GIN index on links_array serves.
+        Sorted by position.
+        """
+        stmt = (
+            select(self.model)
+            .where(
+                self.model.id_sen == id_sen,
+                self.model.lang_code == lang_code,
+                self.model.links_array.overlap([int(p) for p in positions]),
+                tag_dictionary.lang_pair_filter(db, lang_pairs),
+            )
+            .order_by(self.model.position, self.model.id)
         )
-        grouped: Dict[str, List["MasterRowWord"]] = {}
-        for r in rows:
-            grouped.setdefault(r.id_sen, []).append(r)
-        return grouped
+        return list(db.execute(stmt).scalars())
 
     # ---------- Create / Update / Delete -----------------------------------
     def create(self, db: Session, data: Dict[str, Any]) -> "MasterRowWord":
-        obj = self.model(**data)
+        obj = self.model(**tag_dictionary.with_ids(db, [with_search_forms(data)], insert=True)[0])
         db.add(obj)
         self._commit(db)
         db.refresh(obj)
@@ -176,22 +246,218 @@ class MasterRowWordService:
         count = 0
         chunk: List[Dict[str, Any]] = []
         for item in data_list:
-            chunk.append(item)
+            chunk.append(with_search_forms(item))
             if len(chunk) >= chunk_size:
-                db.bulk_insert_mappings(self.model, chunk)
+                db.bulk_insert_mappings(self.model, tag_dictionary.with_ids(db, chunk, insert=True))
                 self._commit(db)
                 count += len(chunk)
                 chunk.clear()
         if chunk:
-            db.bulk_insert_mappings(self.model, chunk)
+            db.bulk_insert_mappings(self.model, tag_dictionary.with_ids(db, chunk, insert=True))
             self._commit(db)
             count += len(chunk)
         return count
 
+    def insert_from_row_words(
+        self,
+        db: Session,
+        id_sens: Sequence[str],
+        *,
+        lang_pair: Optional[str] = None,
+        create_by: Optional[int] = None,
+        approval_by: Optional[int] = None,
+    ) -> int:
+        """Copy every `row_words` token of the given sentences with one INSERT ... SELECT.
+
+        Only the search forms of the new rows are computed in Python afterwards, and
+        nothing is committed: the caller owns the transaction, so several calls
+        (one per batch) can be applied atomically.
+        Returns the number of inserted rows.
+        """
+        if not id_sens:
+            return 0
+        inserted = self._copy_row_words(
+            db, RowWord.id_sen.in_(list(id_sens)), lang_pair=lang_pair, create_by=create_by, approval_by=approval_by
+        )
+        self.fill_search_forms(db, id_sens=id_sens)
+        return inserted
+
+    def migrate_row_words(
+        self,
+        db: Session,
+        *,
+        create_by: Optional[int] = None,
+        batch_size: int = 50_000,
+        progress: Optional[Callable[[int], None]] = None,
+    ) -> int:
+        """Copy every `row_words` token that has no master row yet, one committed id range at a time.
+
+        Each range is a single INSERT ... SELECT with a NOT EXISTS anti-join on
+        master_row_words.row_word_id, so re-running only copies what is missing.
+        `progress` is called with the running total after every range.
+        Returns the number of inserted rows.
+        """
+        inserted = 0
+        last_id = None
+        while True:
+            bounds = select(RowWord.id).order_by(RowWord.id).offset(batch_size - 1).limit(1)
+            if last_id is not None:
+                bounds = bounds.where(RowWord.id > last_id)
+            upper_id = db.execute(bounds).scalar()
+
+            condition = [~select(self.model.id).where(self.model.row_word_id == RowWord.id).exists()]
+            if last_id is not None:
+                condition.append(RowWord.id > last_id)
+            if upper_id is not None:
+                condition.append(RowWord.id <= upper_id)
+            inserted += self._copy_row_words(db, and_(*condition), create_by=create_by)
+            self._commit(db)
+            if progress is not None:
+                progress(inserted)
+            if upper_id is None:
+                break
+            last_id = upper_id
+
+        self.fill_search_forms(db)
+        self._commit(db)
+        return inserted
+
+    def _copy_row_words(
+        self,
+        db: Session,
+        condition: Any,
+        *,
+        lang_pair: Optional[str] = None,
+        create_by: Optional[int] = None,
+        approval_by: Optional[int] = None,
+    ) -> int:
+        """INSERT ... SELECT the `row_words` rows matching `condition`, creating their tags first (no commit)"""
+        now = datetime.now()
+        tag_dictionary.create_tags_from(db, select(RowWord.pos, RowWord.ner, RowWord.semantic).where(condition).subquery())
+        source = select(
+            RowWord.id,
+            RowWord.id,
+            RowWord.id_sen,
+            RowWord.word,
+            RowWord.lemma,
+            RowWord.links,
+            RowWord.morph,
+            tag_dictionary.tag_id("pos", RowWord.pos),
+            RowWord.phrase,
+            RowWord.grm,
+            tag_dictionary.tag_id("ner", RowWord.ner),
+            tag_dictionary.tag_id("semantic", RowWord.semantic),
+            RowWord.lang_code,
+            literal(tag_dictionary.lang_pair_id(db, lang_pair), Integer),
+            literal(create_by, Integer),
+            literal(approval_by, Integer),
+            literal(now, DateTime),
+            literal(now, DateTime),
+        ).where(condition)
+        stmt = insert(self.model).from_select(
+            [
+                "id_string",
+                "row_word_id",
+                "id_sen",
+                "word",
+                "lemma",
+                "links",
+                "morph",
+                "pos_id",
+                "phrase",
+                "grm",
+                "ner_id",
+                "semantic_id",
+                "lang_code",
+                "lang_pair_id",
+                "create_by",
+                "approval_by",
+                "created_at",
+                "updated_at",
+            ],
+            source,
+        )
+        return db.execute(stmt).rowcount
+
+    def fill_search_forms(self, db: Session, *, id_sens: Optional[Sequence[str]] = None, batch_size: int = 5000) -> int:
+        """Compute word_norm / word_toneless for rows that do not have them yet (no commit).
+
+        Restricted to the given sentences when `id_sens` is passed. Returns the number of updated rows.
+        """
+        count = 0
+        last_id = 0
+        while True:
+            stmt = select(self.model.id, self.model.word).where(
+                self.model.word_norm.is_(None), self.model.id > last_id
+            )
+            if id_sens is not None:
+                stmt = stmt.where(self.model.id_sen.in_(list(id_sens)))
+            rows = db.execute(stmt.order_by(self.model.id).limit(batch_size)).all()
+            if not rows:
+                break
+            mappings = []
+            for row_id, word in rows:
+                word_norm, word_toneless = word_search_forms(word)
+                mappings.append({"id": row_id, "word_norm": word_norm, "word_toneless": word_toneless})
+            db.bulk_update_mappings(self.model, mappings)
+            count += len(rows)
+            last_id = rows[-1][0]
+        return count
+
+    def replace_lang_pair(
+        self,
+        db: Session,
+        lang_pair: str,
+        data_list: Iterable[Dict[str, Any]],
+        *,
+        lang_code: Optional[str] = None,
+        chunk_size: int = 5000,
+    ) -> int:
+        """Atomically replace a language pair's rows (only those of `lang_code` when given).
+
+        The new rows, plus the pair's rows of other languages when `lang_code` is
+        given, are loaded and indexed in a staging table while readers keep seeing
+        the current corpus, then swapped in for the pair's partition in one short
+        transaction. Writes to the pair made during the load are not carried over.
+        Rows repeating a key of the unique constraint keep their first occurrence.
+        Raises ValueError, before anything is swapped, when `data_list` has no rows.
+        Returns the number of loaded rows.
+        """
+        lang_pair_id = tag_dictionary.lang_pair_id(db, lang_pair)
+        staging = create_staging(db, lang_pair_id)
+        try:
+            if lang_code:
+                copy_to_staging(db, staging, lang_pair_id, "lang_code IS DISTINCT FROM :lang_code", {"lang_code": lang_code})
+            rows = self._insert_mappings(db, ({**item, "lang_pair": lang_pair} for item in data_list), chunk_size)
+            count = load_staging(db, staging, rows, chunk_size=chunk_size)
+            if count == 0:
+                raise ValueError(f"No rows to load, the corpus of {lang_pair} is left unchanged")
+            count -= dedupe_staging(db, staging)
+            index_staging(db, staging)
+            db.commit()
+            swap_partition(db, lang_pair_id, staging)
+        except Exception:
+            db.rollback()
+            drop_staging(db, lang_pair_id)
+            raise
+        return count
+
+    def _insert_mappings(self, db: Session, data_list: Iterable[Dict[str, Any]], chunk_size: int) -> Iterable[Dict[str, Any]]:
+        """Row mappings completed with search forms and tag ids, resolved one chunk at a time"""
+        chunk: List[Dict[str, Any]] = []
+        for item in data_list:
+            chunk.append(with_search_forms(item))
+            if len(chunk) >= chunk_size:
+                yield from tag_dictionary.with_ids(db, chunk, insert=True)
+                chunk = []
+        if chunk:
+            yield from tag_dictionary.with_ids(db, chunk, insert=True)
+
     def update(self, db: Session, pk: Any, data: Dict[str, Any]) -> Optional["MasterRowWord"]:
         obj = self.get(db, pk)
         if not obj:
             return None
+        data = tag_dictionary.with_ids(db, [with_search_forms(data)])[0]
         for k, v in data.items():
             if hasattr(obj, k):
                 setattr(obj, k, v)
@@ -199,28 +465,69 @@ class MasterRowWordService:
         db.refresh(obj)
         return obj
 
-    def upsert_by_unique_keys(
+    def bulk_upsert(
         self,
         db: Session,
-        data: Dict[str, Any],
+        data_list: Iterable[Dict[str, Any]],
         *,
-        unique_keys: Sequence[str] = ("id_sen", "lang_code", "word"),
-    ) -> "MasterRowWord":
-        """Upsert based on a set of unique keys.
-        Adjust `unique_keys` to your actual constraint.
+        on_conflict: str = "update",
+        chunk_size: int = 1000,
+    ) -> int:
+        """Insert or merge many rows on the unique key (lang_pair_id, lang_code, id_string).
+
+        One INSERT ... ON CONFLICT statement and one commit per chunk. With
+        on_conflict="update" the given columns of existing rows are overwritten
+        (created_at / create_by are kept); with "skip" existing rows are left as
+        they are. Repeated keys within the input follow the same rule: the last
+        occurrence wins with "update", the first with "skip". Returns the number
+        of inserted or updated rows.
         """
-        conds = [getattr(self.model, k) == data.get(k) for k in unique_keys]
-        stmt = select(self.model).where(and_(*conds)).limit(1)
-        existing = db.execute(stmt).scalar_one_or_none()
-        if existing:
-            for k, v in data.items():
-                if hasattr(existing, k):
-                    setattr(existing, k, v)
-            self._commit(db)
-            db.refresh(existing)
-            return existing
-        obj = self.model(**data)
-        db.add(obj)
+        if on_conflict not in UPSERT_MODES:
+            raise ValueError(f"on_conflict must be one of {UPSERT_MODES}")
+        count = 0
+        chunk: Dict[Tuple[Any, ...], Dict[str, Any]] = {}
+        for item in self._insert_mappings(db, data_list, chunk_size):
+            key = tuple(item.get(k) for k in UNIQUE_KEY)
+            if on_conflict == "update" or key not in chunk:
+                chunk[key] = item
+            if len(chunk) >= chunk_size:
+                count += self._upsert_chunk(db, list(chunk.values()), on_conflict)
+                chunk = {}
+        if chunk:
+            count += self._upsert_chunk(db, list(chunk.values()), on_conflict)
+        return count
+
+    def _upsert_chunk(self, db: Session, items: List[Dict[str, Any]], on_conflict: str) -> int:
+        count = 0
+        # A multi-row VALUES needs the same columns in every row
+        by_columns: Dict[Tuple[str, ...], List[Dict[str, Any]]] = {}
+        for item in items:
+            by_columns.setdefault(tuple(sorted(item)), []).append(item)
+        for columns, rows in by_columns.items():
+            stmt = pg_insert(self.model).values(rows)
+            if on_conflict == "skip":
+                stmt = stmt.on_conflict_do_nothing(constraint=UNIQUE_CONSTRAINT)
+            else:
+                updates = {c: stmt.excluded[c] for c in columns if c not in UNIQUE_KEY + UPSERT_KEEP_COLUMNS}
+                if "updated_at" not in columns:
+                    updates["updated_at"] = datetime.now()
+                stmt = stmt.on_conflict_do_update(constraint=UNIQUE_CONSTRAINT, set_=updates)
+            count += db.execute(stmt).rowcount
+        self._commit(db)
+        return count
+
+    def upsert_by_unique_keys(self, db: Session, data: Dict[str, Any]) -> "MasterRowWord":
+        """Insert one record, or update the row with its (lang_pair, lang_code, id_string).
+
+        Same rules as `bulk_upsert` with on_conflict="update", which is the one to use for many records.
+        """
+        item = tag_dictionary.with_ids(db, [with_search_forms(data)], insert=True)[0]
+        stmt = pg_insert(self.model).values(item)
+        updates = {c: stmt.excluded[c] for c in item if c not in UNIQUE_KEY + UPSERT_KEEP_COLUMNS}
+        if "updated_at" not in item:
+            updates["updated_at"] = datetime.now()
+        stmt = stmt.on_conflict_do_update(constraint=UNIQUE_CONSTRAINT, set_=updates).returning(self.model)
+        obj = db.scalars(stmt, execution_options={"populate_existing": True}).one()
         self._commit(db)
         db.refresh(obj)
         return obj
@@ -233,36 +540,80 @@ class MasterRowWordService:
         self._commit(db)
         return True
 
-    def delete_by_id_sen(self, db: Session, id_sens: Sequence[str]) -> int:
+    def delete_by_id_sen(
+        self,
+        db: Session,
+        id_sens: Sequence[str],
+        *,
+        batch_size: int = DELETE_BATCH_SIZE,
+        progress: Optional[Callable[[int], None]] = None,
+    ) -> int:
         if not id_sens:
             return 0
         cleaned = [extract_main_id(x) for x in id_sens]
-        stmt = select(self.model).where(or_(self.model.id_sen.in_(id_sens), self.model.id_sen.in_(cleaned)))
-        rows = list(db.execute(stmt).scalars())
-        for r in rows:
-            db.delete(r)
-        self._commit(db)
-        return len(rows)
-    
+        condition = or_(self.model.id_sen.in_(list(id_sens)), self.model.id_sen.in_(cleaned))
+        return self.delete_where(db, condition, batch_size=batch_size, progress=progress)
+
+    def delete_all(
+        self,
+        db: Session,
+        *,
+        batch_size: int = DELETE_BATCH_SIZE,
+        progress: Optional[Callable[[int], None]] = None,
+    ) -> int:
+        return self.delete_where(db, batch_size=batch_size, progress=progress)
+
+    def delete_where(
+        self,
+        db: Session,
+        *conditions: Any,
+        batch_size: int = DELETE_BATCH_SIZE,
+        progress: Optional[Callable[[int], None]] = None,
+    ) -> int:
+        """Delete the rows matching `conditions` in batches of `batch_size`, one commit per batch.
+
+        Batches walk the id index (keyset), so each DELETE holds its row locks and
+        writes its WAL for one batch only. `progress` is called with the running
+        total after every batch. Returns the number of deleted rows.
+        """
+        deleted = 0
+        last_id = 0
+        while True:
+            ids = db.execute(
+                select(self.model.id)
+                .where(self.model.id > last_id, *conditions)
+                .order_by(self.model.id)
+                .limit(batch_size)
+            ).scalars().all()
+            if not ids:
+                # Also ends the read transaction when nothing matched
+                self._commit(db)
+                break
+            db.execute(
+                delete(self.model).where(self.model.id.in_(ids), *conditions),
+                execution_options={"synchronize_session": False},
+            )
+            self._commit(db)
+            deleted += len(ids)
+            last_id = ids[-1]
+            if progress is not None:
+                progress(deleted)
+        return deleted
 
-    def delete_all(self, db: Session) -> int:
-        
-        stmt = select(self.model)
-        rows = list(db.execute(stmt).scalars())
-        for r in rows:
-            db.delete(r)
-        self._commit(db)
-        return len(rows)
-    
     def delete_all_fast(self, db: Session, lang_code: str = "", lang_pair: str = "") -> int:
-        query = db.query(self.model)
+        """Delete by language and/or language pair; a whole pair is a TRUNCATE of its partition."""
+        if lang_pair and not lang_code:
+            for lang_pair_id in tag_dictionary.known_lang_pair_ids(db, [lang_pair]):
+                count = truncate_partition(db, lang_pair_id)
+                if count is not None:
+                    db.commit()
+                    return count
+        conditions = []
         if lang_code:
-            query = query.filter(self.model.lang_code == lang_code)
+            conditions.append(self.model.lang_code == lang_code)
         if lang_pair:
-            query = query.filter(self.model.lang_pair == lang_pair)
-        count = query.delete(synchronize_session=False)
-        db.commit()
-        return count
+            conditions.append(tag_dictionary.lang_pair_filter(db, [lang_pair]))
+        return self.delete_where(db, *conditions)
 
     # ---------- Counts ------------------------------------------------------
     def count(
@@ -273,20 +624,38 @@ class MasterRowWordService:
         lang_codes: Optional[Sequence[str]] = None,
         id_sen_list: Optional[Sequence[str]] = None,
     ) -> int:
+        conditions = self._conditions(search=search, lang_codes=lang_codes, id_sen_list=id_sen_list)
+        stmt = select(func.count()).select_from(self.model)
+        if conditions:
+            stmt = stmt.where(and_(*conditions))
+        return db.execute(stmt).scalar_one()
+
+    # ---------- Internal helpers -------------------------------------------
+    def _conditions(
+        self,
+        *,
+        search: Optional[str] = None,
+        lang_codes: Optional[Sequence[str]] = None,
+        id_sen_list: Optional[Sequence[str]] = None,
+    ) -> List[Any]:
         conditions = []
         if search:
             conditions.append(self.model.word.ilike(f"%{search}%"))
         if lang_codes:
             conditions.append(self.model.lang_code.in_(list(lang_codes)))
         if id_sen_list:
+            # Clean potential BOMs and keep original ids as well, to be safe
             cleaned = [extract_main_id(x) for x in id_sen_list]
             conditions.append(or_(self.model.id_sen.in_(id_sen_list), self.model.id_sen.in_(cleaned)))
-        stmt = select(func.count()).select_from(self.model)
-        if conditions:
-            stmt = stmt.where(and_(*conditions))
-        return db.execute(stmt).scalar_one()
+        return conditions
+
+    def _order_by(self, order: Sequence[Tuple[str, str]]) -> List[Any]:
+        order_exprs = []
+        for col_name, dir_ in order:
+            col = getattr(self.model, col_name)
+            order_exprs.append(asc(col) if dir_.lower() == "asc" else desc(col))
+        return order_exprs
 
-    # ---------- Internal helpers -------------------------------------------
     def _commit(self, db: Session) -> None:
         try:
             db.commit()
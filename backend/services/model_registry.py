@@ -0,0 +1,137 @@
+"""
+Registry of the NLP models shared by all routers.
+
+Every model is loaded at most once per process: either on first use or by the
+background warm-up started with the application. Routers ask the registry for a
+model instead of loading their own copy at import time.
+"""
+
+import logging
+import resource
+import threading
+import time
+from typing import Any, Callable, Dict, Iterable, Optional
+
+logger = logging.getLogger(__name__)
+
+SPACY_EN_MODEL = "en_core_web_sm"
+VNCORENLP_MODEL = "vncorenlp"
+
+NOT_LOADED = "not_loaded"
+LOADING = "loading"
+READY = "ready"
+FAILED = "failed"
+
+
+class ModelRegistry:
+    def __init__(self):
+        self._loaders: Dict[str, Callable[[], Any]] = {}
+        self._locks: Dict[str, threading.Lock] = {}
+        self._models: Dict[str, Any] = {}
+        self._states: Dict[str, str] = {}
+        self._errors: Dict[str, str] = {}
+        self._load_seconds: Dict[str, float] = {}
+
+    def register(self, name: str, loader: Callable[[], Any]) -> None:
+        """Register a loader; it is not called until the model is first needed"""
+        self._loaders[name] = loader
+        self._locks[name] = threading.Lock()
+        self._states[name] = NOT_LOADED
+
+    def get(self, name: str) -> Optional[Any]:
+        """
+        Return the loaded model, loading it on first use.
+        Concurrent callers wait for the single in-flight load. Returns None if loading failed.
+        """
+        if self._states[name] not in (READY, FAILED):
+            with self._locks[name]:
+                if self._states[name] not in (READY, FAILED):
+                    self._load(name)
+        return self._models.get(name)
+
+    def state(self, name: str) -> str:
+        return self._states[name]
+
+    def is_ready(self, name: str) -> bool:
+        return self._states[name] == READY
+
+    def warm_up(self, names: Optional[Iterable[str]] = None) -> threading.Thread:
+        """Load the given models (all by default) in a daemon thread so startup does not block"""
+        names = list(names) if names is not None else list(self._loaders)
+
+        def run():
+            for name in names:
+                self.get(name)
+
+        thread = threading.Thread(target=run, name="model-warm-up", daemon=True)
+        thread.start()
+        return thread
+
+    def status(self) -> Dict[str, Any]:
+        """Readiness, load time and last error of every model, plus the process peak RSS"""
+        models = {}
+        for name in self._loaders:
+            models[name] = {
+                "status": self._states[name],
+                "load_seconds": self._load_seconds.get(name),
+                "error": self._errors.get(name),
+            }
+        return {
+            "models": models,
+            "ready": all(state == READY for state in self._states.values()),
+            # ru_maxrss is reported in kilobytes on Linux
+            "max_rss_mb": round(resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024, 1),
+        }
+
+    def _load(self, name: str) -> None:
+        self._states[name] = LOADING
+        started = time.perf_counter()
+        try:
+            self._models[name] = self._loaders[name]()
+            self._states[name] = READY
+            self._errors.pop(name, None)
+            logger.info(f"Model '{name}' loaded in {time.perf_counter() - started:.2f}s")
+        except Exception as e:
+            self._models[name] = None
+            self._states[name] = FAILED
+            self._errors[name] = str(e)
+            logger.warning(f"Model '{name}' could not be loaded: {str(e)}")
+        finally:
+            self._load_seconds[name] = round(time.perf_counter() - started, 3)
+
+
+def _load_spacy_en():
+    import spacy
+
+    try:
+        return spacy.load(SPACY_EN_MODEL)
+    except OSError:
+        raise RuntimeError(
+            f"SpaCy model '{SPACY_EN_MODEL}' not found. "
+            f"Please install it using: python -m spacy download {SPACY_EN_MODEL}"
+        )
+
+
+def _load_vncorenlp():
+    # Imported here so the JVM is only started when Vietnamese analysis is actually needed
+    from .vietnamese_nlp_service import VietnameseNLPService
+
+    service = VietnameseNLPService()
+    if not service.is_available():
+        raise RuntimeError("VnCoreNLP could not be initialized")
+    return service
+
+
+model_registry = ModelRegistry()
+model_registry.register(SPACY_EN_MODEL, _load_spacy_en)
+model_registry.register(VNCORENLP_MODEL, _load_vncorenlp)
+
+
+def get_english_nlp():
+    """Shared spaCy English pipeline, or None if it is not installed"""
+    return model_registry.get(SPACY_EN_MODEL)
+
+
+def get_vietnamese_nlp_service():
+    """Shared VietnameseNLPService, or None if VnCoreNLP is not available"""
+    return model_registry.get(VNCORENLP_MODEL)
@@ -1,6 +1,11 @@
 """
 Mapping service for POS tags and NER labels to specific Vietnamese/English values
+
+The `(specific, explanation)` result of every known tag is precomputed once at
+import into per-language lookup tables, so mapping a token is a single dict hit.
 """
+import sys
+from typing import Dict, Tuple
 
 # English POS mapping to specific values
 EN_POS_MAPPING = {
@@ -180,17 +185,36 @@ SPACY_TO_EN_NER = {
     "WORK_OF_ART": "O", "MISC": "O"
 }
 
-def map_pos_tag(pos_tag: str, language: str = "en") -> tuple[str, str]:
-    """
-    Map POS tag to specific value and explanation
-    
-    Args:
-        pos_tag: Original POS tag from spaCy or VnCoreNLP
-        language: Language code ("en" or "vi")
-    
-    Returns:
-        Tuple of (specific_pos_tag, explanation)
-    """
+# Explanations of the raw VnCoreNLP tag set, as returned by the Vietnamese analysis endpoints
+VNCORENLP_POS_EXPLANATIONS = {
+    "N": "Noun",
+    "Np": "Proper noun",
+    "Nc": "Noun classifier",
+    "Nu": "Unit noun",
+    "V": "Verb",
+    "A": "Adjective",
+    "P": "Pronoun",
+    "R": "Adverb",
+    "L": "Determiner",
+    "M": "Numeral",
+    "E": "Preposition",
+    "C": "Conjunction",
+    "I": "Interjection",
+    "T": "Auxiliary",
+    "Y": "Abbreviation",
+    "S": "Subordinating conjunction",
+    "X": "Unknown",
+    "CH": "Punctuation"
+}
+
+VNCORENLP_NER_EXPLANATIONS = {
+    "PER": "Person",
+    "LOC": "Location",
+    "ORG": "Organization",
+    "MISC": "Miscellaneous"
+}
+
+def _compute_pos_tag(pos_tag: str, language: str) -> Tuple[str, str]:
     if language == "en":
         # First map from spaCy to our EN POS tags
         mapped_pos = SPACY_TO_EN_POS.get(pos_tag, pos_tag)
@@ -204,6 +228,64 @@ def map_pos_tag(pos_tag: str, language: str = "en") -> tuple[str, str]:
     else:
         return pos_tag, f"Unknown language: {language}"
 
+def _compute_ner_label(ner_label: str, language: str) -> Tuple[str, str]:
+    if language == "en":
+        # First map from spaCy to our EN NER labels
+        mapped_ner = SPACY_TO_EN_NER.get(ner_label, "O")
+        explanation = EN_NER_MAPPING.get(mapped_ner, f"Unknown NER label: {mapped_ner}")
+        return mapped_ner, explanation
+    elif language == "vi":
+        explanation = VN_NER_MAPPING.get(ner_label, f"Unknown NER label: {ner_label}")
+        return ner_label, explanation
+    else:
+        return ner_label, f"Unknown language: {language}"
+
+def _compile(compute, language: str, tags) -> Dict[str, Tuple[str, str]]:
+    """Precompute compute(tag, language) for every tag, with interned strings"""
+    table = {}
+    for tag in tags:
+        specific, explanation = compute(tag, language)
+        table[sys.intern(tag)] = (sys.intern(specific), sys.intern(explanation))
+    return table
+
+# Every tag the mapping tables know about, as input to map_pos_tag / map_ner_label
+_POS_TABLES = {
+    "en": _compile(_compute_pos_tag, "en", {**SPACY_TO_EN_POS, **EN_POS_MAPPING}),
+    "vi": _compile(_compute_pos_tag, "vi", {**VNCORENLP_TO_SPECIFIC, **VN_POS_MAPPING}),
+}
+_NER_TABLES = {
+    "en": _compile(_compute_ner_label, "en", {**SPACY_TO_EN_NER, **EN_NER_MAPPING}),
+    "vi": _compile(_compute_ner_label, "vi", VN_NER_MAPPING),
+}
+
+def explain_vncorenlp_pos(pos_tag: str) -> str:
+    """Explanation of a raw VnCoreNLP POS tag"""
+    explanation = VNCORENLP_POS_EXPLANATIONS.get(pos_tag)
+    return explanation if explanation is not None else f"Unknown POS tag: {pos_tag}"
+
+def explain_vncorenlp_ner(ner_label: str) -> str:
+    """Explanation of a raw VnCoreNLP NER label (without B-/I- prefix)"""
+    explanation = VNCORENLP_NER_EXPLANATIONS.get(ner_label)
+    return explanation if explanation is not None else f"Unknown NER label: {ner_label}"
+
+def map_pos_tag(pos_tag: str, language: str = "en") -> tuple[str, str]:
+    """
+    Map POS tag to specific value and explanation
+    
+    Args:
+        pos_tag: Original POS tag from spaCy or VnCoreNLP
+        language: Language code ("en" or "vi")
+    
+    Returns:
+        Tuple of (specific_pos_tag, explanation)
+    """
+    table = _POS_TABLES.get(language)
+    if table is not None:
+        result = table.get(pos_tag)
+        if result is not None:
+            return result
+    return _compute_pos_tag(pos_tag, language)
+
 def map_ner_label(ner_label: str, language: str = "en") -> tuple[str, str]:
     """
     Map NER label to specific value and explanation
@@ -215,16 +297,12 @@ def map_ner_label(ner_label: str, language: str = "en") -> tuple[str, str]:
     Returns:
         Tuple of (specific_ner_label, explanation)
     """
-    if language == "en":
-        # First map from spaCy to our EN NER labels
-        mapped_ner = SPACY_TO_EN_NER.get(ner_label, "O")
-        explanation = EN_NER_MAPPING.get(mapped_ner, f"Unknown NER label: {mapped_ner}")
-        return mapped_ner, explanation
-    elif language == "vi":
-        explanation = VN_NER_MAPPING.get(ner_label, f"Unknown NER label: {ner_label}")
-        return ner_label, explanation
-    else:
-        return ner_label, f"Unknown language: {language}"
+    table = _NER_TABLES.get(language)
+    if table is not None:
+        result = table.get(ner_label)
+        if result is not None:
+            return result
+    return _compute_ner_label(ner_label, language)
 
 def get_all_pos_tags(language: str = "en") -> dict[str, str]:
     """
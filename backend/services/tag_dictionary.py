@@ -0,0 +1,225 @@
+"""
+Integer keys for the tag and language pair values of master_row_words.
+
+Rows store `pos`, `ner`, `semantic` and `lang_pair` only as small integer keys
+into the `tags` / `lang_pairs` tables. Writers keep passing the values:
+`with_ids` turns them into keys. The model reads them back through the
+dictionary tables, and filters compare the keys.
+
+Ids never change once created, so they are cached for the life of the process.
+New values are inserted on a separate connection that commits at once, so a
+cached id always refers to a committed row even if the caller rolls back.
+
+`lang_pair_id` is the partition key of master_row_words and is never NULL: rows
+without a language pair get the id of the unassigned pair (code ""), and a new
+language pair gets its partition in the same transaction as its lang_pairs row.
+If the partition cannot be created (the parent stays locked), the pair is kept
+as pending and its partition is tried again on later lookups.
+"""
+import threading
+import time
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Tuple
+
+from sqlalchemy import distinct, func, literal, select
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.orm import Session, aliased
+
+from models.lang_pair import LangPair
+from models.master_row_word import MasterRowWord
+from models.tag import Tag
+from .master_row_word_partitions import create_partition, missing_partitions
+
+# Tag type -> id column of master_row_words
+TAG_ID_COLUMNS = {"pos": "pos_id", "ner": "ner_id", "semantic": "semantic_id"}
+TAG_TYPES = tuple(TAG_ID_COLUMNS)
+
+UNASSIGNED_LANG_PAIR = ""
+
+# Seconds before the partition of a pair is tried again after create_partition gave up
+PARTITION_RETRY_INTERVAL = 60
+
+def _key(value: Any) -> Optional[str]:
+    """Tag value of a field; only NULL has no tag"""
+    return None if value is None else str(value)
+
+def _lang_pair_code(value: Any) -> str:
+    """NULL and blank codes are the unassigned pair"""
+    value = _key(value)
+    return value if value and value.strip() else UNASSIGNED_LANG_PAIR
+
+class TagDictionary:
+    def __init__(self):
+        self._tags: Dict[Tuple[str, str], int] = {}
+        self._lang_pairs: Dict[str, int] = {}
+        # lang_pair_id -> time of the last failed attempt to create its partition
+        self._pending_partitions: Dict[int, float] = {}
+        self._lock = threading.Lock()
+
+    # ---------- Resolve ids -------------------------------------------------
+    def tag_ids(self, db: Session, tag_type: str, values: Iterable[Any]) -> Dict[str, int]:
+        """value -> id for every value that is not NULL, creating missing tags"""
+        keys = {k for k in map(_key, values) if k is not None}
+        missing = [k for k in keys if (tag_type, k) not in self._tags]
+        if missing:
+            with db.get_bind().begin() as conn:
+                conn.execute(
+                    pg_insert(Tag).values([{"tag_type": tag_type, "value": k} for k in missing])
+                    .on_conflict_do_nothing(constraint="uq_tags_tag_type_value")
+                )
+                rows = conn.execute(
+                    select(Tag.value, Tag.id).where(Tag.tag_type == tag_type, Tag.value.in_(missing))
+                ).all()
+            with self._lock:
+                for value, tag_id in rows:
+                    self._tags[(tag_type, value)] = tag_id
+        return {k: self._tags[(tag_type, k)] for k in keys}
+
+    def lang_pair_ids(self, db: Session, codes: Iterable[Any]) -> Dict[str, int]:
+        """code -> id for every language pair code (empty = unassigned), creating missing ones"""
+        keys = set(map(_lang_pair_code, codes))
+        missing = [k for k in keys if k not in self._lang_pairs]
+        retry = self._partitions_to_retry(keys)
+        if missing or retry:
+            rows = []
+            with db.get_bind().begin() as conn:
+                if missing:
+                    conn.execute(
+                        pg_insert(LangPair).values([{"code": k} for k in missing])
+                        .on_conflict_do_nothing(index_elements=["code"])
+                    )
+                    rows = conn.execute(select(LangPair.code, LangPair.id).where(LangPair.code.in_(missing))).all()
+                # Pairs seen for the first time are checked too: an earlier process may have failed to create theirs
+                for lang_pair_id in missing_partitions(conn, [*retry, *(i for _, i in rows)]):
+                    created = create_partition(conn, lang_pair_id)
+                    with self._lock:
+                        if created:
+                            self._pending_partitions.pop(lang_pair_id, None)
+                        else:
+                            self._pending_partitions[lang_pair_id] = time.monotonic()
+            self._remember_lang_pairs(rows)
+        return {k: self._lang_pairs[k] for k in keys}
+
+    def _partitions_to_retry(self, keys: Iterable[str]) -> List[int]:
+        """Cached pairs among `keys` whose partition could not be created, once PARTITION_RETRY_INTERVAL has passed"""
+        if not self._pending_partitions:
+            return []
+        now = time.monotonic()
+        with self._lock:
+            return [
+                self._lang_pairs[k] for k in keys
+                if k in self._lang_pairs
+                and now - self._pending_partitions.get(self._lang_pairs[k], now) >= PARTITION_RETRY_INTERVAL
+            ]
+
+    def lang_pair_id(self, db: Session, code: Optional[str]) -> int:
+        code = _lang_pair_code(code)
+        return self.lang_pair_ids(db, [code])[code]
+
+    def known_lang_pair_ids(self, db: Session, codes: Iterable[str]) -> List[int]:
+        """Ids of the given codes that exist (nothing is created)"""
+        keys = set(map(_lang_pair_code, codes))
+        missing = [k for k in keys if k not in self._lang_pairs]
+        if missing:
+            self._remember_lang_pairs(
+                db.execute(select(LangPair.code, LangPair.id).where(LangPair.code.in_(missing))).all()
+            )
+        return sorted(self._lang_pairs[k] for k in keys if k in self._lang_pairs)
+
+    def _remember_lang_pairs(self, rows) -> None:
+        with self._lock:
+            for code, lang_pair_id in rows:
+                self._lang_pairs[code] = lang_pair_id
+
+    def with_ids(self, db: Session, items: Sequence[Dict[str, Any]], *, insert: bool = False) -> List[Dict[str, Any]]:
+        """Replace pos / ner / semantic / lang_pair of row mappings by pos_id / ner_id / semantic_id / lang_pair_id.
+
+        Only the fields present in a mapping are replaced, so partial updates keep
+        the other ids untouched; with `insert`, a mapping without `lang_pair`
+        gets the unassigned pair. All values of the batch are resolved together.
+        """
+        if insert:
+            items = [item if "lang_pair" in item else {**item, "lang_pair": None} for item in items]
+        ids = {
+            tag_type: self.tag_ids(db, tag_type, (item[tag_type] for item in items if tag_type in item))
+            for tag_type in TAG_TYPES
+        }
+        lang_pairs = self.lang_pair_ids(db, (item["lang_pair"] for item in items if "lang_pair" in item))
+
+        result = []
+        for item in items:
+            item = dict(item)
+            for tag_type, column in TAG_ID_COLUMNS.items():
+                if tag_type in item:
+                    value = _key(item.pop(tag_type))
+                    item.setdefault(column, None if value is None else ids[tag_type][value])
+            if "lang_pair" in item:
+                item.setdefault("lang_pair_id", lang_pairs[_lang_pair_code(item.pop("lang_pair"))])
+            result.append(item)
+        return result
+
+    def create_tags_from(self, db: Session, source) -> None:
+        """Set-based: create the tags used by `source`, a subquery with pos / ner / semantic columns (no commit).
+
+        Used before INSERT ... SELECT copies, whose rows then look their ids up with `tag_id`.
+        """
+        for tag_type in TAG_TYPES:
+            values = select(literal(tag_type), source.c[tag_type]).where(source.c[tag_type].isnot(None)).distinct()
+            db.execute(
+                pg_insert(Tag).from_select(["tag_type", "value"], values)
+                .on_conflict_do_nothing(constraint="uq_tags_tag_type_value")
+            )
+
+    @staticmethod
+    def tag_id(tag_type: str, value):
+        """Id of the tag `value` as a scalar subquery (NULL for a NULL value)"""
+        return select(Tag.id).where(Tag.tag_type == tag_type, Tag.value == value).scalar_subquery()
+
+    # ---------- Reads -------------------------------------------------------
+    @staticmethod
+    def select_values(columns: Sequence[str]):
+        """SELECT of master_row_words columns by name, with the tag and pair values joined in.
+
+        For reads of many rows: one join per dictionary table instead of the
+        model's lookup on every row. Columns are labelled with their names.
+        """
+        source = MasterRowWord.__table__
+        selected = []
+        for name in columns:
+            if name in TAG_ID_COLUMNS:
+                tag = aliased(Tag, name=f"{name}_tag")
+                source = source.outerjoin(tag, tag.id == getattr(MasterRowWord, TAG_ID_COLUMNS[name]))
+                selected.append(tag.value.label(name))
+            elif name == "lang_pair":
+                source = source.join(LangPair, LangPair.id == MasterRowWord.lang_pair_id)
+                selected.append(LangPair.code.label(name))
+            else:
+                selected.append(getattr(MasterRowWord, name).label(name))
+        return select(*selected).select_from(source)
+
+    @staticmethod
+    def values_in_use(db: Session, tag_type: str, *conditions: Any) -> List[str]:
+        """Sorted non-blank values of a tag type used by the rows matching `conditions`"""
+        column = getattr(MasterRowWord, TAG_ID_COLUMNS[tag_type])
+        used = select(distinct(column)).where(column.isnot(None), *conditions)
+        values = db.execute(select(Tag.value).where(Tag.id.in_(used))).scalars()
+        return sorted(v for v in values if v.strip() != "")
+
+    # ---------- Filters -----------------------------------------------------
+    @staticmethod
+    def tag_filter(tag_type: str, tag_value: str):
+        """Case-insensitive tag filter on the integer column (None for an unknown tag_type)"""
+        column = TAG_ID_COLUMNS.get(tag_type)
+        if column is None:
+            return None
+        matching = select(Tag.id).where(Tag.tag_type == tag_type, func.lower(Tag.value) == tag_value.lower())
+        return getattr(MasterRowWord, column).in_(matching)
+
+    def lang_pair_filter(self, db: Session, codes: Sequence[str]):
+        """Rows whose language pair is one of `codes`.
+
+        The ids are resolved here and compared as constants, so the planner can
+        prune master_row_words to those pairs' partitions.
+        """
+        return MasterRowWord.lang_pair_id.in_(self.known_lang_pair_ids(db, codes))
+
+tag_dictionary = TagDictionary()
@@ -4,23 +4,146 @@ Provides word segmentation, POS tagging, NER, and dependency parsing for Vietnam
 """
 
 import os
+import re
+import json
+import hashlib
 import logging
+import threading
+from collections import OrderedDict
 from typing import List, Dict, Any, Optional
 import py_vncorenlp
-from .pos_ner_mapping import map_pos_tag, map_ner_label
+from .pos_ner_mapping import map_pos_tag, map_ner_label, explain_vncorenlp_pos, explain_vncorenlp_ner
+from .vncorenlp_pool import VnCoreNLPPool
 
 logger = logging.getLogger(__name__)
 
+_NON_CONTENT = re.compile(r"[\s_]")
+
+def _content_length(text: str) -> int:
+    """Number of characters that survive segmentation (whitespace and '_' excluded)."""
+    return len(_NON_CONTENT.sub("", text))
+
+class AnnotationCache:
+    """
+    Content-hash keyed cache of VnCoreNLP annotations.
+    
+    An in-memory LRU tier holds up to `max_entries` texts; when `disk_dir` is set,
+    annotations are also written there as JSON files and survive restarts.
+    Cached sentences are shared between callers and must not be mutated.
+    """
+    
+    def __init__(self, max_entries: int = 1024, disk_dir: Optional[str] = None):
+        self.max_entries = max(0, max_entries)
+        self.disk_dir = disk_dir
+        self._entries: "OrderedDict[str, List[List[Dict[str, Any]]]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        if disk_dir:
+            os.makedirs(disk_dir, exist_ok=True)
+    
+    @staticmethod
+    def key(text: str) -> str:
+        return hashlib.sha1(text.encode("utf-8")).hexdigest()
+    
+    def get(self, text: str) -> Optional[List[List[Dict[str, Any]]]]:
+        key = self.key(text)
+        with self._lock:
+            sentences = self._entries.get(key)
+            if sentences is not None:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return sentences
+        sentences = self._read_disk(key)
+        with self._lock:
+            if sentences is None:
+                self.misses += 1
+                return None
+            self.hits += 1
+            self._remember(key, sentences)
+        return sentences
+    
+    def put(self, text: str, sentences: List[List[Dict[str, Any]]]) -> None:
+        key = self.key(text)
+        with self._lock:
+            self._remember(key, sentences)
+        self._write_disk(key, sentences)
+    
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "entries": len(self._entries),
+                "max_entries": self.max_entries,
+                "hits": self.hits,
+                "misses": self.misses,
+                "disk_dir": self.disk_dir,
+            }
+    
+    def _remember(self, key: str, sentences: List[List[Dict[str, Any]]]) -> None:
+        if not self.max_entries:
+            return
+        self._entries[key] = sentences
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+    
+    def _disk_path(self, key: str) -> str:
+        return os.path.join(self.disk_dir, key[:2], f"{key}.json")
+    
+    def _read_disk(self, key: str) -> Optional[List[List[Dict[str, Any]]]]:
+        if not self.disk_dir:
+            return None
+        try:
+            with open(self._disk_path(key), encoding="utf-8") as f:
+                return json.load(f)
+        except FileNotFoundError:
+            return None
+        except (OSError, ValueError) as e:
+            logger.warning(f"Ignoring unreadable annotation cache entry {key}: {str(e)}")
+            return None
+    
+    def _write_disk(self, key: str, sentences: List[List[Dict[str, Any]]]) -> None:
+        if not self.disk_dir:
+            return
+        path = self._disk_path(key)
+        tmp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        try:
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                json.dump(sentences, f, ensure_ascii=False)
+            os.replace(tmp_path, path)
+        except OSError as e:
+            logger.warning(f"Could not write annotation cache entry {key}: {str(e)}")
+
 class VietnameseNLPService:
-    def __init__(self, model_dir: str = "/app/vncorenlp"):
+    def __init__(
+        self,
+        model_dir: str = "/app/vncorenlp",
+        cache: Optional[AnnotationCache] = None,
+        workers: Optional[int] = None,
+    ):
         """
         Initialize Vietnamese NLP service with VnCoreNLP
         
         Args:
             model_dir: Directory where VnCoreNLP models are stored
+            cache: Annotation cache; by default sized by VNCORENLP_CACHE_SIZE (entries)
+                with an optional disk tier in VNCORENLP_CACHE_DIR
+            workers: Number of VnCoreNLP worker processes (VNCORENLP_WORKERS by default).
+                0 annotates in this process, one call at a time
         """
         self.model_dir = model_dir
         self.rdrsegmenter = None
+        self.pool: Optional[VnCoreNLPPool] = None
+        self.workers = workers if workers is not None else int(os.getenv("VNCORENLP_WORKERS", "0"))
+        # The in-process JVM annotator is not safe to call from several threads at once
+        self._annotator_lock = threading.Lock()
+        if cache is None:
+            cache = AnnotationCache(
+                max_entries=int(os.getenv("VNCORENLP_CACHE_SIZE", "1024")),
+                disk_dir=os.getenv("VNCORENLP_CACHE_DIR") or None,
+            )
+        self.cache = cache
         self._initialize_model()
     
     def _initialize_model(self):
@@ -34,17 +157,33 @@ class VietnameseNLPService:
                 logger.info("Downloading VnCoreNLP model...")
                 py_vncorenlp.download_model(save_dir=self.model_dir)
             
-            # Load VnCoreNLP
-            self.rdrsegmenter = py_vncorenlp.VnCoreNLP(save_dir=self.model_dir)
+            if self.workers > 0:
+                # Each worker process loads its own VnCoreNLP
+                pool = VnCoreNLPPool(
+                    self.model_dir,
+                    self.workers,
+                    max_queue=int(os.getenv("VNCORENLP_QUEUE_SIZE", str(4 * self.workers))),
+                    timeout=float(os.getenv("VNCORENLP_TIMEOUT", "30")),
+                )
+                try:
+                    pool.start()
+                except Exception:
+                    pool.shutdown()
+                    raise
+                self.pool = pool
+            else:
+                # Load VnCoreNLP
+                self.rdrsegmenter = py_vncorenlp.VnCoreNLP(save_dir=self.model_dir)
             logger.info("Vietnamese NLP model loaded successfully")
             
         except Exception as e:
             logger.error(f"Failed to initialize Vietnamese NLP model: {str(e)}")
             self.rdrsegmenter = None
+            self.pool = None
     
     def is_available(self) -> bool:
         """Check if Vietnamese NLP service is available"""
-        return self.rdrsegmenter is not None
+        return self.rdrsegmenter is not None or self.pool is not None
     
     def word_segmentation(self, text: str) -> List[str]:
         """
@@ -60,10 +199,10 @@ class VietnameseNLPService:
             raise RuntimeError("Vietnamese NLP service not available")
         
         try:
-            annotated_output = self.rdrsegmenter.annotate_text(text)
+            annotated_output = self._annotate(text)
             words = []
             
-            for sentence in annotated_output.values():
+            for sentence in annotated_output:
                 for word_info in sentence:
                     words.append(word_info['wordForm'])
             
@@ -86,17 +225,18 @@ class VietnameseNLPService:
             raise RuntimeError("Vietnamese NLP service not available")
         
         try:
-            annotated_output = self.rdrsegmenter.annotate_text(text)
+            annotated_output = self._annotate(text)
             pos_tags = []
             
-            for sentence in annotated_output.values():
+            for sentence in annotated_output:
                 for word_info in sentence:
+                    explanation = explain_vncorenlp_pos(word_info['posTag'])
                     pos_tags.append({
                         "text": word_info['wordForm'],
                         "pos": word_info['posTag'],
-                        "pos_explanation": self._get_pos_explanation(word_info['posTag']),
+                        "pos_explanation": explanation,
                         "tag": word_info['posTag'],
-                        "tag_explanation": self._get_pos_explanation(word_info['posTag'])
+                        "tag_explanation": explanation
                     })
             
             return pos_tags
@@ -118,13 +258,13 @@ class VietnameseNLPService:
             raise RuntimeError("Vietnamese NLP service not available")
         
         try:
-            annotated_output = self.rdrsegmenter.annotate_text(text)
+            annotated_output = self._annotate(text)
             entities = []
             current_entity = None
             entity_start = 0
             char_offset = 0
             
-            for sentence in annotated_output.values():
+            for sentence in annotated_output:
                 for word_info in sentence:
                     word = word_info['wordForm']
                     ner_tag = word_info['nerLabel']
@@ -139,7 +279,7 @@ class VietnameseNLPService:
                         current_entity = {
                             "text": word,
                             "label": ner_tag[2:],  # Remove B- prefix
-                            "label_explanation": self._get_ner_explanation(ner_tag[2:]),
+                            "label_explanation": explain_vncorenlp_ner(ner_tag[2:]),
                             "start": word_start,
                             "end": word_end
                         }
@@ -181,10 +321,10 @@ class VietnameseNLPService:
             raise RuntimeError("Vietnamese NLP service not available")
         
         try:
-            annotated_output = self.rdrsegmenter.annotate_text(text)
+            annotated_output = self._annotate(text)
             dependencies = []
             
-            for sentence in annotated_output.values():
+            for sentence in annotated_output:
                 sentence_deps = []
                 for word_info in sentence:
                     sentence_deps.append({
@@ -215,120 +355,205 @@ class VietnameseNLPService:
             raise RuntimeError("Vietnamese NLP service not available")
         
         try:
-            annotated_output = self.rdrsegmenter.annotate_text(text)
+            return self._build_full_analysis(text, self._annotate(text))
+        except Exception as e:
+            logger.error(f"Error in full analysis: {str(e)}")
+            raise
+    
+    def full_analysis_batch(self, texts: List[str], batch_size: int = 32) -> List[Dict[str, Any]]:
+        """
+        Perform complete analysis on many texts, annotating each batch in one JVM call
+        
+        Args:
+            texts: Input Vietnamese texts
+            batch_size: Number of texts sent to VnCoreNLP per call
             
-            # Process sentences
-            sentences = []
-            all_tokens = []
-            entities = []
-            char_offset = 0
+        Returns:
+            List of analysis results, in the same order as `texts`
+        """
+        if not self.is_available():
+            raise RuntimeError("Vietnamese NLP service not available")
+        
+        try:
+            annotated = self.annotate_batch(texts, batch_size)
+            return [self._build_full_analysis(text, sentences) for text, sentences in zip(texts, annotated)]
+        except Exception as e:
+            logger.error(f"Error in batch analysis: {str(e)}")
+            raise
+    
+    def annotate_batch(self, texts: List[str], batch_size: int = 32) -> List[List[List[Dict[str, Any]]]]:
+        """
+        Annotate many texts with one `annotate_text` call per batch
+        
+        Texts already in the annotation cache are not sent to VnCoreNLP again, and
+        repeated texts are annotated once. The remaining texts of a batch are joined
+        with newlines and the annotated sentences are assigned back to their source
+        text by counting characters. If the counts do not line up (e.g. VnCoreNLP
+        merged two texts into one sentence) the batch is annotated text by text
+        instead, so results are always in input order.
+        
+        Returns:
+            For each text, its list of annotated sentences
+        """
+        batch_size = max(1, batch_size)
+        annotations: Dict[str, List[List[Dict[str, Any]]]] = {}
+        missing: List[str] = []
+        for text in dict.fromkeys(texts):
+            cached = self.cache.get(text)
+            if cached is None:
+                missing.append(text)
+            else:
+                annotations[text] = cached
+        
+        annotatable = []
+        for text in missing:
+            if _content_length(text):
+                annotatable.append(text)
+            else:
+                annotations[text] = []
+        
+        chunks = [annotatable[start:start + batch_size] for start in range(0, len(annotatable), batch_size)]
+        joined = ["\n".join(" ".join(t.split()) for t in chunk) for chunk in chunks]
+        retry: List[str] = []
+        for chunk, sentences in zip(chunks, self._run_pipelines(joined)):
+            split = self._split_batch_output(chunk, sentences)
+            if split is None:
+                retry.extend(chunk)
+            else:
+                self._store(chunk, split, annotations)
+        if retry:
+            logger.warning("VnCoreNLP batch boundaries did not match input, annotating texts one by one")
+            self._store(retry, self._run_pipelines(retry), annotations)
+        return [annotations[text] for text in texts]
+    
+    def _store(
+        self,
+        texts: List[str],
+        annotated: List[List[List[Dict[str, Any]]]],
+        annotations: Dict[str, List[List[Dict[str, Any]]]],
+    ) -> None:
+        for text, sentences in zip(texts, annotated):
+            self.cache.put(text, sentences)
+            annotations[text] = sentences
+    
+    def _annotate(self, text: str) -> List[List[Dict[str, Any]]]:
+        """Annotated sentences of `text`, reusing a cached annotation when the same text was seen before"""
+        sentences = self.cache.get(text)
+        if sentences is None:
+            sentences = self._run_pipeline(text)
+            self.cache.put(text, sentences)
+        return sentences
+    
+    def _run_pipeline(self, text: str) -> List[List[Dict[str, Any]]]:
+        """Run the VnCoreNLP pipeline and return its sentences in order"""
+        if self.pool is not None:
+            return self.pool.annotate(text)
+        with self._annotator_lock:
+            return list(self.rdrsegmenter.annotate_text(text).values())
+    
+    def _run_pipelines(self, texts: List[str]) -> List[List[List[Dict[str, Any]]]]:
+        """Run the pipeline on several texts, in parallel when a worker pool is configured"""
+        if self.pool is not None:
+            return self.pool.annotate_many(texts)
+        return [self._run_pipeline(text) for text in texts]
+    
+    @staticmethod
+    def _split_batch_output(
+        texts: List[str], sentences: List[List[Dict[str, Any]]]
+    ) -> Optional[List[List[List[Dict[str, Any]]]]]:
+        """Assign annotated sentences to the texts they came from, or None on mismatch"""
+        results = []
+        pos = 0
+        for text in texts:
+            remaining = _content_length(text)
+            own = []
+            while remaining > 0:
+                if pos >= len(sentences):
+                    return None
+                sentence = sentences[pos]
+                pos += 1
+                remaining -= sum(_content_length(w['wordForm']) for w in sentence)
+                own.append(sentence)
+            if remaining != 0:
+                return None
+            results.append(own)
+        if pos != len(sentences):
+            return None
+        return results
+    
+    def _build_full_analysis(self, text: str, annotated_output: List[List[Dict[str, Any]]]) -> Dict[str, Any]:
+        """Turn annotated sentences into the full analysis response structure"""
+        # Process sentences
+        sentences = []
+        all_tokens = []
+        entities = []
+        char_offset = 0
+        
+        for sentence in annotated_output:
+            sentence_tokens = []
+            current_entity = None
             
-            for sentence in annotated_output.values():
-                sentence_tokens = []
-                current_entity = None
+            for word_info in sentence:
+                word = word_info['wordForm']
+                word_start = char_offset
+                word_end = char_offset + len(word)
                 
-                for word_info in sentence:
-                    word = word_info['wordForm']
-                    word_start = char_offset
-                    word_end = char_offset + len(word)
+                # Map POS tag to specific value
+                specific_pos, pos_explanation = map_pos_tag(word_info['posTag'], "vi")
+                
+                token_info = {
+                    "text": word,
+                    "pos": specific_pos,
+                    "pos_explanation": pos_explanation,
+                    "lemma": word,  # VnCoreNLP doesn't provide lemmatization
+                    "dep": word_info['depLabel'],
+                    "head": word_info['head'],
+                    "index": word_info['index']
+                }
+                
+                sentence_tokens.append(token_info)
+                all_tokens.append(token_info)
+                
+                # Process NER
+                ner_tag = word_info['nerLabel']
+                if ner_tag.startswith('B-'):
+                    if current_entity:
+                        entities.append(current_entity)
                     
-                    # Map POS tag to specific value
-                    specific_pos, pos_explanation = map_pos_tag(word_info['posTag'], "vi")
+                    # Map NER label to specific value
+                    specific_ner, ner_explanation = map_ner_label(ner_tag[2:], "vi")
                     
-                    token_info = {
+                    current_entity = {
                         "text": word,
-                        "pos": specific_pos,
-                        "pos_explanation": pos_explanation,
-                        "lemma": word,  # VnCoreNLP doesn't provide lemmatization
-                        "dep": word_info['depLabel'],
-                        "head": word_info['head'],
-                        "index": word_info['index']
+                        "label": specific_ner,
+                        "label_explanation": ner_explanation,
+                        "start": word_start,
+                        "end": word_end
                     }
-                    
-                    sentence_tokens.append(token_info)
-                    all_tokens.append(token_info)
-                    
-                    # Process NER
-                    ner_tag = word_info['nerLabel']
-                    if ner_tag.startswith('B-'):
-                        if current_entity:
-                            entities.append(current_entity)
-                        
-                        # Map NER label to specific value
-                        specific_ner, ner_explanation = map_ner_label(ner_tag[2:], "vi")
-                        
-                        current_entity = {
-                            "text": word,
-                            "label": specific_ner,
-                            "label_explanation": ner_explanation,
-                            "start": word_start,
-                            "end": word_end
-                        }
-                    elif ner_tag.startswith('I-') and current_entity and current_entity["label"] == ner_tag[2:]:
-                        current_entity["text"] += " " + word
-                        current_entity["end"] = word_end
-                    else:
-                        if current_entity:
-                            entities.append(current_entity)
-                            current_entity = None
-                    
-                    char_offset = word_end + 1
-                
-                if current_entity:
-                    entities.append(current_entity)
-                
-                sentences.append({
-                    "text": " ".join([token["text"] for token in sentence_tokens]),
-                    "tokens": sentence_tokens
-                })
+                elif ner_tag.startswith('I-') and current_entity and current_entity["label"] == ner_tag[2:]:
+                    current_entity["text"] += " " + word
+                    current_entity["end"] = word_end
+                else:
+                    if current_entity:
+                        entities.append(current_entity)
+                        current_entity = None
                 
-                char_offset += 1  # Sentence separator
+                char_offset = word_end + 1
             
-            return {
-                "original_text": text,
-                "sentences": sentences,
-                "entities": entities,
-                "token_count": len(all_tokens),
-                "sentence_count": len(sentences)
-            }
+            if current_entity:
+                entities.append(current_entity)
             
-        except Exception as e:
-            logger.error(f"Error in full analysis: {str(e)}")
-            raise
-    
-    def _get_pos_explanation(self, pos_tag: str) -> str:
-        """Get explanation for POS tag"""
-        pos_explanations = {
-            "N": "Noun",
-            "Np": "Proper noun",
-            "Nc": "Noun classifier",
-            "Nu": "Unit noun",
-            "V": "Verb",
-            "A": "Adjective",
-            "P": "Pronoun",
-            "R": "Adverb",
-            "L": "Determiner",
-            "M": "Numeral",
-            "E": "Preposition",
-            "C": "Conjunction",
-            "I": "Interjection",
-            "T": "Auxiliary",
-            "Y": "Abbreviation",
-            "S": "Subordinating conjunction",
-            "X": "Unknown",
-            "CH": "Punctuation"
-        }
-        return pos_explanations.get(pos_tag, f"Unknown POS tag: {pos_tag}")
-    
-    def _get_ner_explanation(self, ner_label: str) -> str:
-        """Get explanation for NER label"""
-        ner_explanations = {
-            "PER": "Person",
-            "LOC": "Location",
-            "ORG": "Organization",
-            "MISC": "Miscellaneous"
+            sentences.append({
+                "text": " ".join([token["text"] for token in sentence_tokens]),
+                "tokens": sentence_tokens
+            })
+            
+            char_offset += 1  # Sentence separator
+        
+        return {
+            "original_text": text,
+            "sentences": sentences,
+            "entities": entities,
+            "token_count": len(all_tokens),
+            "sentence_count": len(sentences)
         }
-        return ner_explanations.get(ner_label, f"Unknown NER label: {ner_label}")
-
-# Global instance
-vietnamese_nlp_service = VietnameseNLPService()
@@ -0,0 +1,119 @@
+"""
+Chuẩn hóa âm tiết tiếng Việt cho mục đích gõ chữ (kiểu Telex, dấu thanh thành số).
+Quy tắc: sắc=1, huyền=2, hỏi=3, ngã=4, nặng=5
+
+Các bảng ánh xạ được dựng một lần khi import; mỗi âm tiết chỉ cần một lần
+str.translate và kết quả được cache (số âm tiết tiếng Việt chỉ khoảng 7k).
+"""
+import re
+import unicodedata
+from functools import lru_cache
+from typing import Iterable, List, Tuple
+
+# Ký tự có dấu thanh -> (phần gốc, số dấu thanh)
+TONE_MAPPING = {
+    'á': ('a', '1'), 'à': ('a', '2'), 'ả': ('a', '3'), 'ã': ('a', '4'), 'ạ': ('a', '5'),
+    'ắ': ('aw', '1'), 'ằ': ('aw', '2'), 'ẳ': ('aw', '3'), 'ẵ': ('aw', '4'), 'ặ': ('aw', '5'),
+    'ấ': ('aa', '1'), 'ầ': ('aa', '2'), 'ẩ': ('aa', '3'), 'ẫ': ('aa', '4'), 'ậ': ('aa', '5'),
+    'é': ('e', '1'), 'è': ('e', '2'), 'ẻ': ('e', '3'), 'ẽ': ('e', '4'), 'ẹ': ('e', '5'),
+    'ế': ('ee', '1'), 'ề': ('ee', '2'), 'ể': ('ee', '3'), 'ễ': ('ee', '4'), 'ệ': ('ee', '5'),
+    'í': ('i', '1'), 'ì': ('i', '2'), 'ỉ': ('i', '3'), 'ĩ': ('i', '4'), 'ị': ('i', '5'),
+    'ó': ('o', '1'), 'ò': ('o', '2'), 'ỏ': ('o', '3'), 'õ': ('o', '4'), 'ọ': ('o', '5'),
+    'ố': ('oo', '1'), 'ồ': ('oo', '2'), 'ổ': ('oo', '3'), 'ỗ': ('oo', '4'), 'ộ': ('oo', '5'),
+    'ớ': ('ow', '1'), 'ờ': ('ow', '2'), 'ở': ('ow', '3'), 'ỡ': ('ow', '4'), 'ợ': ('ow', '5'),
+    'ú': ('u', '1'), 'ù': ('u', '2'), 'ủ': ('u', '3'), 'ũ': ('u', '4'), 'ụ': ('u', '5'),
+    'ứ': ('uw', '1'), 'ừ': ('uw', '2'), 'ử': ('uw', '3'), 'ữ': ('uw', '4'), 'ự': ('uw', '5'),
+    'ý': ('y', '1'), 'ỳ': ('y', '2'), 'ỷ': ('y', '3'), 'ỹ': ('y', '4'), 'ỵ': ('y', '5'),
+    'đ': ('dd', '')
+}
+
+# Nguyên âm đặc biệt không mang dấu thanh
+VOWEL_MAPPING = {
+    'ă': 'aw', 'â': 'aa', 'ư': 'uw', 'ơ': 'ow', 'ê': 'ee', 'ô': 'oo'
+}
+
+SPECIAL_CASES = {
+    'gì': 'gi2', 'quà': 'qua2', 'quá': 'qua1', 'quả': 'qua3',
+    'quã': 'qua4', 'quạ': 'qua5', 'qua': 'qua',
+    'già': 'gia2', 'giá': 'gia1', 'giả': 'gia3', 'giã': 'gia4', 'giạ': 'gia5',
+}
+
+# Một bảng str.translate thay cả ký tự có dấu thanh lẫn nguyên âm đặc biệt
+_TRANSLATION_TABLE = str.maketrans({
+    **{char: base for char, (base, _) in TONE_MAPPING.items()},
+    **VOWEL_MAPPING,
+})
+_TONE_DIGITS = {char: tone for char, (_, tone) in TONE_MAPPING.items() if tone}
+
+_HAS_LETTER = re.compile(r'[a-zA-ZÀ-ỹ]')
+
+@lru_cache(maxsize=65536)
+def normalize_vietnamese_syllable(word):
+    """
+    Hàm chuẩn hóa âm tiết tiếng Việt cho mục đích gõ chữ.
+    Quy tắc: sắc=1, huyền=2, hỏi=3, ngã=4, nặng=5
+    """
+    if not word:
+        return ""
+
+    # Nếu không phải là từ tiếng Việt (chỉ có ký tự đặc biệt), trả về dấu gạch ngang
+    if not _HAS_LETTER.search(word):
+        return "-"
+
+    lowered = word.lower()
+    if lowered in SPECIAL_CASES:
+        return SPECIAL_CASES[lowered]
+
+    normalized = unicodedata.normalize('NFC', lowered)
+
+    # Nếu có nhiều ký tự mang dấu thanh, dùng dấu thanh cuối cùng
+    tone_number = ''
+    for char in reversed(normalized):
+        if char in _TONE_DIGITS:
+            tone_number = _TONE_DIGITS[char]
+            break
+
+    return normalized.translate(_TRANSLATION_TABLE) + tone_number
+
+def _normalize_token(token: str) -> str:
+    if not _HAS_LETTER.search(token):
+        return "-"
+    return normalize_vietnamese_syllable(token)
+
+@lru_cache(maxsize=65536)
+def _normalize_word(word: str) -> str:
+    if '_' in word:
+        # Xử lý từ ghép có dấu gạch nối
+        return '_'.join(_normalize_token(part) for part in word.split('_'))
+    return _normalize_token(word)
+
+def normalize_vietnamese_text(text):
+    """
+    Chuẩn hóa toàn bộ văn bản tiếng Việt cho mục đích gõ chữ.
+    Giữ nguyên dấu gạch nối trong từ ghép.
+    """
+    return ' '.join(map(_normalize_word, text.split()))
+
+def normalize_vietnamese_texts(texts: Iterable[str]) -> List[str]:
+    """Chuẩn hóa nhiều văn bản; các âm tiết lặp lại được lấy từ cache."""
+    return [normalize_vietnamese_text(text) for text in texts]
+
+@lru_cache(maxsize=65536)
+def remove_vietnamese_accents(text: str) -> str:
+    """
+    Bỏ toàn bộ dấu (thanh và mũ/móc) và chuyển về chữ thường, dùng cho tìm kiếm không dấu.
+    Ví dụ: "Đại_học" -> "dai_hoc"
+    """
+    decomposed = unicodedata.normalize('NFD', text.lower().replace('đ', 'd'))
+    return ''.join(char for char in decomposed if not unicodedata.combining(char))
+
+def word_search_forms(word: str) -> Tuple[str, str]:
+    """
+    Dạng lưu trong cột word_norm (kiểu gõ, ví dụ "bo2") và word_toneless (không dấu, ví dụ "bo")
+    của một từ trong corpus; từ ghép giữ dấu gạch nối.
+    """
+    word = (word or "").strip()
+    if not word:
+        return "", ""
+    key = word.replace(" ", "_")
+    return normalize_vietnamese_text(key), remove_vietnamese_accents(key)
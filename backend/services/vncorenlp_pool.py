@@ -0,0 +1,188 @@
+"""
+Pool of VnCoreNLP worker processes.
+
+VnCoreNLP runs inside a JVM driven through pyjnius, so one annotator instance can
+only serve one call at a time. The pool starts `workers` separate processes, each
+with its own JVM, and hands annotation calls to them through a bounded queue.
+
+A call that times out while running cannot be cancelled: its worker is stuck in
+the JVM and would keep its slot. The pool then kills the worker processes and
+starts fresh ones, so repeated timeouts cannot wedge it.
+"""
+
+import logging
+import multiprocessing
+import threading
+import time
+from collections import deque
+from concurrent.futures import Future, ProcessPoolExecutor
+from concurrent.futures import TimeoutError as FutureTimeoutError
+from concurrent.futures.process import BrokenProcessPool
+from typing import Any, Dict, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+# Annotator of the current worker process, created by the pool initializer
+_worker_annotator = None
+
+
+class PoolSaturatedError(RuntimeError):
+    """Every worker is busy and the pool's queue is full"""
+
+
+class AnnotationTimeoutError(RuntimeError):
+    """A worker did not finish annotating within the pool timeout"""
+
+
+def _init_worker(model_dir: str) -> None:
+    global _worker_annotator
+    import py_vncorenlp
+
+    _worker_annotator = py_vncorenlp.VnCoreNLP(save_dir=model_dir)
+
+
+def _worker_ping() -> bool:
+    return _worker_annotator is not None
+
+
+def _worker_annotate(text: str) -> List[List[Dict[str, Any]]]:
+    return list(_worker_annotator.annotate_text(text).values())
+
+
+class VnCoreNLPPool:
+    def __init__(self, model_dir: str, workers: int, max_queue: Optional[int] = None, timeout: float = 30.0):
+        """
+        Args:
+            model_dir: Directory where VnCoreNLP models are stored (must already contain the model)
+            workers: Number of worker processes (one JVM each)
+            max_queue: Calls allowed to wait for a free worker before new calls are rejected;
+                defaults to 4 per worker
+            timeout: Seconds a caller waits for one annotation call
+        """
+        self.model_dir = model_dir
+        self.workers = max(1, workers)
+        self.max_queue = max_queue if max_queue is not None else 4 * self.workers
+        self.timeout = timeout
+        self._slots = threading.BoundedSemaphore(self.workers + self.max_queue)
+        self._executor: Optional[ProcessPoolExecutor] = None
+        self._recycle_lock = threading.Lock()
+        self._in_flight_lock = threading.Lock()
+        self._in_flight = 0
+        self.recycles = 0
+
+    def _new_executor(self) -> ProcessPoolExecutor:
+        # The JVM does not survive fork, so workers are always spawned fresh
+        return ProcessPoolExecutor(
+            max_workers=self.workers,
+            mp_context=multiprocessing.get_context("spawn"),
+            initializer=_init_worker,
+            initargs=(self.model_dir,),
+        )
+
+    def start(self) -> None:
+        """Start the worker processes and wait until each has loaded its annotator"""
+        self._executor = self._new_executor()
+        pings = [self._executor.submit(_worker_ping) for _ in range(self.workers)]
+        for ping in pings:
+            ping.result()
+        logger.info(f"VnCoreNLP pool started with {self.workers} workers")
+
+    def _recycle(self, executor: ProcessPoolExecutor) -> None:
+        """Replace `executor` by fresh workers and kill its processes, unless that was already done"""
+        with self._recycle_lock:
+            if self._executor is not executor:
+                return
+            self._executor = self._new_executor()
+            self.recycles += 1
+        logger.warning("VnCoreNLP call timed out while running, restarting the worker processes")
+        # ProcessPoolExecutor cannot stop a running call; killing its processes fails
+        # every call still on it (BrokenProcessPool), which also frees their slots
+        kill_workers = getattr(executor, "kill_workers", None)
+        if kill_workers is not None:
+            kill_workers()
+            return
+        # Before Python 3.14 there is no public way to stop the workers, so fall back
+        # to the executor's private process map; skip it if that ever goes away
+        for process in list((getattr(executor, "_processes", None) or {}).values()):
+            process.kill()
+        executor.shutdown(wait=False, cancel_futures=True)
+
+    def shutdown(self) -> None:
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
+
+    def annotate(self, text: str) -> List[List[Dict[str, Any]]]:
+        """Annotate one text on a worker"""
+        return self._wait(*self._submit(text), time.monotonic() + self.timeout)
+
+    def annotate_many(self, texts: List[str]) -> List[List[List[Dict[str, Any]]]]:
+        """
+        Annotate several texts in parallel across the workers, results in input order.
+        
+        At most `workers` texts of one call are in flight at a time, so a large batch
+        does not crowd out other requests. Only the first text can be rejected as
+        saturated; later texts wait for a free slot for up to the pool timeout.
+        """
+        results = []
+        pending = deque()
+        try:
+            for text in texts:
+                if len(pending) >= self.workers:
+                    results.append(self._wait(*pending.popleft()))
+                future, executor = self._submit(text, block=bool(results or pending))
+                pending.append((future, executor, time.monotonic() + self.timeout))
+            while pending:
+                results.append(self._wait(*pending.popleft()))
+        except Exception:
+            for future, _, _ in pending:
+                future.cancel()
+            raise
+        return results
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "workers": self.workers,
+            "max_queue": self.max_queue,
+            "timeout": self.timeout,
+            "in_flight": self._in_flight,
+            "recycles": self.recycles,
+        }
+
+    def _submit(self, text: str, block: bool = False) -> Tuple[Future, ProcessPoolExecutor]:
+        """Queue `text` on the current workers; returns the future and the executor it runs on"""
+        executor = self._executor
+        if executor is None:
+            raise RuntimeError("VnCoreNLP pool is not started")
+        acquired = self._slots.acquire(timeout=self.timeout) if block else self._slots.acquire(blocking=False)
+        if not acquired:
+            raise PoolSaturatedError(
+                f"All {self.workers} VnCoreNLP workers are busy and {self.max_queue} calls are queued"
+            )
+        try:
+            future = executor.submit(_worker_annotate, text)
+        except Exception:
+            self._slots.release()
+            raise
+        with self._in_flight_lock:
+            self._in_flight += 1
+        # The slot is freed when the worker is done, not when the caller gives up,
+        # so timed-out calls still count against the queue until they finish
+        future.add_done_callback(self._release)
+        return future, executor
+
+    def _release(self, _: Future) -> None:
+        with self._in_flight_lock:
+            self._in_flight -= 1
+        self._slots.release()
+
+    def _wait(self, future: Future, executor: ProcessPoolExecutor, deadline: float) -> List[List[Dict[str, Any]]]:
+        try:
+            return future.result(timeout=max(0.0, deadline - time.monotonic()))
+        except FutureTimeoutError:
+            if not future.cancel():
+                # Already running: the worker is stuck and keeps its slot until it is killed
+                self._recycle(executor)
+            raise AnnotationTimeoutError(f"VnCoreNLP annotation did not finish within {self.timeout}s")
+        except BrokenProcessPool:
+            raise AnnotationTimeoutError("VnCoreNLP workers were restarted after another call timed out")
@@ -0,0 +1,77 @@
+#!/usr/bin/env python3
+"""
+Benchmark: deleting master_row_words with the old ORM loop (load every row, then
+db.delete one at a time) against the batched set-based MasterRowWordService deletes.
+
+Needs the database from .env; rows are written to a scratch language pair, which is
+dropped afterwards together with its partition.
+
+    python tests/benchmark_master_row_word_delete.py [rows]
+"""
+import sys
+import os
+import time
+
+# Add parent directory to path to import modules
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from sqlalchemy import delete, select, text
+
+from database import SessionLocal
+from models.lang_pair import LangPair
+from models.master_row_word import MasterRowWord
+from services.master_row_word_partitions import partition_name
+from services.master_row_word_service import MasterRowWordService
+from services.tag_dictionary import tag_dictionary
+
+LANG_PAIR = "bench_delete"
+WORDS_PER_SENTENCE = 20
+
+service = MasterRowWordService(MasterRowWord)
+
+def load(db, rows: int):
+    """Insert `rows` scratch rows; returns their id_sen values"""
+    id_sens = [f"B{n:07d}" for n in range((rows + WORDS_PER_SENTENCE - 1) // WORDS_PER_SENTENCE)]
+    service.bulk_create(db, (
+        dict(id_string=f"{id_sen}{pos:02d}", id_sen=id_sen, word=f"w{pos}", pos="NN", ner="O",
+             links="-", lang_code="xx", lang_pair=LANG_PAIR)
+        for id_sen in id_sens for pos in range(1, WORDS_PER_SENTENCE + 1)
+    ), chunk_size=5000)
+    return id_sens
+
+def drop_lang_pair(db) -> None:
+    """Remove the scratch language pair: its rows, its partition and its lang_pairs row"""
+    service.delete_all_fast(db, lang_pair=LANG_PAIR)
+    for lang_pair_id in tag_dictionary.known_lang_pair_ids(db, [LANG_PAIR]):
+        db.execute(text(f"DROP TABLE IF EXISTS {partition_name(lang_pair_id)}"))
+        db.execute(delete(LangPair).where(LangPair.id == lang_pair_id))
+    db.commit()
+
+def legacy_delete_by_id_sen(db, id_sens):
+    rows = list(db.execute(select(MasterRowWord).where(MasterRowWord.id_sen.in_(id_sens))).scalars())
+    for r in rows:
+        db.delete(r)
+    db.commit()
+    return len(rows)
+
+def run(rows: int = 50_000) -> None:
+    db = SessionLocal()
+    try:
+        service.delete_all_fast(db, lang_pair=LANG_PAIR)
+        cases = [
+            ("orm loop", legacy_delete_by_id_sen),
+            ("batched", lambda db, id_sens: service.delete_by_id_sen(db, id_sens)),
+        ]
+        for name, func in cases:
+            id_sens = load(db, rows)
+            started = time.perf_counter()
+            deleted = func(db, id_sens)
+            seconds = time.perf_counter() - started
+            print(f"{name:<10} {deleted:>8} rows {seconds:8.2f} s {deleted / seconds:10.0f} rows/s")
+    finally:
+        db.rollback()
+        drop_lang_pair(db)
+        db.close()
+
+if __name__ == "__main__":
+    run(int(sys.argv[1]) if len(sys.argv) > 1 else 50_000)
@@ -0,0 +1,70 @@
+#!/usr/bin/env python3
+"""
+Micro-benchmark: per-token cost of POS/NER mapping.
+
+Compares the precomputed lookup tables in services.pos_ner_mapping with the
+previous implementation (two dict lookups plus an f-string per call).
+
+    python tests/benchmark_tag_mapping.py [tokens]
+"""
+import random
+import sys
+import os
+import timeit
+
+# Add parent directory to path to import modules
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from services.pos_ner_mapping import (
+    EN_NER_MAPPING,
+    EN_POS_MAPPING,
+    SPACY_TO_EN_NER,
+    SPACY_TO_EN_POS,
+    VN_NER_MAPPING,
+    VN_POS_MAPPING,
+    VNCORENLP_TO_SPECIFIC,
+    map_ner_label,
+    map_pos_tag,
+)
+
+def legacy_map_pos_tag(pos_tag, language="en"):
+    if language == "en":
+        mapped_pos = SPACY_TO_EN_POS.get(pos_tag, pos_tag)
+        return mapped_pos, EN_POS_MAPPING.get(mapped_pos, f"Unknown POS tag: {mapped_pos}")
+    elif language == "vi":
+        specific_tag = VNCORENLP_TO_SPECIFIC.get(pos_tag, pos_tag)
+        return specific_tag, VN_POS_MAPPING.get(specific_tag, f"Unknown POS tag: {specific_tag}")
+    return pos_tag, f"Unknown language: {language}"
+
+def legacy_map_ner_label(ner_label, language="en"):
+    if language == "en":
+        mapped_ner = SPACY_TO_EN_NER.get(ner_label, "O")
+        return mapped_ner, EN_NER_MAPPING.get(mapped_ner, f"Unknown NER label: {mapped_ner}")
+    elif language == "vi":
+        return ner_label, VN_NER_MAPPING.get(ner_label, f"Unknown NER label: {ner_label}")
+    return ner_label, f"Unknown language: {language}"
+
+def run(tokens: int = 1_000_000) -> None:
+    rng = random.Random(0)
+    # Tag strings are copied so lookups hash fresh objects, as with spaCy/VnCoreNLP output
+    workload = [
+        ("".join(tag), lang)
+        for tag, lang in (
+            rng.choice([(t, "en") for t in SPACY_TO_EN_POS] + [(t, "vi") for t in VNCORENLP_TO_SPECIFIC])
+            for _ in range(tokens)
+        )
+    ]
+    ner_workload = [("".join(rng.choice(list(SPACY_TO_EN_NER))), "en") for _ in range(tokens)]
+
+    cases = [
+        ("pos legacy", legacy_map_pos_tag, workload),
+        ("pos tables", map_pos_tag, workload),
+        ("ner legacy", legacy_map_ner_label, ner_workload),
+        ("ner tables", map_ner_label, ner_workload),
+    ]
+    for name, func, items in cases:
+        seconds = min(timeit.repeat(lambda: [func(t, l) for t, l in items], number=1, repeat=3))
+        print(f"{name:<12} {seconds * 1e9 / tokens:8.1f} ns/token")
+
+if __name__ == "__main__":
+    run(int(sys.argv[1]) if len(sys.argv) > 1 else 1_000_000)
@@ -0,0 +1,48 @@
+#!/usr/bin/env python3
+"""
+Test parsing of alignment links
+"""
+import sys
+import os
+import importlib.util
+from types import SimpleNamespace
+
+import pytest
+
+# Add parent directory to path to import modules
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from models.master_row_word import parse_links
+
+def load_data_utils():
+    # utils/data-utils.py is not an importable module name
+    path = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "utils", "data-utils.py")
+    spec = importlib.util.spec_from_file_location("data_utils", path)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+class TestAlignmentLinks:
+    """Test class for parse_links, the Python side of the links_array column"""
+
+    @pytest.mark.parametrize("links, expected", [
+        ("3,4", [3, 4]),
+        ("3, 4", [3, 4]),
+        (" 3 ,\t4\n", [3, 4]),
+        ("1,,2", [1, 2]),
+        (",1", [1]),
+        ("123456789", [123456789]),
+    ])
+    def test_positions(self, links, expected):
+        assert parse_links(links) == expected
+
+    @pytest.mark.parametrize("links", [None, "-", "", ",", "1,x", "1;2", "1 2", "12345678901"])
+    def test_not_a_list_of_positions(self, links):
+        """NULL in the column, like "-" (not aligned)"""
+        assert parse_links(links) is None
+
+    def test_data_utils_uses_the_same_rules(self):
+        data_utils = load_data_utils()
+        # Rows of the corpus views, with the capitalised attribute names data-utils reads
+        assert data_utils._links_array(SimpleNamespace(Links="2, 5")) == [2, 5]
+        assert data_utils._links_array(SimpleNamespace(Links="2 5")) == []
@@ -0,0 +1,55 @@
+#!/usr/bin/env python3
+"""
+Test corpus export encoders
+"""
+import sys
+import os
+import gzip
+import json
+
+# Add parent directory to path to import modules
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from services.corpus_export_service import (
+    EXPORT_COLUMNS,
+    _csv_chunk,
+    _gzip_chunks,
+    _jsonl_chunk,
+    _tsv_chunk,
+    _with_header,
+    export_filename,
+    file_id,
+)
+
+ROW = ("01821301", "018213", "con_bò", "con_bò", "1-2", "-", "N", "NP", "sub", "O", None, "vi", "vi-en")
+
+class TestCorpusExport:
+    """Test class for the export formats"""
+
+    def test_file_id(self):
+        """The full id keeps the 8 digits read back by the import"""
+        assert file_id("01821301", "vi") == "VD01821301"
+        assert file_id("00000201", "en") == "ED00000201"
+
+    def test_tsv_is_corpus_file_format(self):
+        """id + 9 annotation columns, NULL as empty field"""
+        line = _tsv_chunk([ROW]).decode("utf-8")
+        assert line == "VD01821301\tcon_bò\tcon_bò\t1-2\t-\tN\tNP\tsub\tO\t\n"
+        assert len(line.rstrip("\n").split("\t")) == 10
+
+    def test_csv_and_jsonl(self):
+        """Every export column, header first for csv"""
+        csv_text = b"".join(_with_header("csv", iter([_csv_chunk([ROW])]))).decode("utf-8")
+        header, row = csv_text.splitlines()
+        assert header.split(",") == list(EXPORT_COLUMNS)
+        assert row.split(",")[2] == "con_bò"
+        assert json.loads(_jsonl_chunk([ROW]))["lang_pair"] == "vi-en"
+
+    def test_gzip_stream(self):
+        """Compressed chunks form one gzip file"""
+        chunks = [_tsv_chunk([ROW])] * 3
+        assert gzip.decompress(b"".join(_gzip_chunks(iter(chunks)))) == b"".join(chunks)
+
+    def test_filename(self):
+        assert export_filename("vi-en", "vi", "tsv", True) == "corpus_vi-en_vi.tsv.gz"
+        assert export_filename("vi-en", None, "parquet", True) == "corpus_vi-en.parquet"
@@ -0,0 +1,59 @@
+#!/usr/bin/env python3
+"""
+Test corpus replacement guards
+"""
+import sys
+import os
+from types import SimpleNamespace
+from unittest.mock import MagicMock
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+# Add parent directory to path to import modules
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from auth import get_current_user
+from models.user import UserRole
+from routers import master_api
+from services import master_row_word_service as service_module
+
+def client() -> TestClient:
+    app = FastAPI()
+    app.include_router(master_api.router)
+    app.dependency_overrides[get_current_user] = lambda: SimpleNamespace(id=1, role=UserRole.ADMIN)
+    return TestClient(app)
+
+class TestCorpusReplace:
+    """Test class for /master/replace inputs that would empty the corpus"""
+
+    @pytest.mark.parametrize("filename", ["corpus.csv", "corpus.xlsx"])
+    def test_only_txt_files(self, filename):
+        jobs = dict(master_api.replace_jobs)
+        response = client().post(
+            "/master/replace",
+            files={"file": (filename, b"id,word\nVD00000101,con\n")},
+            data={"lang_code": "vi", "lang_pair": "vi_en"},
+        )
+        assert response.status_code == 400
+        assert master_api.replace_jobs == jobs
+
+    def test_file_without_rows_is_not_swapped(self, monkeypatch):
+        """Lines with fewer than 9 fields are skipped, so nothing is loaded"""
+        content = "VD00000101\tcon\tcon\n\n".encode("utf-8")
+        assert list(master_api.parse_corpus_rows(content, "a.txt", "vi", "vi_en")) == []
+
+        swap = MagicMock()
+        drop = MagicMock()
+        monkeypatch.setattr(service_module.tag_dictionary, "lang_pair_id", lambda db, code: 1)
+        monkeypatch.setattr(service_module, "create_staging", lambda db, lang_pair_id: "staging")
+        monkeypatch.setattr(service_module, "copy_to_staging", MagicMock(return_value=3))
+        monkeypatch.setattr(service_module, "swap_partition", swap)
+        monkeypatch.setattr(service_module, "drop_staging", drop)
+
+        rows = master_api.parse_corpus_rows(content, "a.txt", "vi", "vi_en")
+        with pytest.raises(ValueError):
+            master_api.master_row_word_service.replace_lang_pair(MagicMock(), "vi_en", rows, lang_code="vi")
+        swap.assert_not_called()
+        drop.assert_called_once()
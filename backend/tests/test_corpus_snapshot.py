@@ -0,0 +1,71 @@
+#!/usr/bin/env python3
+"""
+Test analytics on the Parquet corpus snapshot
+"""
+import sys
+import os
+
+import pytest
+
+# Add parent directory to path to import modules
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+pa = pytest.importorskip("pyarrow")
+pq = pytest.importorskip("pyarrow.parquet")
+
+from services.corpus_export_service import EXPORT_COLUMNS
+from services.corpus_snapshot import (
+    DATA_FILE,
+    CorpusSnapshot,
+    SnapshotNotFound,
+    _schema,
+)
+
+# (word, lang_code, pos, ner)
+TOKENS = [
+    ("bò", "vi", "N", "O"),
+    ("bò", "vi", "V", "O"),
+    ("con", "vi", "Nc", "O"),
+    ("Hà_Nội", "vi", "Np", "LOC"),
+    (" ", "vi", "CH", "O"),
+    ("cow", "en", "NN", "O"),
+]
+
+def write_snapshot(directory: str) -> CorpusSnapshot:
+    schema = _schema()
+    rows = [
+        {**dict.fromkeys(EXPORT_COLUMNS), "word": w, "lang_code": lang, "lang_pair": "vi-en", "pos": pos, "ner": ner}
+        for w, lang, pos, ner in TOKENS
+    ]
+    os.makedirs(os.path.join(directory, "lang_pair_id=1"))
+    pq.write_table(pa.Table.from_pylist(rows, schema=schema), os.path.join(directory, "lang_pair_id=1", DATA_FILE))
+    snapshot = CorpusSnapshot(directory)
+    snapshot._write_manifest({"pairs": {"vi-en": {"lang_pair_id": 1, "rows": len(rows)}}, "rows": len(rows)})
+    return snapshot
+
+class TestCorpusSnapshot:
+    """Test class for snapshot statistics and facets"""
+
+    def test_word_frequencies(self, tmp_path):
+        """N counts blank words too, the list does not"""
+        snapshot = write_snapshot(str(tmp_path))
+        total, rows = snapshot.word_frequencies("vi")
+        assert total == 5
+        assert rows == [("bò", 2), ("Hà_Nội", 1), ("con", 1)]
+
+    def test_tag_filter_is_case_insensitive(self, tmp_path):
+        snapshot = write_snapshot(str(tmp_path))
+        assert snapshot.word_frequencies("vi", "ner", "loc") == (1, [("Hà_Nội", 1)])
+        # Unknown tag types are not a filter, as in the Postgres query
+        assert snapshot.word_frequencies("", "bogus", "x")[0] == len(TOKENS)
+
+    def test_distinct_values(self, tmp_path):
+        snapshot = write_snapshot(str(tmp_path))
+        assert snapshot.distinct_values("pos", "vi") == ["CH", "N", "Nc", "Np", "V"]
+        assert snapshot.distinct_values("ner") == ["LOC", "O"]
+
+    def test_missing_snapshot(self, tmp_path):
+        snapshot = CorpusSnapshot(str(tmp_path / "none"))
+        assert not snapshot.available()
+        with pytest.raises(SnapshotNotFound):
+            snapshot.word_frequencies()
@@ -0,0 +1,46 @@
+#!/usr/bin/env python3
+"""
+Test corpus store helpers
+"""
+import sys
+import os
+
+import numpy as np
+
+# Add parent directory to path to import modules
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from services.corpus_store import CorpusStore, StringTable
+
+def string_table(values):
+    encoded = [v.encode("utf-8") for v in sorted(values)]
+    offsets = np.zeros(len(encoded) + 1, dtype=np.int64)
+    np.cumsum([len(b) for b in encoded], out=offsets[1:])
+    return StringTable(np.frombuffer(b"".join(encoded), dtype=np.uint8), offsets)
+
+class TestCorpusStore:
+    """Test class for the string table and token columns"""
+
+    def test_string_table_lookup(self):
+        """Ids follow the sorted order and unknown strings have none"""
+        table = string_table(["bò", "", "con", "Hà_Nội", "ăn"])
+        assert len(table) == 5
+        assert [table[i] for i in range(len(table))] == sorted(["bò", "", "con", "Hà_Nội", "ăn"])
+        assert table[table.id("ăn")] == "ăn"
+        assert table.id("") == 0
+        assert table.id("bo") is None
+        assert table.ids(["con", "x", "bò"]) == [table.id("con"), table.id("bò")]
+
+    def test_not_built(self, tmp_path):
+        store = CorpusStore(str(tmp_path))
+        assert not store.available()
+        assert store.manifest() is None
+
+    def test_publish_keeps_previous_build(self, tmp_path):
+        """Readers of the replaced build can finish, older builds are removed"""
+        store = CorpusStore(str(tmp_path))
+        for build in ("build-1", "build-2", "build-3"):
+            os.makedirs(tmp_path / build)
+            store._publish(build)
+        assert store._current_build() == "build-3"
+        assert sorted(p.name for p in tmp_path.iterdir() if p.name.startswith("build-")) == ["build-2", "build-3"]
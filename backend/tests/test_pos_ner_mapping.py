@@ -0,0 +1,63 @@
+#!/usr/bin/env python3
+"""
+Test POS/NER mapping lookup tables
+"""
+import sys
+import os
+from types import SimpleNamespace
+
+import pytest
+
+# Add parent directory to path to import modules
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from services.pos_ner_mapping import (
+    explain_vncorenlp_ner,
+    explain_vncorenlp_pos,
+    map_ner_label,
+    map_pos_tag,
+)
+
+class TestPosNerMapping:
+    """Test class for the precomputed tag mapping"""
+
+    def test_english_pos(self):
+        """spaCy universal tags map to EN tags"""
+        assert map_pos_tag("NOUN", "en") == ("NN", "Danh từ số ít hoặc không đếm được")
+        assert map_pos_tag("NN", "en") == map_pos_tag("NOUN", "en")
+
+    def test_vietnamese_pos(self):
+        """VnCoreNLP tags map to specific tags"""
+        assert map_pos_tag("N", "vi")[0] == "Nn"
+        assert map_pos_tag("Nc", "vi") == ("Nc", "Danh từ loại (loại từ)")
+
+    def test_ner(self):
+        """Unknown spaCy labels become O, Vietnamese labels pass through"""
+        assert map_ner_label("NOT_A_LABEL", "en")[0] == "O"
+        assert map_ner_label("PER", "vi")[0] == "PER"
+
+    def test_unknown_inputs(self):
+        """Tags and languages outside the tables keep the fallback messages"""
+        assert map_pos_tag("ZZZ", "en") == ("ZZZ", "Unknown POS tag: ZZZ")
+        assert map_pos_tag("N", "fr") == ("N", "Unknown language: fr")
+        assert map_ner_label("ZZZ", "vi") == ("ZZZ", "Unknown NER label: ZZZ")
+
+    def test_vncorenlp_explanations(self):
+        """Raw VnCoreNLP tags used by the Vietnamese analysis endpoints"""
+        assert explain_vncorenlp_pos("Np") == "Proper noun"
+        assert explain_vncorenlp_pos("ZZ") == "Unknown POS tag: ZZ"
+        assert explain_vncorenlp_ner("LOC") == "Location"
+
+    def test_pipeline_english_tags(self):
+        """The pre-annotation pipeline stores English POS/NER in the mapped tag set"""
+        spacy = pytest.importorskip("spacy")
+        from spacy.tokens import Doc
+        from services.corpus_annotation_pipeline import CorpusAnnotationPipeline
+
+        doc = Doc(spacy.blank("en").vocab, words=["Cows", "eat", "grass", "."],
+                  pos=["NOUN", "VERB", "NOUN", "PUNCT"], tags=["NNS", "VBP", "NN", "."],
+                  ents=["O", "O", "O", "O"])
+        english_nlp = SimpleNamespace(pipe=lambda texts, batch_size: iter([doc]))
+        tokens = CorpusAnnotationPipeline(None, english_nlp)._annotate_english(["Cows eat grass."])[0]
+        assert [pos for _, _, _, pos, _, _ in tokens] == ["NN", "VB", "NN", "PU"]
+        assert {ner for *_, ner in tokens} == {"O"}
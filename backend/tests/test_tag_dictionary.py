@@ -0,0 +1,53 @@
+#!/usr/bin/env python3
+"""
+Test the tag and language pair keys of master_row_words
+"""
+import sys
+import os
+from unittest.mock import MagicMock
+
+import pytest
+
+# Add parent directory to path to import modules
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from services.tag_dictionary import TagDictionary
+
+TAG_IDS = {"pos": {"NN": 1, "": 2}, "ner": {"O": 3}, "semantic": {"": 4}}
+LANG_PAIR_IDS = {"vi_en": 10, "": 11}
+
+@pytest.fixture
+def dictionary(monkeypatch):
+    dictionary = TagDictionary()
+    monkeypatch.setattr(dictionary, "tag_ids", lambda db, tag_type, values: TAG_IDS[tag_type])
+    monkeypatch.setattr(dictionary, "lang_pair_ids", lambda db, codes: LANG_PAIR_IDS)
+    return dictionary
+
+class TestTagDictionary:
+    """Test class for TagDictionary.with_ids, which turns written values into keys"""
+
+    def test_values_become_ids(self, dictionary):
+        item = {"word": "bò", "pos": "NN", "ner": "O", "semantic": "", "lang_pair": "vi_en"}
+        assert dictionary.with_ids(MagicMock(), [item]) == [
+            {"word": "bò", "pos_id": 1, "ner_id": 3, "semantic_id": 4, "lang_pair_id": 10}
+        ]
+
+    def test_only_null_has_no_tag(self, dictionary):
+        [row] = dictionary.with_ids(MagicMock(), [{"pos": "", "ner": None}])
+        assert row == {"pos_id": 2, "ner_id": None}
+
+    def test_partial_update_keeps_other_keys(self, dictionary):
+        [row] = dictionary.with_ids(MagicMock(), [{"ner": "O"}])
+        assert row == {"ner_id": 3}
+
+    @pytest.mark.parametrize("lang_pair", [None, "", "  "])
+    def test_insert_without_lang_pair_is_unassigned(self, dictionary, lang_pair):
+        item = {} if lang_pair is None else {"lang_pair": lang_pair}
+        [row] = dictionary.with_ids(MagicMock(), [item], insert=True)
+        assert row == {"lang_pair_id": 11}
+
+    def test_select_values_joins_the_dictionary_tables(self):
+        sql = str(TagDictionary.select_values(["word", "pos", "lang_pair"]))
+        assert "LEFT OUTER JOIN tags AS pos_tag" in sql
+        assert "JOIN lang_pairs" in sql
+        assert "pos_tag.value AS pos" in sql
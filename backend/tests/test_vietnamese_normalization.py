@@ -0,0 +1,62 @@
+#!/usr/bin/env python3
+"""
+Test Vietnamese syllable normalization
+"""
+import sys
+import os
+import unicodedata
+
+# Add parent directory to path to import modules
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from services.vietnamese_normalization import (
+    normalize_vietnamese_syllable,
+    normalize_vietnamese_text,
+    normalize_vietnamese_texts,
+)
+
+class TestVietnameseNormalization:
+    """Test class for the table-driven normalizer"""
+
+    def test_syllable_tones(self):
+        """Tone marks become digits: sắc=1, huyền=2, hỏi=3, ngã=4, nặng=5"""
+        assert normalize_vietnamese_syllable("má") == "ma1"
+        assert normalize_vietnamese_syllable("mà") == "ma2"
+        assert normalize_vietnamese_syllable("mả") == "ma3"
+        assert normalize_vietnamese_syllable("mã") == "ma4"
+        assert normalize_vietnamese_syllable("mạ") == "ma5"
+        assert normalize_vietnamese_syllable("ma") == "ma"
+
+    def test_syllable_vowels_and_d(self):
+        """Special vowels and đ use Telex doubling"""
+        assert normalize_vietnamese_syllable("Việt") == "vieet5"
+        assert normalize_vietnamese_syllable("nguyễn") == "nguyeen4"
+        assert normalize_vietnamese_syllable("đường") == "dduwowng2"
+        assert normalize_vietnamese_syllable("quốc") == "quooc1"
+        assert normalize_vietnamese_syllable("ươn") == "uwown"
+
+    def test_syllable_special_cases(self):
+        """gi/qu special cases, case-insensitive"""
+        assert normalize_vietnamese_syllable("gì") == "gi2"
+        assert normalize_vietnamese_syllable("GIÀ") == "gia2"
+        assert normalize_vietnamese_syllable("qua") == "qua"
+
+    def test_syllable_non_word(self):
+        """Empty input stays empty, input without letters becomes '-'"""
+        assert normalize_vietnamese_syllable("") == ""
+        assert normalize_vietnamese_syllable("...") == "-"
+        assert normalize_vietnamese_syllable("123") == "-"
+
+    def test_decomposed_input(self):
+        """NFD input normalizes like NFC input"""
+        assert normalize_vietnamese_syllable(unicodedata.normalize("NFD", "trường")) == "truwowng2"
+
+    def test_text(self):
+        """Compound words keep their underscores, punctuation becomes '-'"""
+        text = "Tôi đi học ở trường đại_học , hà_nội !"
+        expected = "tooi ddi hoc5 ow3 truwowng2 ddai5_hoc5 - ha2_nooi5 -"
+        assert normalize_vietnamese_text(text) == expected
+
+    def test_batch_keeps_order(self):
+        """Batch normalization returns one result per input, in order"""
+        assert normalize_vietnamese_texts(["hà_nội", "", "Việt Nam"]) == ["ha2_nooi5", "", "vieet5 nam"]
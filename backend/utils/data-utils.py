@@ -3,6 +3,7 @@ from __future__ import annotations
 from typing import Dict, List, Optional, Tuple
 
 from models import RowWord
+from models.master_row_word import parse_links
 
 def _format_sentence_spaces(sentence: Dict[str, str]) -> None:
 	"""Trim spaces on Left/Center/Right in-place for a sentence dict."""
@@ -80,6 +81,14 @@ def get_sentence(row: RowWord, corpus: List[RowWord], dic_id: Dict[str, Dict[str
 	return sentence
 
 
+def _links_array(row: RowWord) -> List[int]:
+	"""Aligned positions: the stored links_array of master rows, else parsed from Links."""
+	links_array = getattr(row, "links_array", None)
+	if links_array is not None:
+		return list(links_array)
+	return parse_links(row.Links) or []
+
+
 def get_sentence_other(row: RowWord, corpus: List[RowWord], dic_id: Dict[str, Dict[str, int]]) -> Dict[str, str]:
 	"""
 	Build the aligned sentence view on the other language using row.Links to decide
@@ -99,13 +108,14 @@ def get_sentence_other(row: RowWord, corpus: List[RowWord], dic_id: Dict[str, Di
 			sentence["Center"] = "-"
 			sentence["Right"] = f"{(r.Word or '').strip()} "
 	else:
-		links = [s for s in (row.Links or "").split(",") if s]
+		links = _links_array(row)
 		for i in range(p["start"], p["end"] + 1):
 			r = corpus[i]
-			num = (r.ID or "")[-2:]
+			tail = (r.ID or "")[-2:]
+			num = int(tail) if tail.isdigit() else 0
 
-			first_link = links[0].zfill(2) if links else ""
-			last_link = links[-1].zfill(2) if links else ""
+			first_link = links[0] if links else 0
+			last_link = links[-1] if links else 0
 
 			if num < first_link:
 				sentence["Left"] += f"{r.Word or ''} "